@@ -4,25 +4,30 @@ CCTV 군중 위험도 감지 시스템 메인 애플리케이션
 import os
 os.environ["OPENCV_VIDEOIO_PRIORITY_MSMF"] = "0"
 import streamlit as st
-import cv2
 import time
 import os
-import pandas as pd
 from datetime import datetime
-import torch
-torch.serialization.add_safe_globals([__import__("ultralytics").nn.tasks.DetectionModel])
 
-# 모듈 임포트
-from config import PROJECT_TITLE, PROJECT_ICON, LAYOUT, SAMPLE_VIDEO_PATH
+# 모듈 임포트 (torch/ultralytics는 분석을 시작할 때 검출기 모듈에서 지연 임포트)
+from config import (PROJECT_TITLE, PROJECT_ICON, LAYOUT, SAMPLE_VIDEO_PATH, UI_REFRESH_HZ,
+                    DETECTION_CACHE_ENABLED, INFERENCE_SERVER_ENABLED)
 from modules.detector import CrowdDetector
-from modules.density import calculate_cdi, get_risk_level_info
-from modules.direction import get_direction_info
-from utils.grid import create_grid, count_people_in_grid
-from utils.heatmap import create_heatmap
+from modules.detection_cache import get_detection_cache, video_fingerprint
+from modules.analysis_index import get_analysis_index
+from modules.pipeline import FramePipeline, make_history_record
+from modules.worker import AnalysisWorker
+from utils.video import get_video_source
+from utils.annotation import FrameAnnotator
+from utils.history import HistoryBuffer
+from utils.log_writer import get_log_writer
+from utils.session import on_session_end, cancel_session_end
+from utils.uploads import get_upload_path
 from utils.logger import setup_logger
+from utils.profiler import StageProfiler
+from utils.metrics import get_metrics
 from ui.styles import apply_custom_styles, get_risk_badge_html
-from ui.components import render_sidebar, render_alert, render_dashboard_metrics
-from ui.charts import render_person_count_chart, render_grid_stats
+from ui.components import render_sidebar, render_alert, render_dashboard_metrics, render_profiler_panel
+from ui.charts import render_person_count_chart, render_grid_stats, render_risk_timeline
 
 # 로거 설정
 logger = setup_logger()
@@ -44,39 +49,188 @@ def init_session_state():
         st.session_state.detector = None
     if 'video_path' not in st.session_state:
         st.session_state.video_path = None
+        # 지표 스트림 레이블 (업로드 원본 파일 이름, 저장 경로는 내용 해시 이름)
+        st.session_state.video_name = None
     if 'is_playing' not in st.session_state:
         st.session_state.is_playing = False
     if 'current_frame' not in st.session_state:
         st.session_state.current_frame = 0
     if 'data_history' not in st.session_state:
-        st.session_state.data_history = []
+        st.session_state.data_history = HistoryBuffer()
     if 'analysis_results' not in st.session_state:
         st.session_state.analysis_results = None
+    if 'video_source' not in st.session_state:
+        st.session_state.video_source = None
+    if 'pipeline' not in st.session_state:
+        st.session_state.pipeline = None
+    if 'last_logged_frame' not in st.session_state:
+        # 마지막으로 기록한 (영상 경로, 프레임 번호) (일시정지 중 리런마다 같은 프레임을 다시 기록하지 않도록)
+        st.session_state.last_logged_frame = None
+    if 'worker' not in st.session_state:
+        st.session_state.worker = None
+        # 정지를 요청했지만 아직 추론 중인 워커 (끝날 때까지 검출기 사용 금지)
+        st.session_state.stopping_worker = None
+        st.session_state.stopping_resume_frame = None
+    if 'metrics' not in st.session_state:
+        # METRICS_ENABLED면 프로세스 공유 지표 (처음 한 번 /metrics 서버 시작)
+        try:
+            st.session_state.metrics = get_metrics()
+        except OSError as e:
+            logger.error(f"지표 서버 시작 실패, 지표 없이 계속합니다: {e}")
+            st.session_state.metrics = None
+    if 'profiler' not in st.session_state:
+        st.session_state.profiler = StageProfiler()
+    if 'annotator' not in st.session_state:
+        st.session_state.annotator = FrameAnnotator(st.session_state.profiler)
+    if 'log_writer' not in st.session_state:
+        # 영상을 열 때 만들고 영상이 바뀌거나 세션이 끝나면 닫음 (get_log_writer)
+        st.session_state.log_writer = None
+        st.session_state.log_writer_error_logged = False
+    if 'first_frame_started' not in st.session_state:
+        # 첫 프레임 표시까지 걸린 시간 측정용 (분석 시작 시각, 기록 여부)
+        st.session_state.first_frame_started = None
+        st.session_state.first_frame_logged = False
 
 def load_model():
-    """모델 로드 (캐싱)"""
+    """
+    세션 검출기 준비 (모델은 프로세스당 한 번만 로드되어 모든 세션이 공유)
+    """
     if st.session_state.detector is None:
+        st.session_state.first_frame_started = time.perf_counter()
         try:
             with st.spinner("AI 모델 로딩 중..."):
-                st.session_state.detector = CrowdDetector()
-            logger.info("모델 로드 성공")
+                cache = get_detection_cache() if DETECTION_CACHE_ENABLED else None
+                st.session_state.detector = CrowdDetector(cache=cache, use_server=INFERENCE_SERVER_ENABLED)
+            st.session_state.pipeline = FramePipeline(
+                st.session_state.detector, st.session_state.profiler, st.session_state.metrics
+            )
+            elapsed = time.perf_counter() - st.session_state.first_frame_started
+            logger.info(f"검출기 준비 완료: {elapsed:.2f}초 "
+                        f"(공유 모델 로드+워밍업 {st.session_state.detector.shared.load_seconds:.2f}초)")
         except Exception as e:
             st.error(f"모델 로드 실패: {e}")
             logger.error(f"모델 로드 실패: {e}")
             st.stop()
 
+def ensure_worker(settings):
+    """
+    재생 중인 영상에 대한 백그라운드 분석 워커 반환 (없으면 시작)
+    
+    Args:
+        settings: 분석 설정 딕셔너리
+        
+    Returns:
+        worker: AnalysisWorker 인스턴스
+    """
+    worker = st.session_state.worker
+    if worker is not None and worker.video_path != st.session_state.video_path:
+        stop_worker()
+        worker = None
+    
+    if worker is None:
+        if not reap_stopping_worker():
+            # 이전 워커가 아직 검출기를 사용 중
+            return None
+        worker = AnalysisWorker(
+            st.session_state.detector,
+            st.session_state.video_path,
+            st.session_state.current_frame,
+            settings,
+            profiler=st.session_state.profiler,
+            metrics=st.session_state.metrics,
+            stream=st.session_state.video_name,
+            log_writer=st.session_state.log_writer
+        )
+        worker.start()
+        st.session_state.worker = worker
+        # 브라우저 세션이 끝나면 (UI가 더 이상 결과를 가져가지 않으므로) 분석 중단
+        on_session_end(st.session_state, "worker", worker.request_stop)
+    else:
+        worker.update_settings(settings)
+    
+    return worker
+
+def collect_worker_records(worker):
+    """워커에 남은 기록용 레코드를 data_history에 반영 (같은 영상일 때만, 분석 로그는 워커가 기록)"""
+    records = worker.drain_records()
+    if not records or worker.video_path != st.session_state.video_path:
+        return
+    st.session_state.data_history.extend(records)
+    # 워커가 마지막으로 분석한 프레임에서 일시정지해도 다시 기록하지 않음
+    st.session_state.last_logged_frame = (worker.video_path, worker.last_index)
+
+def reset_pipeline():
+    """일시정지 중 분석하는 파이프라인의 움직임 기준 프레임과 직전 결과 초기화 (탐색/영상 변경 시)"""
+    if st.session_state.pipeline is not None:
+        st.session_state.pipeline.reset()
+
+def stop_worker():
+    """
+    백그라운드 분석 워커 정지 (남은 기록 반영, 마지막으로 분석한 프레임에서 재개)
+    
+    Returns:
+        stopped: 워커가 끝나 검출기를 바로 사용할 수 있으면 True
+    """
+    worker = st.session_state.worker
+    if worker is None:
+        return reap_stopping_worker()
+    
+    stopped = worker.stop()
+    cancel_session_end(st.session_state, "worker")
+    # 재생 전에 분석한 결과는 워커가 지나간 프레임과 다르므로 재사용하지 않음
+    reset_pipeline()
+    collect_worker_records(worker)
+    if worker.last_index >= worker.start_frame and worker.video_path == st.session_state.video_path:
+        st.session_state.current_frame = worker.last_index
+    st.session_state.worker = None
+    if not stopped:
+        # 추론 중인 프레임을 마칠 때까지 보관 (reap_stopping_worker에서 정리)
+        st.session_state.stopping_worker = worker
+        st.session_state.stopping_resume_frame = st.session_state.current_frame
+    return stopped
+
+def reap_stopping_worker():
+    """
+    정지 대기 중인 워커가 끝났으면 남은 기록을 반영하고 정리
+    
+    Returns:
+        ready: 정지 대기 중인 워커가 없어 검출기를 사용할 수 있으면 True
+    """
+    worker = st.session_state.stopping_worker
+    if worker is None:
+        return True
+    if worker.is_alive():
+        return False
+    collect_worker_records(worker)
+    # 그 사이 탐색하지 않았으면 마지막으로 마친 프레임에서 재개
+    if (worker.video_path == st.session_state.video_path
+            and st.session_state.current_frame == st.session_state.stopping_resume_frame):
+        st.session_state.current_frame = max(worker.last_index, st.session_state.current_frame)
+    st.session_state.stopping_worker = None
+    st.session_state.stopping_resume_frame = None
+    return True
+
+def check_log_writer(log_writer):
+    """로그 작성기 오류를 화면에 표시 (로그에는 한 번만 기록)"""
+    if log_writer.error is None:
+        return
+    st.warning(f"분석 로그 기록이 중단되었습니다: {log_writer.error} "
+               f"(버린 레코드 {log_writer.dropped}개)")
+    if not st.session_state.log_writer_error_logged:
+        logger.error(f"분석 로그 기록 오류 ({log_writer.path}): {log_writer.error}")
+        st.session_state.log_writer_error_logged = True
+
 def save_log(data_history):
-    """분석 로그 저장"""
-    if not data_history:
+    """분석 로그 저장 (디스크로 내보낸 기록 포함 전체)"""
+    if not len(data_history):
         return
         
-    df = pd.DataFrame(data_history)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"logs/analysis_{timestamp}.csv"
     
     try:
         os.makedirs("logs", exist_ok=True)
-        df.to_csv(filename, index=False, encoding='utf-8-sig')
+        data_history.export_csv(filename)
         logger.info(f"로그 저장 완료: {filename}")
         return filename
     except Exception as e:
@@ -85,7 +239,6 @@ def save_log(data_history):
 
 def main():
     init_session_state()
-    load_model()
     
     # 사이드바 렌더링
     settings = render_sidebar()
@@ -104,29 +257,45 @@ def main():
         st.markdown("<br>", unsafe_allow_html=True)
         if st.button("▶️ 데모 영상 실행", type="secondary", use_container_width=True):
             if os.path.exists(SAMPLE_VIDEO_PATH):
+                stop_worker()
+                reset_pipeline()
                 st.session_state.video_path = SAMPLE_VIDEO_PATH
+                st.session_state.video_name = os.path.basename(SAMPLE_VIDEO_PATH)
                 st.session_state.current_frame = 0
-                st.session_state.data_history = []
+                st.session_state.data_history.clear()
                 st.rerun()
             else:
                 st.error("데모 영상을 찾을 수 없습니다.")
     
     # 영상 경로 설정
     if uploaded_file:
-        # 임시 파일 저장
-        os.makedirs("temp", exist_ok=True)
-        temp_path = os.path.join("temp", uploaded_file.name)
-        with open(temp_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        st.session_state.video_path = temp_path
+        # 임시 파일 저장 (처음 한 번만 청크 단위로 기록, 이후 리런은 경로만 재사용)
+        video_path = get_upload_path(st.session_state, uploaded_file)
+        if video_path != st.session_state.video_path:
+            reset_pipeline()
+        st.session_state.video_path = video_path
+        st.session_state.video_name = uploaded_file.name
     
     # 분석 화면
     if st.session_state.video_path:
-        cap = cv2.VideoCapture(st.session_state.video_path)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        # 분석을 시작할 때 처음으로 모델 준비 (첫 화면은 모델 없이 바로 표시)
+        load_model()
+        
+        # 세션에 유지되는 프레임 소스 (리런마다 다시 열지 않음)
+        source = get_video_source(st.session_state, st.session_state.video_path)
+        total_frames = source.total_frames
+        fps = source.fps
+        
+        # 이전 영상의 워커는 작성기를 바꾸기 전에 정지 (마지막 레코드까지 이전 로그에 기록)
+        worker = st.session_state.worker
+        if worker is not None and worker.video_path != st.session_state.video_path:
+            stop_worker()
+        
+        # 영상별 분석 로그 작성기 (영상이 바뀌면 이전 작성기를 닫고 새로 시작)
+        log_writer = get_log_writer(st.session_state, st.session_state.video_path)
+        if log_writer.error is None:
+            st.session_state.log_writer_error_logged = False
+        check_log_writer(log_writer)
         
         # 레이아웃 분할 (좌: 영상, 우: 대시보드)
         dash_col1, dash_col2 = st.columns([1.5, 1])
@@ -134,39 +303,60 @@ def main():
         # ---------------------------------------------------------
         # 분석 로직
         # ---------------------------------------------------------
-        # 현재 프레임 읽기
-        cap.set(cv2.CAP_PROP_POS_FRAMES, st.session_state.current_frame)
-        ret, frame = cap.read()
+        result = None
+        waiting_for_worker = False
+        if st.session_state.is_playing:
+            # 재생 중: 백그라운드 워커가 분석하고 UI는 최신 결과만 가져감
+            worker = ensure_worker(settings)
+            if worker is None:
+                waiting_for_worker = True
+            else:
+                finished = worker.finished
+                collect_worker_records(worker)
+                result = worker.latest()
+                if result is not None:
+                    st.session_state.current_frame = result["frame_index"]
+                if finished:
+                    if worker.error is not None:
+                        logger.error(f"분석 워커 오류: {worker.error}")
+                    stop_worker()
+                    st.session_state.is_playing = False
+                elif result is None:
+                    with dash_col1:
+                        st.info("분석 시작 중...")
+        elif not stop_worker():
+            # 일시정지 상태지만 정지한 워커가 아직 추론 중
+            waiting_for_worker = True
+        else:
+            # 일시정지 상태: 워커가 끝났으므로 현재 프레임을 직접 분석
+            st.session_state.detector.set_frame_rate(fps)
+            with st.session_state.profiler.span("decode"):
+                ret, frame = source.read(st.session_state.current_frame)
+            if ret:
+                frame_ref = (video_fingerprint(st.session_state.video_path), st.session_state.current_frame)
+                st.session_state.pipeline.stream = (st.session_state.video_name
+                                                    or os.path.basename(st.session_state.video_path))
+                result = st.session_state.pipeline.process(frame, settings, frame_ref=frame_ref)
+                # 리런으로 같은 프레임을 다시 분석한 경우는 기록하지 않음 (프레임/영상이 바뀔 때만)
+                frame_key = (st.session_state.video_path, st.session_state.current_frame)
+                if st.session_state.last_logged_frame != frame_key:
+                    record = make_history_record(result)
+                    st.session_state.data_history.append(record)
+                    log_writer.write(record)
+                    st.session_state.last_logged_frame = frame_key
         
-        if ret:
-            # 1. 사람 검출
-            boxes, frame_with_boxes, person_count = st.session_state.detector.detect_people(
-                frame, conf_threshold=settings['conf_threshold']
-            )
-            
-            # 2. 그리드 분석
-            grid_regions, frame_with_grid = create_grid(frame_with_boxes, settings['grid_size'])
-            grid_counts = count_people_in_grid(boxes, grid_regions)
-            
-            # 3. 위험도 계산
-            frame_area = width * height
-            cdi = calculate_cdi(person_count, frame_area, grid_counts)
-            risk_info = get_risk_level_info(cdi)
-            
-            # 4. 방향 추천
-            direction_info = get_direction_info(grid_counts, settings['grid_size'])
-            
-            # 5. 히트맵 생성
-            frame_final = create_heatmap(frame_with_grid, grid_counts, grid_regions, settings['grid_size'])
-            
-            # 데이터 기록
-            current_time = datetime.now().strftime("%H:%M:%S")
-            st.session_state.data_history.append({
-                "time": current_time,
-                "count": person_count,
-                "cdi": cdi,
-                "risk": risk_info["level"]
-            })
+        if waiting_for_worker:
+            # 검출기를 쓰지 않고 다음 리런에서 다시 확인
+            with dash_col1:
+                st.info("이전 분석을 정리하는 중...")
+        
+        if result is not None:
+            render_started = time.perf_counter()
+            person_count = result["person_count"]
+            grid_counts = result["grid_counts"]
+            cdi = result["cdi"]
+            risk_info = result["risk_info"]
+            direction_info = result["direction_info"]
             
             # ---------------------------------------------------------
             # UI 렌더링
@@ -181,16 +371,22 @@ def main():
                 if settings['enable_alert'] and risk_info['level'] == 'DANGER':
                     border_class = "risk-alert-red"
                 
-                # 영상 표시
-                frame_rgb = cv2.cvtColor(frame_final, cv2.COLOR_BGR2RGB)
+                # 영상 표시 (표시할 프레임만 세션 버퍼 하나에 시각화)
+                frame_rgb = st.session_state.annotator.render_rgb(result)
                 st.markdown(f'<div class="{border_class}">', unsafe_allow_html=True)
                 st.image(frame_rgb, use_container_width=True, channels="RGB")
+                if not st.session_state.first_frame_logged:
+                    elapsed = time.perf_counter() - st.session_state.first_frame_started
+                    logger.info(f"첫 프레임 표시까지 {elapsed:.2f}초")
+                    st.session_state.first_frame_logged = True
                 st.markdown('</div>', unsafe_allow_html=True)
                 
                 # 컨트롤 패널
                 c1, c2, c3 = st.columns([1, 2, 1])
                 with c1:
                     if st.button("⏮️ 5초 전", use_container_width=True):
+                        stop_worker()
+                        reset_pipeline()
                         st.session_state.current_frame = max(0, st.session_state.current_frame - int(fps*5))
                         st.rerun()
                 with c2:
@@ -200,12 +396,38 @@ def main():
                         st.rerun()
                 with c3:
                     if st.button("⏭️ 5초 후", use_container_width=True):
+                        stop_worker()
+                        reset_pipeline()
                         st.session_state.current_frame = min(total_frames-1, st.session_state.current_frame + int(fps*5))
                         st.rerun()
                         
                 # 진행바
                 st.progress(st.session_state.current_frame / total_frames)
                 st.caption(f"Frame: {st.session_state.current_frame} / {total_frames}")
+                if settings['motion_gate']:
+                    st.caption(f"정적 장면 추론 생략: {result['skipped_inferences']}회 "
+                               f"(확인한 프레임의 {result['skip_ratio']:.0%})")
+                
+                # 분석 색인이 있으면 디코딩/추론 없이 임의 프레임의 분석값 조회
+                analysis_index = get_analysis_index(st.session_state, st.session_state.video_path)
+                if analysis_index is not None:
+                    render_risk_timeline(analysis_index, st.session_state.current_frame)
+                    target = st.slider("타임라인 탐색", 0, max(0, total_frames - 1),
+                                       st.session_state.current_frame, key="timeline_frame")
+                    indexed = analysis_index.lookup(target)
+                    if indexed is None:
+                        st.caption(f"Frame {target}: 아직 색인되지 않음")
+                    else:
+                        st.caption(f"Frame {target}: 인원 {indexed['count']}명 · "
+                                   f"CDI {indexed['cdi']:.2f} · {indexed['risk']}")
+                    if target != st.session_state.current_frame and st.button("이 프레임으로 이동", use_container_width=True):
+                        stop_worker()
+                        reset_pipeline()
+                        st.session_state.current_frame = target
+                        st.rerun()
+                else:
+                    st.caption("전체 타임라인: `python -m crowd index <영상>`으로 색인을 만들면 표시됩니다 "
+                               "(원본 영상 파일로 만든 색인도 내용이 같으면 사용).")
 
             # [우측] 대시보드
             with dash_col2:
@@ -238,13 +460,17 @@ def main():
                         st.success(f"저장 완료: {filename}")
                     else:
                         st.warning("저장할 데이터가 없습니다.")
-
-        cap.release()
+                
+                # 단계별 지연 시간 (접힌 패널)
+                render_profiler_panel(st.session_state.profiler)
+            
+            # Streamlit 렌더링 (시각화 포함) 소요 시간
+            st.session_state.profiler.record("render", time.perf_counter() - render_started)
+            st.session_state.profiler.maybe_log(logger)
         
-        # 자동 재생 로직
-        if st.session_state.is_playing and st.session_state.current_frame < total_frames - 1:
-            st.session_state.current_frame += 1 # 프레임 스킵 없이 1씩 증가 (속도 조절 필요 시 변경)
-            time.sleep(0.01) # 너무 빠르면 UI 갱신이 못따라감
+        # 자동 재생 로직: 고정 주기로 최신 결과를 가져오기 위해 리런
+        if st.session_state.is_playing or waiting_for_worker:
+            time.sleep(1.0 / UI_REFRESH_HZ)
             st.rerun()
             
     else:
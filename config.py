@@ -19,6 +19,8 @@ LOGS_DIR = os.path.join(BASE_DIR, "logs")
 REPORTS_DIR = os.path.join(BASE_DIR, "reports")
 MODEL_PATH = os.path.join(BASE_DIR, "yolov8n.pt")
 SAMPLE_VIDEO_PATH = os.path.join(ASSETS_DIR, "sample_video.mp4")
+# 업로드 영상 임시 저장 디렉토리
+TEMP_DIR = os.path.join(BASE_DIR, "temp")
 
 # 디렉토리 생성
 os.makedirs(ASSETS_DIR, exist_ok=True)
@@ -44,8 +46,171 @@ DEFAULT_CONF_THRESHOLD = 0.25
 DEFAULT_IOU_THRESHOLD = 0.45
 PERSON_CLASS_ID = 0
 
+# 추론 백엔드: "torch"(PyTorch) | "onnx"(onnxruntime) | "openvino"
+# onnx/openvino는 MODEL_PATH(.pt)를 처음 사용할 때 자동으로 내보냄 (python -m crowd export)
+INFERENCE_BACKEND = "torch"
+# INT8 양자화 모델 사용 여부 (onnx: 동적 양자화, openvino: NNCF 보정)
+INFERENCE_INT8 = False
+# 내보내기 입력 이미지 크기
+INFERENCE_IMGSZ = 640
+# 내보낸 모델 일치 검사: 샘플 프레임 수, 최소 평균 IoU, 프레임별 최대 사람 수 차이
+PARITY_SAMPLE_FRAMES = 8
+PARITY_MIN_IOU = 0.9
+PARITY_MAX_COUNT_DIFF = 1
+
+# 공유 추론 서버: 세션들의 요청을 모아 한 번에 추론 (트래킹은 세션별 트래커)
+INFERENCE_SERVER_ENABLED = True
+# 한 배치에 묶을 최대 요청 수 / 첫 요청 이후 요청을 더 모으는 시간 (ms)
+INFERENCE_BATCH_MAX = 8
+INFERENCE_BATCH_WAIT_MS = 5
+# 세션별 트래커 설정 (ultralytics 트래커 yaml)
+TRACKER_CONFIG = "bytetrack.yaml"
+
+# ==========================================
+# 단계별 지연 시간 측정 설정
+# ==========================================
+# 단계별 지연 시간 측정 사용 여부
+PROFILER_ENABLED = True
+# 단계별로 보관할 최근 측정값 수 (p50/p95/p99 계산 구간)
+PROFILER_WINDOW = 512
+# 로거로 통계를 출력하는 주기 (초)
+PROFILER_LOG_INTERVAL = 30.0
+
+# ==========================================
+# 모니터링 지표(Prometheus) 설정
+# ==========================================
+# 내장 HTTP 서버로 /metrics 지표 제공 여부
+METRICS_ENABLED = False
+# 바인드 주소 / 포트
+METRICS_HOST = "0.0.0.0"
+METRICS_PORT = 9108
+# 지연 시간 히스토그램 구간 (초)
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# ==========================================
+# 벤치마크 설정 (python -m crowd bench)
+# ==========================================
+# 합성 영상 저장 디렉토리 (같은 설정의 영상은 재사용)
+BENCHMARK_DIR = os.path.join(BASE_DIR, "cache", "benchmark")
+# 측정할 해상도 (width, height) / 평균 인원 수(밀집도)
+BENCHMARK_RESOLUTIONS = ((640, 480), (1280, 720), (1920, 1080))
+BENCHMARK_DENSITIES = (5, 20, 50)
+# 시나리오별 프레임 수 / 합성 영상 프레임 레이트 / 난수 시드
+BENCHMARK_FRAMES = 60
+BENCHMARK_FPS = 30
+BENCHMARK_SEED = 0
+# 이전 결과 대비 이 비율 이상 느려지고 차이가 MIN_DELTA_MS보다 크면 성능 저하로 표시
+BENCHMARK_REGRESSION_THRESHOLD = 0.1
+BENCHMARK_MIN_DELTA_MS = 0.05
+
 # ==========================================
 # UI 설정
 # ==========================================
 # 차트 색상
 CHART_COLORS = ["#4CAF50", "#FFC107", "#FF9800", "#F44336"]
+
+# ==========================================
+# 재생/분석 루프 설정
+# ==========================================
+# 재생 중 UI가 최신 분석 결과를 가져오는 주기 (Hz)
+UI_REFRESH_HZ = 4
+# 백그라운드 워커의 표시용 결과 링 버퍼 크기
+RESULT_BUFFER_SIZE = 8
+# UI가 가져가기 전까지 보관할 기록용 레코드 최대 개수
+HISTORY_QUEUE_SIZE = 10000
+
+# ==========================================
+# 세션 기록 설정
+# ==========================================
+# 메모리(링 버퍼)에 보관할 최근 기록 수
+HISTORY_CAPACITY = 3600
+# 버퍼가 가득 찼을 때 한 번에 디스크로 내보낼 기록 수
+HISTORY_SPILL_CHUNK = 900
+# 내보낸 기록 파일 위치
+HISTORY_SPILL_DIR = os.path.join(LOGS_DIR, "history")
+# 실시간 추이 차트에 표시할 최근 기록 수
+CHART_HISTORY_POINTS = 30
+
+# ==========================================
+# 분석 로그 스트리밍 저장 설정
+# ==========================================
+# 분석 중 레코드를 자동으로 이어 쓸 디렉토리
+LOG_STREAM_DIR = os.path.join(LOGS_DIR, "stream")
+# 플러시 주기 (초) / 이 개수만큼 모이면 바로 플러시
+LOG_FLUSH_INTERVAL = 2.0
+LOG_FLUSH_RECORDS = 200
+# 파일 크기가 이 값을 넘으면 새 파일로 교체 (날짜가 바뀔 때도 교체)
+LOG_ROTATE_BYTES = 10 * 1024 * 1024
+# 작성 스레드 대기 큐 최대 크기 (넘치면 레코드를 버림)
+LOG_QUEUE_SIZE = 10000
+
+# ==========================================
+# 업로드 저장 설정
+# ==========================================
+# 업로드 파일을 디스크에 쓸 때의 청크 크기 (바이트)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# 임시 디렉토리 최대 크기 (넘으면 오래 사용하지 않은 업로드부터 삭제)
+TEMP_MAX_BYTES = 5 * 1024 * 1024 * 1024
+
+# ==========================================
+# 검출 결과 캐시 설정
+# ==========================================
+# 영상/프레임/모델별 원본 검출 결과 캐시 사용 여부
+DETECTION_CACHE_ENABLED = True
+DETECTION_CACHE_PATH = os.path.join(BASE_DIR, "cache", "detections.sqlite")
+# 캐시에 저장할 때의 추론 신뢰도 (이 값 이상의 임계값은 재추론 없이 캐시에서 거름)
+DETECTION_CACHE_BASE_CONF = 0.1
+# 이 개수만큼 저장할 때마다 커밋
+DETECTION_CACHE_COMMIT_EVERY = 50
+# 최대 저장 프레임 수 (넘으면 오래 사용하지 않은 프레임부터 삭제, 30fps 약 2시간 분량)
+DETECTION_CACHE_MAX_ROWS = 200000
+
+# ==========================================
+# 분석 색인 설정
+# ==========================================
+# 색인 저장 디렉토리 (영상 내용 지문별 파일, 업로드 임시 디렉토리 정리와 무관)
+INDEX_DIR = os.path.join(BASE_DIR, "cache", "index")
+# 색인 작성 중 이 프레임 수마다 디스크에 반영 (중단 시 이어서 진행할 지점)
+INDEX_FLUSH_EVERY = 100
+# 위험도 타임라인 최대 점 수
+INDEX_TIMELINE_POINTS = 500
+
+# ==========================================
+# 다중 카메라 스케줄러 설정
+# ==========================================
+# 한 스텝에서 검출기에 넣을 최대 스트림 수
+SCHEDULER_STREAMS_PER_STEP = 4
+# 우선 처리할 위험도 레벨
+PRIORITY_RISK_LEVELS = ("WARNING", "DANGER")
+
+# ==========================================
+# 적응형 검출 간격 설정
+# ==========================================
+# 검출 간격 범위 (N 프레임마다 YOLO 추론, 사이 프레임은 트랙 속도로 박스 이동)
+DETECTION_STRIDE_MIN = 1
+DETECTION_STRIDE_MAX = 8
+# CDI가 이 값 미만이면 간격을 늘리고, HIGH 이상이면 줄임
+STRIDE_CDI_LOW = 0.3
+STRIDE_CDI_HIGH = 0.6
+# 빠른 움직임 기준 (프레임당 중심 이동 거리 / 프레임 대각선)
+STRIDE_FAST_MOTION = 0.01
+
+# ==========================================
+# 정적 장면 추론 생략 설정
+# ==========================================
+# 비교용 축소 프레임 너비 (픽셀)
+MOTION_GATE_WIDTH = 160
+# 픽셀이 바뀌었다고 판단할 회색조 밝기 차이
+MOTION_PIXEL_DELTA = 25
+# 바뀐 픽셀 비율이 이 값 미만이면 정적 프레임으로 판단
+MOTION_CHANGED_RATIO = 0.002
+# 연속 생략 최대 프레임 수 (이후 한 번은 강제로 추론)
+MOTION_GATE_MAX_SKIP = 300
+
+# ==========================================
+# 트랙 스무딩 설정
+# ==========================================
+# 동시에 유지할 최대 트랙 수
+TRACK_TABLE_CAPACITY = 1024
+# 이 프레임 수보다 오래 보이지 않은 트랙은 제거
+TRACK_MAX_MISSED = 30
@@ -7,7 +7,51 @@ import cv2
 import numpy as np
 import os
 
-def create_sample_video(output_path="assets/sample_video.mp4", duration_seconds=10, fps=30):
+def people_positions(frame_index, fps=30, width=640, height=480, people=3):
+    """
+    프레임의 "사람" 도형 중심 위치 (영상 생성과 벤치마크의 정답 박스에 공통 사용)
+
+    Args:
+        frame_index: 프레임 번호
+        fps: 프레임 레이트
+        width, height: 해상도
+        people: 평균 인원 수 (시간에 따라 ±2명 변동, 최소 1명)
+
+    Returns:
+        positions: [(x, y), ...] 리스트
+    """
+    # 시간에 따라 움직이는 도형들 (사람처럼 보이도록)
+    # 프레임 번호에 따라 위치 변경
+    t = frame_index / fps
+    num_people = max(1, people + int(np.sin(t) * 2))  # 기본값(3명)이면 1~5명 사이에서 변동
+
+    # 해상도에 비례한 움직임 폭 (640x480 기준)
+    sx, sy = width / 640, height / 480
+    positions = []
+    for j in range(num_people):
+        # 각 사람의 위치 계산 (움직임 시뮬레이션)
+        x = int((width // 4) + (width // 2) * (j / num_people) + 50 * sx * np.sin(t + j))
+        y = int((height // 4) + (height // 2) * (j / num_people) + 30 * sy * np.cos(t + j))
+        positions.append((x, y))
+    return positions
+
+
+def people_boxes(frame_index, fps=30, width=640, height=480, people=3):
+    """
+    프레임의 "사람" 도형 외곽 박스 (머리 포함)
+
+    Returns:
+        boxes: (N, 4) int64 배열 [x1, y1, x2, y2]
+    """
+    scale = width / 640
+    boxes = [(x - 20 * scale, y - 65 * scale, x + 20 * scale, y + 40 * scale)
+             for x, y in people_positions(frame_index, fps, width, height, people)]
+    return np.array(boxes, dtype=np.float64).round().astype(np.int64).reshape(-1, 4)
+
+
+def create_sample_video(output_path="assets/sample_video.mp4", duration_seconds=10, fps=30,
+                        width=640, height=480, people=3, seed=None, total_frames=None,
+                        verbose=True):
     """
     테스트용 샘플 비디오 생성
     
@@ -15,44 +59,45 @@ def create_sample_video(output_path="assets/sample_video.mp4", duration_seconds=
         output_path: 출력 비디오 경로
         duration_seconds: 영상 길이 (초)
         fps: 프레임 레이트
+        width, height: 해상도
+        people: 평균 인원 수 (밀집도)
+        seed: 배경 잡음 난수 시드 (같은 시드면 같은 영상, None이면 매번 다름)
+        total_frames: 프레임 수 (None이면 duration_seconds * fps)
+        verbose: 진행 상황 출력 여부
     """
     # assets 디렉토리 생성
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
     
     # 비디오 작성자 초기화
-    width, height = 640, 480
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    rng = np.random.RandomState(seed)
+    scale = width / 640
     
-    total_frames = duration_seconds * fps
+    if total_frames is None:
+        total_frames = duration_seconds * fps
     
-    print(f"샘플 비디오 생성 중... ({duration_seconds}초, {fps} FPS)")
+    if verbose:
+        print(f"샘플 비디오 생성 중... ({total_frames / fps:.1f}초, {fps} FPS)")
     
     for i in range(total_frames):
         # 배경 생성 (회색 톤)
-        frame = np.random.randint(50, 100, (height, width, 3), dtype=np.uint8)
-        
-        # 시간에 따라 움직이는 도형들 (사람처럼 보이도록)
-        # 프레임 번호에 따라 위치 변경
-        t = i / fps
+        frame = rng.randint(50, 100, (height, width, 3)).astype(np.uint8)
         
         # 여러 개의 "사람" 도형 추가
-        num_people = 3 + int(np.sin(t) * 2)  # 1~5명 사이에서 변동
-        
-        for j in range(num_people):
-            # 각 사람의 위치 계산 (움직임 시뮬레이션)
-            x = int((width // 4) + (width // 2) * (j / num_people) + 50 * np.sin(t + j))
-            y = int((height // 4) + (height // 2) * (j / num_people) + 30 * np.cos(t + j))
+        for j, (x, y) in enumerate(people_positions(i, fps, width, height, people)):
+            shade = 100 + (j % 5) * 30
             
             # 사람 모양의 직사각형 (몸통)
             cv2.rectangle(frame, 
-                         (x - 20, y - 40), 
-                         (x + 20, y + 40), 
-                         (100 + j * 30, 100 + j * 30, 100 + j * 30), 
+                         (int(x - 20 * scale), int(y - 40 * scale)), 
+                         (int(x + 20 * scale), int(y + 40 * scale)), 
+                         (shade, shade, shade), 
                          -1)
             
             # 머리 (원)
-            cv2.circle(frame, (x, y - 50), 15, (120 + j * 20, 120 + j * 20, 120 + j * 20), -1)
+            head = 120 + (j % 5) * 20
+            cv2.circle(frame, (x, int(y - 50 * scale)), int(15 * scale), (head, head, head), -1)
         
         # 그리드 선 표시 (3×3)
         for k in range(1, 3):
@@ -61,15 +106,16 @@ def create_sample_video(output_path="assets/sample_video.mp4", duration_seconds=
         
         out.write(frame)
         
-        if (i + 1) % 30 == 0:
+        if verbose and (i + 1) % 30 == 0:
             print(f"진행률: {(i + 1) / total_frames * 100:.1f}%")
     
     out.release()
-    print(f"✅ 샘플 비디오 생성 완료: {output_path}")
-    print(f"   - 길이: {duration_seconds}초")
-    print(f"   - 해상도: {width}x{height}")
-    print(f"   - FPS: {fps}")
+    if verbose:
+        print(f"✅ 샘플 비디오 생성 완료: {output_path}")
+        print(f"   - 길이: {total_frames / fps:.1f}초")
+        print(f"   - 해상도: {width}x{height}")
+        print(f"   - FPS: {fps}")
+    return output_path
 
 if __name__ == "__main__":
     create_sample_video()
-
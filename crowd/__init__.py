@@ -0,0 +1,4 @@
+"""
+군중 위험도 분석 명령줄 도구
+- 사용법: python -m crowd analyze video.mp4
+"""
@@ -0,0 +1,338 @@
+"""
+명령줄 진입점 (python -m crowd)
+"""
+import argparse
+import os
+import sys
+
+from config import (DEFAULT_CONF_THRESHOLD, LOGS_DIR, MODEL_PATH, SCHEDULER_STREAMS_PER_STEP,
+                    INFERENCE_BACKEND, INFERENCE_INT8, INFERENCE_IMGSZ, SAMPLE_VIDEO_PATH,
+                    PARITY_SAMPLE_FRAMES, REPORTS_DIR, BENCHMARK_RESOLUTIONS, BENCHMARK_DENSITIES,
+                    BENCHMARK_FRAMES, BENCHMARK_SEED, BENCHMARK_REGRESSION_THRESHOLD)
+
+
+def parse_grid_size(text):
+    """
+    "3x3" 형식 문자열을 (rows, cols)로 변환
+    """
+    try:
+        rows, cols = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"그리드 크기는 ROWSxCOLS 형식이어야 합니다: {text}")
+    if rows <= 0 or cols <= 0:
+        raise argparse.ArgumentTypeError(f"그리드 크기는 1 이상이어야 합니다: {text}")
+    return rows, cols
+
+
+def parse_resolutions(text):
+    """
+    "640x480,1280x720" 형식 문자열을 [(width, height), ...]로 변환
+    """
+    resolutions = []
+    for item in text.split(","):
+        try:
+            width, height = (int(v) for v in item.lower().split("x"))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"해상도는 WIDTHxHEIGHT 형식이어야 합니다: {item}")
+        if width <= 0 or height <= 0:
+            raise argparse.ArgumentTypeError(f"해상도는 1 이상이어야 합니다: {item}")
+        resolutions.append((width, height))
+    return resolutions
+
+
+def parse_int_list(text):
+    """
+    "5,20,50" 형식 문자열을 정수 리스트로 변환
+    """
+    try:
+        values = [int(v) for v in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"쉼표로 구분된 정수여야 합니다: {text}")
+    if any(v <= 0 for v in values):
+        raise argparse.ArgumentTypeError(f"값은 1 이상이어야 합니다: {text}")
+    return values
+
+
+def default_output_path(video_path):
+    """입력 영상 이름을 기반으로 기본 출력 CSV 경로 생성"""
+    name = os.path.splitext(os.path.basename(video_path))[0]
+    return os.path.join(LOGS_DIR, f"offline_{name}.csv")
+
+
+def cmd_analyze(args):
+    """analyze 서브커맨드: 영상 헤드리스 분석"""
+    if not os.path.exists(args.video):
+        print(f"영상을 찾을 수 없습니다: {args.video}", file=sys.stderr)
+        return 1
+
+    output_path = args.output or default_output_path(args.video)
+
+    from modules.export import resolve_model_path
+    model_path = resolve_model_path(args.model, args.backend, args.int8)
+
+    if args.workers > 1:
+        from modules.offline import analyze_video_sharded
+
+        summary = analyze_video_sharded(
+            args.video, output_path, workers=args.workers, model_path=model_path,
+            conf_threshold=args.conf, grid_size=args.grid,
+            batch_size=args.batch_size, use_tracking=not args.no_tracking,
+            adaptive_stride=args.adaptive_stride, motion_gate=args.motion_gate,
+            chunk_frames=args.chunk_frames, backend=args.backend, int8=args.int8
+        )
+        print(f"병렬 분석: 워커 {summary['workers']}개, 구간 {summary['shards']}개")
+    else:
+        from modules.detector import CrowdDetector
+        from modules.offline import analyze_video
+
+        # 경로는 위에서 백엔드에 맞게 확정했으므로 다시 변환하지 않음
+        detector = CrowdDetector(model_path, backend=None)
+        summary = analyze_video(
+            args.video, output_path, detector=detector,
+            conf_threshold=args.conf, grid_size=args.grid,
+            batch_size=args.batch_size, use_tracking=not args.no_tracking,
+            adaptive_stride=args.adaptive_stride, motion_gate=args.motion_gate
+        )
+
+    print(f"분석 완료: {summary['frames']} 프레임, {summary['elapsed']:.1f}초")
+    print(f"처리 속도: {summary['fps']:.2f} frames/sec")
+    if args.motion_gate:
+        print(f"정적 프레임 추론 생략: {summary['skipped']} 프레임")
+    print(f"결과 파일: {summary['output']}")
+    return 0
+
+
+def cmd_export(args):
+    """export 서브커맨드: 추론 백엔드용 모델 내보내기 및 원본과의 일치 검사"""
+    from modules.export import check_parity, export_model, sample_frames, save_parity_report
+
+    path = export_model(args.model, args.backend, int8=args.int8, imgsz=args.imgsz, data=args.data)
+    print(f"내보내기 완료: {path}")
+
+    if args.skip_parity:
+        return 0
+    if not os.path.exists(args.video):
+        print(f"일치 검사용 영상을 찾을 수 없습니다: {args.video}", file=sys.stderr)
+        return 1
+
+    frames = sample_frames(args.video, args.frames)
+    report = check_parity(args.model, path, frames, conf_threshold=args.conf)
+    save_parity_report(args.model, path, report)
+    print(f"일치 검사: {report['frames']} 프레임, 평균 IoU {report['mean_iou']:.3f}, "
+          f"최대 인원 차이 {report['max_count_diff']}명")
+    if not report["passed"]:
+        print("일치 검사 실패: 내보낸 모델의 결과가 원본과 다릅니다.", file=sys.stderr)
+        return 1
+    print("일치 검사 통과")
+    return 0
+
+
+def cmd_index(args):
+    """index 서브커맨드: 타임라인 조회용 분석 색인 생성 (중단된 색인은 이어서 진행)"""
+    if not os.path.exists(args.video):
+        print(f"영상을 찾을 수 없습니다: {args.video}", file=sys.stderr)
+        return 1
+
+    from modules.analysis_index import build_index
+    from modules.detector import CrowdDetector
+
+    def report(done, total):
+        print(f"색인 진행: {done} / {total} 프레임", flush=True)
+
+    detector = CrowdDetector(args.model)
+    summary = build_index(
+        args.video, detector=detector, model_path=args.model,
+        conf_threshold=args.conf, grid_size=args.grid,
+        batch_size=args.batch_size, use_tracking=not args.no_tracking,
+        progress=report
+    )
+
+    if summary["resumed_from"]:
+        print(f"{summary['resumed_from']} 프레임부터 이어서 색인")
+    print(f"색인 완료: {summary['frames']} 프레임, {summary['elapsed']:.1f}초")
+    print(f"처리 속도: {summary['fps']:.2f} frames/sec")
+    print(f"색인 파일: {summary['output']}")
+    return 0
+
+
+def cmd_monitor(args):
+    """monitor 서브커맨드: 여러 카메라 영상을 검출기 하나로 번갈아 분석"""
+    missing = [path for path in args.videos if not os.path.exists(path)]
+    if missing:
+        print(f"영상을 찾을 수 없습니다: {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    from modules.detector import CrowdDetector
+    from modules.scheduler import MultiStreamScheduler
+
+    # 같은 파일 이름이 있어도 구분되도록 순번을 붙임
+    sources = {f"cam{i + 1}:{os.path.basename(path)}": path for i, path in enumerate(args.videos)}
+    metrics = None
+    if args.metrics_port is not None:
+        from utils.metrics import get_metrics
+        metrics = get_metrics(enabled=True, port=args.metrics_port)
+        print(f"지표 제공: http://localhost:{args.metrics_port}/metrics")
+
+    detector = CrowdDetector(args.model)
+    scheduler = MultiStreamScheduler(
+        detector, sources, grid_size=args.grid, conf_threshold=args.conf,
+        use_tracking=not args.no_tracking, streams_per_step=args.streams_per_step,
+        metrics=metrics
+    )
+
+    def report(results):
+        if scheduler.steps % args.report_every == 0:
+            for result in results:
+                print(f"[{result['stream']}] frame {result['frame_index']}: "
+                      f"{result['person_count']}명, CDI {result['cdi']:.2f}, {result['risk_info']['level']}")
+
+    try:
+        scheduler.run(max_steps=args.max_steps, callback=report)
+    finally:
+        scheduler.release()
+
+    for stream in scheduler.streams.values():
+        level = stream.risk_info["level"] if stream.risk_info else "-"
+        print(f"{stream.name}: {stream.frame_index} 프레임 분석, 마지막 위험도 {level}")
+    return 0
+
+
+def cmd_bench(args):
+    """bench 서브커맨드: 합성 영상으로 단계별 소요 시간과 종단 간 FPS 측정"""
+    from modules.benchmark import compare_results, load_results, run_benchmark, save_results
+
+    detector = None
+    if not args.no_detector:
+        from modules.detector import CrowdDetector
+        from modules.export import resolve_model_path
+
+        detector = CrowdDetector(resolve_model_path(args.model, args.backend, args.int8),
+                                 backend=None)
+
+    def report(scenario):
+        stages = ", ".join(f"{stage} {stats['p50']:.2f}ms" for stage, stats in scenario["stages"].items())
+        line = f"[{scenario['name']}] {stages}"
+        if scenario["end_to_end"] is not None:
+            line += f" | 종단 간 {scenario['end_to_end']['fps']:.1f} FPS"
+        print(line, flush=True)
+
+    results = run_benchmark(
+        args.resolutions, args.densities, args.frames, seed=args.seed, detector=detector,
+        grid_size=args.grid, conf_threshold=args.conf, progress=report
+    )
+    output_path = args.output or os.path.join(
+        REPORTS_DIR, f"benchmark_{results['created'].replace(':', '').replace('-', '')}.json"
+    )
+    save_results(results, output_path)
+    print(f"결과 파일: {output_path}")
+
+    if args.compare is None:
+        return 0
+    rows = compare_results(results, load_results(args.compare), threshold=args.threshold)
+    regressed = [row for row in rows if row["regressed"]]
+    for row in rows:
+        mark = " ← 성능 저하" if row["regressed"] else ""
+        print(f"[{row['scenario']}] {row['metric']}: {row['baseline']:.2f} → {row['current']:.2f}ms "
+              f"(x{row['ratio']:.2f}){mark}")
+    if regressed:
+        print(f"성능 저하 {len(regressed)}건 (기준: {args.compare})", file=sys.stderr)
+        return 1
+    print(f"성능 저하 없음 (비교 항목 {len(rows)}개)")
+    return 0
+
+
+def build_parser():
+    """명령줄 인자 파서 생성"""
+    parser = argparse.ArgumentParser(prog="python -m crowd", description="AI 군중 위험도 분석 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    analyze = subparsers.add_parser("analyze", help="녹화 영상을 UI 없이 분석하여 CSV로 저장")
+    analyze.add_argument("video", help="입력 비디오 경로")
+    analyze.add_argument("-o", "--output", help="출력 CSV 경로 (기본값: logs/offline_<영상이름>.csv)")
+    analyze.add_argument("--model", default=MODEL_PATH, help="YOLO 모델 경로")
+    analyze.add_argument("--conf", type=float, default=DEFAULT_CONF_THRESHOLD, help="검출 신뢰도 임계값")
+    analyze.add_argument("--grid", type=parse_grid_size, default="3x3", help="그리드 크기 (예: 3x3)")
+    analyze.add_argument("--batch-size", type=int, default=1, help="한 번의 추론에 묶을 프레임 수")
+    analyze.add_argument("--no-tracking", action="store_true", help="객체 트래킹 비활성화")
+    analyze.add_argument("--backend", choices=("torch", "onnx", "openvino"), default=INFERENCE_BACKEND,
+                         help="추론 백엔드 (onnx/openvino는 필요하면 자동으로 내보냄)")
+    analyze.add_argument("--int8", action="store_true", default=INFERENCE_INT8,
+                         help="INT8 양자화 모델 사용 (onnx/openvino)")
+    analyze.add_argument("--adaptive-stride", action="store_true",
+                         help="적응형 검출 간격 사용 (한산한 구간은 여러 프레임마다 한 번만 추론)")
+    analyze.add_argument("--motion-gate", action="store_true",
+                         help="화면 변화가 없는 프레임은 추론을 건너뛰고 직전 결과 재사용")
+    analyze.add_argument("-j", "--workers", type=int, default=1,
+                         help="병렬 분석 프로세스 수 (2 이상이면 프레임 구간별로 나누어 분석)")
+    analyze.add_argument("--chunk-frames", type=int, default=None,
+                         help="병렬 분석 시 구간당 프레임 수 (기본값: 자동)")
+    analyze.set_defaults(func=cmd_analyze)
+
+    export = subparsers.add_parser("export", help="ONNX/OpenVINO 모델 내보내기 및 일치 검사")
+    export.add_argument("--model", default=MODEL_PATH, help="원본 YOLO .pt 모델 경로")
+    export.add_argument("--backend", choices=("onnx", "openvino"), default="onnx", help="내보낼 형식")
+    export.add_argument("--int8", action="store_true", default=INFERENCE_INT8, help="INT8 양자화")
+    export.add_argument("--imgsz", type=int, default=INFERENCE_IMGSZ, help="입력 이미지 크기")
+    export.add_argument("--data", default=None, help="OpenVINO INT8 보정용 데이터셋 yaml")
+    export.add_argument("--video", default=SAMPLE_VIDEO_PATH, help="일치 검사용 영상")
+    export.add_argument("--frames", type=int, default=PARITY_SAMPLE_FRAMES, help="일치 검사 프레임 수")
+    export.add_argument("--conf", type=float, default=DEFAULT_CONF_THRESHOLD, help="검출 신뢰도 임계값")
+    export.add_argument("--skip-parity", action="store_true", help="일치 검사 생략")
+    export.set_defaults(func=cmd_export)
+
+    index = subparsers.add_parser("index", help="대시보드 타임라인용 프레임별 분석 색인 생성")
+    index.add_argument("video", help="입력 비디오 경로 (색인은 cache/index에 영상 내용별로 저장, 대시보드 업로드와 공유)")
+    index.add_argument("--model", default=MODEL_PATH, help="YOLO 모델 경로")
+    index.add_argument("--conf", type=float, default=DEFAULT_CONF_THRESHOLD, help="검출 신뢰도 임계값")
+    index.add_argument("--grid", type=parse_grid_size, default="3x3", help="그리드 크기 (예: 3x3)")
+    index.add_argument("--batch-size", type=int, default=1, help="한 번의 추론에 묶을 프레임 수")
+    index.add_argument("--no-tracking", action="store_true", help="객체 트래킹 비활성화")
+    index.set_defaults(func=cmd_index)
+
+    monitor = subparsers.add_parser("monitor", help="여러 카메라 영상을 검출기 하나로 번갈아 분석")
+    monitor.add_argument("videos", nargs="+", help="입력 비디오 경로 목록")
+    monitor.add_argument("--model", default=MODEL_PATH, help="YOLO 모델 경로")
+    monitor.add_argument("--conf", type=float, default=DEFAULT_CONF_THRESHOLD, help="검출 신뢰도 임계값")
+    monitor.add_argument("--grid", type=parse_grid_size, default="3x3", help="그리드 크기 (예: 3x3)")
+    monitor.add_argument("--no-tracking", action="store_true", help="객체 트래킹 비활성화 (배치 추론 사용)")
+    monitor.add_argument("--streams-per-step", type=int, default=SCHEDULER_STREAMS_PER_STEP,
+                         help="한 스텝에서 분석할 최대 스트림 수")
+    monitor.add_argument("--max-steps", type=int, default=None, help="최대 스텝 수")
+    monitor.add_argument("--report-every", type=int, default=30, help="상태 출력 주기 (스텝)")
+    monitor.add_argument("--metrics-port", type=int, default=None,
+                         help="Prometheus 지표를 제공할 포트 (지정하지 않으면 사용 안 함)")
+    monitor.set_defaults(func=cmd_monitor)
+
+    bench = subparsers.add_parser("bench", help="합성 영상으로 파이프라인 단계별 성능 측정")
+    bench.add_argument("--resolutions", type=parse_resolutions,
+                       default=list(BENCHMARK_RESOLUTIONS), help="해상도 목록 (예: 640x480,1280x720)")
+    bench.add_argument("--densities", type=parse_int_list, default=list(BENCHMARK_DENSITIES),
+                       help="평균 인원 수 목록 (예: 5,20,50)")
+    bench.add_argument("--frames", type=int, default=BENCHMARK_FRAMES, help="시나리오별 프레임 수")
+    bench.add_argument("--seed", type=int, default=BENCHMARK_SEED, help="합성 영상 난수 시드")
+    bench.add_argument("--model", default=MODEL_PATH, help="YOLO 모델 경로")
+    bench.add_argument("--backend", choices=("torch", "onnx", "openvino"), default=INFERENCE_BACKEND,
+                       help="추론 백엔드")
+    bench.add_argument("--int8", action="store_true", default=INFERENCE_INT8,
+                       help="INT8 양자화 모델 사용 (onnx/openvino)")
+    bench.add_argument("--conf", type=float, default=DEFAULT_CONF_THRESHOLD, help="검출 신뢰도 임계값")
+    bench.add_argument("--grid", type=parse_grid_size, default="3x3", help="그리드 크기 (예: 3x3)")
+    bench.add_argument("--no-detector", action="store_true",
+                       help="모델 없이 측정 (검출 단계와 종단 간 FPS 생략)")
+    bench.add_argument("-o", "--output", help="결과 JSON 경로 (기본값: reports/benchmark_<시각>.json)")
+    bench.add_argument("--compare", default=None, help="비교할 이전 결과 JSON (성능 저하가 있으면 종료 코드 1)")
+    bench.add_argument("--threshold", type=float, default=BENCHMARK_REGRESSION_THRESHOLD,
+                       help="성능 저하로 판단할 소요 시간 증가 비율 (0.1 = 10%%)")
+    bench.set_defaults(func=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
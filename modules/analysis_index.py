@@ -0,0 +1,301 @@
+"""
+영상 분석 색인 모듈
+- 프레임별 인원 수, 구역별 인원, CDI, 위험도를 영상 내용 지문별 메모리 맵 NumPy 파일에 저장
+- 디코딩/추론 없이 임의 프레임의 분석값을 O(1)로 조회, 전체 위험도 타임라인 제공
+- 색인 작업이 중단되어도 완료된 프레임은 유지되며 이어서 진행 가능
+"""
+import json
+import os
+import time
+
+import numpy as np
+
+from config import (DEFAULT_CONF_THRESHOLD, DEFAULT_GRID_SIZE, MODEL_PATH,
+                    RISK_LEVELS, INDEX_DIR, INDEX_FLUSH_EVERY)
+from modules.detection_cache import video_fingerprint
+from modules.offline import iter_frame_records
+from utils.history import RISK_CODES, RISK_NAMES
+from utils.video import VideoSource
+
+# 색인 파일 버전 (레코드 구조가 바뀌면 올림)
+INDEX_VERSION = 1
+
+
+def index_paths(video_key, index_dir=INDEX_DIR):
+    """
+    영상에 대응하는 색인 파일 경로
+
+    원본 파일과 대시보드의 업로드 사본(temp/<sha256>)이 같은 색인을 쓰도록
+    경로 대신 영상 내용 지문으로 찾는다.
+
+    Args:
+        video_key: video_fingerprint() 값
+        index_dir: 색인 저장 디렉토리
+
+    Returns:
+        data_path: 프레임별 레코드 (.npy, 메모리 맵)
+        meta_path: 색인 설정 (.json)
+    """
+    base = os.path.join(index_dir, video_key)
+    return f"{base}.crowdindex.npy", f"{base}.crowdindex.json"
+
+
+def make_index_dtype(num_cells):
+    """프레임 레코드 구조체 dtype (done이 1인 프레임만 유효)"""
+    return np.dtype([
+        ("done", np.uint8),
+        ("risk", np.int8),
+        ("count", np.int32),
+        ("cdi", np.float32),
+        ("grid_counts", np.int32, (num_cells,))
+    ])
+
+
+class AnalysisIndex:
+    """
+    영상 한 편의 프레임별 분석 색인 (메모리 맵)
+
+    프레임 번호가 곧 배열 인덱스이므로 조회는 O(1)이며, 파일은 필요한 부분만
+    페이지 단위로 읽힌다. 각 레코드는 값을 쓴 뒤 done 플래그를 세우므로
+    중단된 색인 작업은 done이 아닌 첫 프레임부터 다시 시작하면 된다.
+    """
+
+    def __init__(self, data, meta, data_path):
+        self.data = data
+        self.meta = meta
+        self.data_path = data_path
+
+    @property
+    def total_frames(self):
+        return len(self.data)
+
+    @property
+    def grid_size(self):
+        return tuple(self.meta["grid_size"])
+
+    @property
+    def done_frames(self):
+        return int(np.count_nonzero(self.data["done"]))
+
+    @property
+    def complete(self):
+        return self.done_frames == self.total_frames
+
+    def first_pending(self):
+        """
+        아직 색인되지 않은 첫 프레임 번호
+
+        Returns:
+            frame_index: 프레임 번호 (모두 완료되었으면 total_frames)
+        """
+        pending = np.flatnonzero(self.data["done"] == 0)
+        return int(pending[0]) if len(pending) else self.total_frames
+
+    def lookup(self, frame_index):
+        """
+        프레임 하나의 분석값 조회
+
+        Args:
+            frame_index: 프레임 번호
+
+        Returns:
+            record: {'count', 'cdi', 'risk', 'grid_counts'} 딕셔너리 (색인 전이면 None)
+        """
+        if not 0 <= frame_index < self.total_frames:
+            return None
+        row = self.data[frame_index]
+        if not row["done"]:
+            return None
+        return {
+            "count": int(row["count"]),
+            "cdi": float(row["cdi"]),
+            "risk": RISK_NAMES[row["risk"]],
+            "grid_counts": row["grid_counts"].tolist()
+        }
+
+    def write(self, record):
+        """iter_frame_records()의 레코드를 색인에 기록"""
+        row = self.data[record["frame"]]
+        row["count"] = record["count"]
+        row["cdi"] = record["cdi"]
+        row["risk"] = RISK_CODES.get(record["risk"], 0)
+        row["grid_counts"] = record["grid_counts"]
+        row["done"] = 1
+
+    def timeline(self, max_points=500):
+        """
+        전체 영상 위험도 타임라인 (구간별 최대 CDI로 축소)
+
+        Args:
+            max_points: 최대 점 수
+
+        Returns:
+            frames: 구간 시작 프레임 배열
+            cdi: 구간 내 색인된 프레임의 최대 CDI 배열 (색인 전 구간은 NaN)
+        """
+        step = max(1, -(-self.total_frames // max_points))
+        cdi = np.where(self.data["done"] == 1, self.data["cdi"], np.nan).astype(np.float32)
+        pad = (-len(cdi)) % step
+        if pad:
+            cdi = np.concatenate([cdi, np.full(pad, np.nan, dtype=np.float32)])
+        blocks = cdi.reshape(-1, step)
+        has_value = ~np.isnan(blocks).all(axis=1)
+        peaks = np.full(len(blocks), np.nan, dtype=np.float32)
+        peaks[has_value] = np.nanmax(blocks[has_value], axis=1)
+        frames = np.arange(len(blocks)) * step
+        return frames, peaks
+
+    def flush(self):
+        self.data.flush()
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def open_analysis_index(video_path, meta=None, create=False, index_dir=INDEX_DIR):
+    """
+    영상의 분석 색인 열기
+
+    create=True이면 색인이 없거나 meta(설정)가 다를 때 새로 만든다.
+    create=False이면 있는 색인을 읽기 전용으로 연다.
+    색인에 기록된 영상 지문이 현재 영상과 다르면 없는 것으로 본다.
+
+    Args:
+        video_path: 비디오 파일 경로
+        meta: 색인 설정 딕셔너리 (create=True일 때 필요, 'video'에 영상 지문 포함)
+        create: 없으면(또는 설정이 다르면) 새로 생성할지 여부
+        index_dir: 색인 저장 디렉토리
+
+    Returns:
+        index: AnalysisIndex (create=False이고 색인이 없으면 None)
+    """
+    video_key = video_fingerprint(video_path)
+    data_path, meta_path = index_paths(video_key, index_dir)
+    existing = _read_meta(meta_path)
+    usable = (existing is not None and os.path.exists(data_path)
+              and existing.get("version") == INDEX_VERSION
+              and existing.get("video") == video_key)
+
+    if not create:
+        if not usable:
+            return None
+        data = np.load(data_path, mmap_mode="r")
+        return AnalysisIndex(data, existing, data_path)
+
+    if usable and existing == meta:
+        data = np.lib.format.open_memmap(data_path, mode="r+")
+        return AnalysisIndex(data, existing, data_path)
+
+    rows, cols = meta["grid_size"]
+    os.makedirs(index_dir, exist_ok=True)
+    data = np.lib.format.open_memmap(
+        data_path, mode="w+", dtype=make_index_dtype(rows * cols),
+        shape=(meta["total_frames"],)
+    )
+    data.flush()
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return AnalysisIndex(data, meta, data_path)
+
+
+def build_index(video_path, detector=None, model_path=MODEL_PATH,
+                conf_threshold=DEFAULT_CONF_THRESHOLD, grid_size=DEFAULT_GRID_SIZE,
+                batch_size=1, use_tracking=True, flush_every=INDEX_FLUSH_EVERY,
+                progress=None, index_dir=INDEX_DIR):
+    """
+    영상 전체의 분석 색인 생성 (중단된 색인은 이어서 진행)
+
+    Args:
+        video_path: 입력 비디오 경로
+        detector: CrowdDetector 인스턴스 (None이면 새로 생성)
+        model_path: YOLO 모델 경로 (색인 설정에 기록)
+        conf_threshold: 신뢰도 임계값
+        grid_size: 그리드 크기 (rows, cols)
+        batch_size: 한 번의 추론에 묶을 프레임 수
+        use_tracking: 객체 트래킹 사용 여부
+        flush_every: 이 프레임 수마다 디스크에 반영
+        progress: (완료 프레임 수, 전체 프레임 수)를 받는 콜백
+        index_dir: 색인 저장 디렉토리
+
+    Returns:
+        summary: {'frames', 'resumed_from', 'elapsed', 'fps', 'output'} 딕셔너리
+    """
+    source = VideoSource(video_path)
+    meta = {
+        "version": INDEX_VERSION,
+        "video": video_fingerprint(video_path),
+        "total_frames": source.total_frames,
+        "fps": source.fps,
+        "grid_size": list(grid_size),
+        "conf_threshold": conf_threshold,
+        "model": os.path.basename(model_path),
+        "tracking": use_tracking,
+        "risk_levels": list(RISK_LEVELS)
+    }
+    index = open_analysis_index(video_path, meta, create=True, index_dir=index_dir)
+    start_frame = index.first_pending()
+
+    if detector is None:
+        from modules.detector import CrowdDetector
+        detector = CrowdDetector(model_path)
+    detector.reset_tracking()
+
+    started = time.perf_counter()
+    frames = 0
+    try:
+        records = iter_frame_records(
+            detector, source, start_frame=start_frame,
+            conf_threshold=conf_threshold, grid_size=grid_size,
+            batch_size=batch_size, use_tracking=use_tracking
+        )
+        for record in records:
+            index.write(record)
+            frames += 1
+            if frames % flush_every == 0:
+                index.flush()
+                if progress is not None:
+                    progress(start_frame + frames, index.total_frames)
+    finally:
+        index.flush()
+        source.release()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "frames": frames,
+        "resumed_from": start_frame,
+        "elapsed": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "output": index.data_path
+    }
+
+
+def get_analysis_index(state, video_path, index_dir=INDEX_DIR):
+    """
+    세션 상태에 보관된 분석 색인 반환 (영상이 바뀌거나 색인이 다시 만들어지면 새로 연다)
+
+    Args:
+        state: 세션 상태 (st.session_state 등 속성 접근 가능한 객체)
+        video_path: 비디오 파일 경로
+        index_dir: 색인 저장 디렉토리
+
+    Returns:
+        index: AnalysisIndex (색인이 없으면 None)
+    """
+    _, meta_path = index_paths(video_fingerprint(video_path), index_dir)
+    try:
+        stamp = os.path.getmtime(meta_path)
+    except OSError:
+        return None
+
+    cached = getattr(state, "analysis_index", None)
+    if cached is not None and cached[0] == video_path and cached[1] == stamp:
+        return cached[2]
+
+    index = open_analysis_index(video_path, index_dir=index_dir)
+    state.analysis_index = (video_path, stamp, index)
+    return index
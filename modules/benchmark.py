@@ -0,0 +1,285 @@
+"""
+파이프라인 벤치마크 모듈
+- 해상도/밀집도/시드별로 재현 가능한 합성 영상을 만들어 단계별 소요 시간과 종단 간 FPS 측정
+- 결과를 커밋 정보와 함께 JSON으로 저장하고, 이전 결과와 비교하여 성능 저하 탐지
+"""
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from config import (BASE_DIR, DEFAULT_CONF_THRESHOLD, DEFAULT_GRID_SIZE, BENCHMARK_DIR,
+                    BENCHMARK_FPS, BENCHMARK_REGRESSION_THRESHOLD, BENCHMARK_MIN_DELTA_MS)
+from create_sample_video import create_sample_video, people_boxes
+from modules.density import calculate_cdi, get_risk_level_info
+from modules.direction import get_direction_info
+from modules.export import model_backend
+from modules.pipeline import FramePipeline
+from utils.annotation import FrameAnnotator
+from utils.grid import get_grid_layout
+from utils.profiler import StageProfiler
+from utils.video import VideoSource
+
+# 결과 파일 형식 버전 (구조가 바뀌면 올림)
+RESULTS_VERSION = 1
+
+
+def scenario_name(width, height, people, seed):
+    """시나리오 식별 이름 (예: "1280x720_p20_s0")"""
+    return f"{width}x{height}_p{people}_s{seed}"
+
+
+def scenario_video(width, height, people, seed, frames, fps=BENCHMARK_FPS, video_dir=BENCHMARK_DIR):
+    """
+    시나리오 영상 경로 (없으면 생성, 같은 설정이면 재사용)
+
+    Returns:
+        path: 합성 영상 경로
+    """
+    path = os.path.join(video_dir, f"bench_{scenario_name(width, height, people, seed)}_n{frames}.mp4")
+    if not os.path.exists(path):
+        create_sample_video(path, fps=fps, width=width, height=height, people=people,
+                            seed=seed, total_frames=frames, verbose=False)
+    return path
+
+
+def git_revision(repo_dir=BASE_DIR):
+    """
+    현재 커밋 정보
+
+    Returns:
+        revision: {'commit', 'dirty'} 딕셔너리 (git을 쓸 수 없으면 값이 None)
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo_dir, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                cwd=repo_dir, capture_output=True, text=True, check=True).stdout
+        return {"commit": commit, "dirty": bool(status.strip())}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def _iter_frames(path):
+    source = VideoSource(path)
+    try:
+        for index in range(source.total_frames):
+            ret, frame = source.read(index)
+            if not ret:
+                break
+            yield index, frame
+    finally:
+        source.release()
+
+
+def _round_stats(stats):
+    return {stage: {key: round(value, 4) for key, value in values.items()}
+            for stage, values in stats.items()}
+
+
+def run_scenario(width, height, people, seed, frames, detector=None,
+                 grid_size=DEFAULT_GRID_SIZE, conf_threshold=DEFAULT_CONF_THRESHOLD,
+                 fps=BENCHMARK_FPS, video_dir=BENCHMARK_DIR):
+    """
+    시나리오 하나 측정
+
+    1회차는 단계를 하나씩 따로 측정한다. 그리드/CDI/방향/시각화 단계는 검출 결과가
+    아니라 영상을 만들 때의 정답 박스를 쓰므로 모델과 관계없이 밀집도가 고정된다.
+    2회차는 FramePipeline + FrameAnnotator로 대시보드와 같은 경로를 돌려
+    종단 간 FPS를 잰다 (검출기가 있을 때만).
+
+    Args:
+        width, height: 해상도
+        people: 평균 인원 수
+        seed: 영상 난수 시드
+        frames: 프레임 수
+        detector: CrowdDetector 인스턴스 (None이면 검출/종단 간 측정 생략)
+        grid_size: 그리드 크기 (rows, cols)
+        conf_threshold: 신뢰도 임계값
+        fps: 합성 영상 프레임 레이트
+        video_dir: 합성 영상 저장 디렉토리
+
+    Returns:
+        result: {'name', 'resolution', 'people', 'seed', 'frames', 'stages', 'end_to_end'} 딕셔너리
+    """
+    path = scenario_video(width, height, people, seed, frames, fps, video_dir)
+    layout = get_grid_layout((height, width), grid_size)
+    annotator = FrameAnnotator()
+    profiler = StageProfiler(enabled=True, window=frames)
+    span = profiler.span
+
+    if detector is not None:
+        detector.reset_tracking()
+
+    # 1회차: 단계별 측정
+    decode_started = time.perf_counter()
+    for index, frame in _iter_frames(path):
+        profiler.record("decode", time.perf_counter() - decode_started)
+
+        if detector is not None:
+            with span("detection"):
+                detector.detect_people(frame, conf_threshold=conf_threshold)
+
+        boxes = people_boxes(index, fps, width, height, people)
+        track_ids = np.arange(len(boxes), dtype=np.int64)
+        with span("grid_count"):
+            grid_counts = layout.count_people(boxes)
+        with span("cdi"):
+            cdi = calculate_cdi(len(boxes), width * height, grid_counts)
+            get_risk_level_info(cdi)
+        with span("direction"):
+            get_direction_info(grid_counts, grid_size)
+        with span("heatmap"):
+            annotator.heatmap_renderer.render(frame, grid_counts, layout)
+        with span("annotation"):
+            annotated = annotator.annotate(frame, boxes, track_ids, layout, grid_counts)
+            cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB)
+
+        decode_started = time.perf_counter()
+
+    result = {
+        "name": scenario_name(width, height, people, seed),
+        "resolution": [width, height],
+        "people": people,
+        "seed": seed,
+        "frames": frames,
+        "stages": _round_stats(profiler.summary()),
+        "end_to_end": None
+    }
+
+    # 2회차: 종단 간 (디코딩 → 분석 → 시각화)
+    if detector is not None:
+        detector.reset_tracking()
+        e2e_profiler = StageProfiler(enabled=True, window=frames)
+        pipeline = FramePipeline(detector, e2e_profiler)
+        e2e_annotator = FrameAnnotator(e2e_profiler)
+        settings = {"grid_size": grid_size, "conf_threshold": conf_threshold}
+
+        processed = 0
+        started = time.perf_counter()
+        for _, frame in _iter_frames(path):
+            e2e_annotator.render_rgb(pipeline.process(frame, settings))
+            processed += 1
+        elapsed = time.perf_counter() - started
+
+        result["end_to_end"] = {
+            "frames": processed,
+            "elapsed": round(elapsed, 4),
+            "fps": round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+            "stages": _round_stats(e2e_profiler.summary())
+        }
+    return result
+
+
+def run_benchmark(resolutions, densities, frames, seed=0, detector=None,
+                  grid_size=DEFAULT_GRID_SIZE, conf_threshold=DEFAULT_CONF_THRESHOLD,
+                  progress=None):
+    """
+    해상도 × 밀집도 전체 시나리오 측정
+
+    Args:
+        resolutions: [(width, height), ...]
+        densities: 평균 인원 수 리스트
+        frames: 시나리오별 프레임 수
+        seed: 영상 난수 시드
+        detector: CrowdDetector 인스턴스 (None이면 검출/종단 간 측정 생략)
+                  결과에는 검출기가 실제로 불러온 모델과 그 백엔드를 기록
+        grid_size: 그리드 크기 (rows, cols)
+        conf_threshold: 신뢰도 임계값
+        progress: 시나리오 결과를 받을 콜백
+
+    Returns:
+        results: 결과 파일에 저장할 딕셔너리
+    """
+    model_path = detector.model_path if detector is not None else None
+    results = {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__
+        },
+        "settings": {
+            "frames": frames,
+            "seed": seed,
+            "grid_size": list(grid_size),
+            "conf_threshold": conf_threshold,
+            "model": os.path.basename(os.path.normpath(model_path)) if model_path else None,
+            "backend": model_backend(model_path) if model_path else None
+        },
+        "scenarios": []
+    }
+    for width, height in resolutions:
+        for people in densities:
+            scenario = run_scenario(width, height, people, seed, frames, detector=detector,
+                                    grid_size=grid_size, conf_threshold=conf_threshold)
+            results["scenarios"].append(scenario)
+            if progress is not None:
+                progress(scenario)
+    return results
+
+
+def save_results(results, output_path):
+    """결과를 JSON 파일로 저장"""
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return output_path
+
+
+def load_results(path):
+    """JSON 결과 파일 읽기"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(current, baseline, threshold=BENCHMARK_REGRESSION_THRESHOLD,
+                    min_delta_ms=BENCHMARK_MIN_DELTA_MS):
+    """
+    두 결과의 시나리오별 단계 p50 및 종단 간 FPS 비교
+
+    Args:
+        current: 이번 결과
+        baseline: 기준 결과 (이전 커밋)
+        threshold: 이 비율 이상 느려지면 성능 저하로 판단 (0.1 = 10%)
+        min_delta_ms: 차이가 이 값(ms) 이하면 측정 잡음으로 보고 무시
+
+    Returns:
+        rows: [{'scenario', 'metric', 'baseline', 'current', 'ratio', 'regressed'}, ...]
+              (ratio는 소요 시간 비율, 1보다 크면 느려짐)
+    """
+    base_scenarios = {scenario["name"]: scenario for scenario in baseline.get("scenarios", [])}
+    rows = []
+    for scenario in current.get("scenarios", []):
+        base = base_scenarios.get(scenario["name"])
+        if base is None:
+            continue
+
+        pairs = [(stage, base["stages"][stage]["p50"], stats["p50"])
+                 for stage, stats in scenario["stages"].items() if stage in base["stages"]]
+        if scenario.get("end_to_end") and base.get("end_to_end"):
+            # FPS는 프레임당 시간(ms)으로 바꿔 같은 방향으로 비교
+            pairs.append(("end_to_end", 1000.0 / max(base["end_to_end"]["fps"], 1e-9),
+                          1000.0 / max(scenario["end_to_end"]["fps"], 1e-9)))
+
+        for metric, base_ms, current_ms in pairs:
+            ratio = current_ms / base_ms if base_ms > 0 else 1.0
+            rows.append({
+                "scenario": scenario["name"],
+                "metric": metric,
+                "baseline": base_ms,
+                "current": current_ms,
+                "ratio": ratio,
+                "regressed": ratio > 1.0 + threshold and current_ms - base_ms > min_delta_ms
+            })
+    return rows
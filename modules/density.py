@@ -1,6 +1,7 @@
 """
 혼잡도 지수(CDI) 계산 모듈
 """
+import numpy as np
 from config import RISK_LEVELS
 
 def calculate_cdi(total_people, frame_area, grid_counts, high_density_threshold=3, weight=0.3):
@@ -10,7 +11,7 @@ def calculate_cdi(total_people, frame_area, grid_counts, high_density_threshold=
     Args:
         total_people: 전체 검출된 사람 수
         frame_area: 프레임 면적 (픽셀 단위)
-        grid_counts: 각 그리드 구역의 사람 수 리스트
+        grid_counts: 각 그리드 구역의 사람 수 리스트 또는 배열
         high_density_threshold: 고밀집 구역 판단 임계값
         weight: 고밀집 구역 가중치
     
@@ -20,8 +21,8 @@ def calculate_cdi(total_people, frame_area, grid_counts, high_density_threshold=
     # 면적당 인원 밀도 계산 (정규화를 위해 10000으로 나눔)
     density = (total_people / frame_area) * 10000 if frame_area > 0 else 0
     
-    # 고밀집 구역 개수 계산
-    high_density_zones = sum(1 for count in grid_counts if count >= high_density_threshold)
+    # 고밀집 구역 개수 계산 (리스트/배열 모두 허용)
+    high_density_zones = int(np.count_nonzero(np.asarray(grid_counts) >= high_density_threshold))
     
     # CDI 계산
     cdi = density + (high_density_zones * weight)
@@ -0,0 +1,222 @@
+"""
+검출 결과 캐시 모듈
+- 영상 내용 해시 + 프레임 번호 + 모델별 원본 검출 결과(트래킹 전)를 SQLite에 저장
+- 낮은 기준 신뢰도로 저장해 두고 신뢰도 임계값이 바뀌면 캐시 결과를 다시 거름
+"""
+import atexit
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from config import (DETECTION_CACHE_PATH, DETECTION_CACHE_BASE_CONF,
+                    DETECTION_CACHE_COMMIT_EVERY, DETECTION_CACHE_MAX_ROWS)
+
+# 캐시 테이블 형식 버전 (다르면 기존 캐시를 버리고 새로 만듦)
+CACHE_SCHEMA_VERSION = 2
+# 업로드 파일은 이미 sha256 이름으로 저장됨 (utils.uploads)
+_SHA256_NAME = re.compile(r"^[0-9a-f]{64}$")
+# 해시 이름이 아닌 파일의 지문 계산 시 한 번에 읽을 바이트 수
+_FINGERPRINT_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+@lru_cache(maxsize=64)
+def _fingerprint(path, size, mtime):
+    # 업로드 저장 이름과 같은 전체 내용 sha256 (원본 파일과 업로드 사본의 키가 같아짐)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_FINGERPRINT_CHUNK_BYTES)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def video_fingerprint(path):
+    """
+    영상 내용 기반 캐시 키
+
+    업로드 파일처럼 이름이 이미 sha256이면 그대로 쓰고, 아니면 전체 내용의
+    sha256을 계산한다 (파일 크기/수정 시각별로 메모리에 캐시). 같은 영상이면
+    원본 파일이든 업로드 사본이든 같은 키가 된다.
+
+    Args:
+        path: 비디오 파일 경로
+
+    Returns:
+        key: 16진수 문자열
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if _SHA256_NAME.match(stem):
+        return stem
+    stat = os.stat(path)
+    return _fingerprint(os.path.abspath(path), stat.st_size, stat.st_mtime)
+
+
+class DetectionCache:
+    """
+    프레임별 원본 검출 결과(박스, 신뢰도) 저장소
+
+    스무딩 전 결과를 base_conf 이상으로 저장하므로, base_conf 이상의 어떤
+    신뢰도 임계값에도 캐시 결과를 거르기만 하면 된다. 트래킹 ID는 저장하지
+    않는다 (이전 실행의 트래커가 준 ID는 지금 트래커의 ID와 겹칠 수 있으므로
+    조회한 검출에 검출기가 자기 트래커를 다시 적용한다).
+    분석 워커 스레드와 UI 스레드가 함께 쓰므로 연결 하나를 잠금으로 보호하며,
+    쓰기는 commit_every개마다 묶어서 커밋한다. 행 수가 max_rows를 넘으면
+    가장 오래 사용하지 않은 행부터 지운다.
+    """
+
+    def __init__(self, path=DETECTION_CACHE_PATH, base_conf=DETECTION_CACHE_BASE_CONF,
+                 commit_every=DETECTION_CACHE_COMMIT_EVERY, max_rows=DETECTION_CACHE_MAX_ROWS):
+        """
+        초기화
+
+        Args:
+            path: SQLite 파일 경로
+            base_conf: 저장할 때 사용하는 추론 신뢰도
+            commit_every: 이 개수만큼 쓰면 커밋
+            max_rows: 최대 저장 행(프레임) 수 (넘으면 오래 사용하지 않은 행부터 삭제)
+        """
+        self.path = path
+        self.base_conf = base_conf
+        self.commit_every = max(1, commit_every)
+        self.max_rows = max(1, max_rows)
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != CACHE_SCHEMA_VERSION:
+            # 이전 형식(트래킹 ID 포함)의 캐시는 버리고 새로 만듦
+            self._conn.execute("DROP TABLE IF EXISTS detections")
+            self._conn.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS detections ("
+            " video TEXT NOT NULL, frame INTEGER NOT NULL, model TEXT NOT NULL,"
+            " boxes BLOB NOT NULL, confidences BLOB NOT NULL, used INTEGER NOT NULL,"
+            " PRIMARY KEY (video, frame, model))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS detections_used ON detections (used)")
+        self._conn.commit()
+        self._pending = 0
+        # 최근 사용 순서 (조회/저장할 때마다 증가)
+        self._clock = self._conn.execute("SELECT COALESCE(MAX(used), 0) FROM detections").fetchone()[0]
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def get(self, video_key, frame_index, model_key):
+        """
+        캐시된 원본 검출 결과 조회 (조회한 행은 최근 사용으로 표시)
+
+        Returns:
+            detections: (boxes (N,4) float32, confidences (N,) float32) (없으면 None)
+        """
+        key = (video_key, int(frame_index), model_key)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT boxes, confidences FROM detections"
+                " WHERE video = ? AND frame = ? AND model = ?", key
+            ).fetchone()
+            if row is not None:
+                self._clock += 1
+                self._conn.execute(
+                    "UPDATE detections SET used = ? WHERE video = ? AND frame = ? AND model = ?",
+                    (self._clock,) + key
+                )
+                self._count_write()
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        boxes = np.frombuffer(row[0], dtype=np.float32).reshape(-1, 4)
+        confidences = np.frombuffer(row[1], dtype=np.float32)
+        return boxes, confidences
+
+    def put(self, video_key, frame_index, model_key, boxes, confidences):
+        """원본 검출 결과 저장 (같은 키가 있으면 덮어씀)"""
+        with self._lock:
+            self._clock += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO detections VALUES (?, ?, ?, ?, ?, ?)",
+                (video_key, int(frame_index), model_key,
+                 np.ascontiguousarray(boxes, dtype=np.float32).tobytes(),
+                 np.ascontiguousarray(confidences, dtype=np.float32).tobytes(),
+                 self._clock)
+            )
+            self._count_write()
+
+    def _count_write(self):
+        """쓰기 횟수 집계 (commit_every마다 용량 정리 후 커밋, 잠금 안에서 호출)"""
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self._commit()
+
+    def _commit(self):
+        excess = self._conn.execute("SELECT COUNT(*) FROM detections").fetchone()[0] - self.max_rows
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM detections WHERE rowid IN"
+                " (SELECT rowid FROM detections ORDER BY used LIMIT ?)", (excess,)
+            )
+            self.evicted += excess
+        self._conn.commit()
+        self._pending = 0
+
+    def flush(self):
+        """쓰기 대기 중인 결과 커밋"""
+        with self._lock:
+            if self._pending and self._conn is not None:
+                self._commit()
+
+    def close(self):
+        """남은 결과를 커밋하고 연결 닫기 (여러 번 호출해도 됨)"""
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def filter_detections(detections, conf_threshold):
+    """
+    캐시된 원본 검출 결과를 신뢰도 임계값으로 거름
+
+    Args:
+        detections: DetectionCache.get()의 반환값
+        conf_threshold: 신뢰도 임계값
+
+    Returns:
+        detections: 임계값 이상인 (boxes, confidences)
+    """
+    boxes, confidences = detections
+    keep = confidences >= conf_threshold
+    return boxes[keep], confidences[keep]
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_detection_cache():
+    """
+    프로세스 전체에서 공유하는 검출 캐시 반환 (처음 호출 시 생성, 프로세스 종료 시 커밋 후 닫음)
+
+    Returns:
+        cache: DetectionCache
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = DetectionCache()
+            atexit.register(_shared_cache.close)
+        return _shared_cache
@@ -1,95 +1,565 @@
 """
 YOLO 기반 객체 검출 모듈
 - 사람 검출, 트래킹, 스무딩
+- YOLO 모델은 프로세스당 한 번만 불러와 세션(검출기)끼리 공유
 """
-from ultralytics import YOLO
-import cv2
+import itertools
+import threading
+import time
+
 import numpy as np
-from collections import deque
-from config import MODEL_PATH, PERSON_CLASS_ID, DEFAULT_CONF_THRESHOLD
+from modules.tracks import TrackTable
+from modules.detection_cache import filter_detections
+from modules.export import resolve_model_path
+from modules.inference_server import create_tracker, get_inference_server, predict_without_tracking
+from config import (MODEL_PATH, PERSON_CLASS_ID, DEFAULT_CONF_THRESHOLD,
+                    DETECTION_STRIDE_MIN, DETECTION_STRIDE_MAX,
+                    STRIDE_CDI_LOW, STRIDE_CDI_HIGH, STRIDE_FAST_MOTION,
+                    INFERENCE_BACKEND, INFERENCE_INT8, INFERENCE_IMGSZ)
+
+
+class SharedModel:
+    """
+    여러 CrowdDetector가 함께 쓰는 YOLO 모델
+    
+    ultralytics 예측기는 호출 간 상태(설정)를 가지므로 추론은 lock으로 직렬화하고,
+    트래킹은 예측기 밖에서 검출기마다 따로 가진 트래커로 수행한다.
+    """
+    
+    def __init__(self, model, path, load_seconds):
+        self.model = model
+        self.path = path
+        self.load_seconds = load_seconds
+        self.lock = threading.Lock()
+
+
+# 모델 경로 → SharedModel (프로세스 전체 공유)
+_shared_models = {}
+_shared_models_lock = threading.Lock()
+
+
+def _load_yolo(model_path):
+    """ultralytics(및 torch)를 처음 필요할 때 임포트하여 YOLO 모델 생성"""
+    try:
+        # torch 2.6+의 weights_only 로드에서 ultralytics 모델 클래스 허용
+        import torch
+        from ultralytics.nn.tasks import DetectionModel
+        if hasattr(torch.serialization, "add_safe_globals"):
+            torch.serialization.add_safe_globals([DetectionModel])
+    except ImportError:
+        pass
+    
+    from ultralytics import YOLO
+    return YOLO(model_path, task="detect")
+
+
+def get_shared_model(model_path, warmup=True):
+    """
+    프로세스 전체에서 공유하는 YOLO 모델 반환 (처음 호출 시 로드 및 워밍업)
+    
+    Args:
+        model_path: 모델 경로
+        warmup: 로드 직후 빈 이미지로 한 번 추론할지 여부
+        
+    Returns:
+        shared: SharedModel
+    """
+    with _shared_models_lock:
+        shared = _shared_models.get(model_path)
+        if shared is not None:
+            return shared
+        
+        started = time.perf_counter()
+        model = _load_yolo(model_path)
+        if warmup:
+            # 첫 프레임에서 예측기 초기화/커널 준비 비용을 치르지 않도록 미리 한 번 추론
+            model(np.zeros((INFERENCE_IMGSZ, INFERENCE_IMGSZ, 3), dtype=np.uint8), verbose=False)
+        shared = SharedModel(model, model_path, time.perf_counter() - started)
+        _shared_models[model_path] = shared
+        return shared
+
 
 class CrowdDetector:
     """YOLO를 사용한 군중 검출 클래스"""
     
-    def __init__(self, model_path=MODEL_PATH):
+    def __init__(self, model_path=MODEL_PATH, cache=None, backend=INFERENCE_BACKEND,
+                 use_server=False, int8=INFERENCE_INT8):
         """
         초기화
+        
+        Args:
+            model_path: YOLO 모델 경로 (.pt 또는 내보낸 .onnx / *_openvino_model)
+            cache: 프레임별 검출 결과 캐시 (DetectionCache, None이면 사용 안 함)
+            backend: 추론 백엔드 ("torch" | "onnx" | "openvino")
+                     .pt가 주어지면 해당 형식으로 내보낸 모델을 사용
+                     (None이면 model_path를 이미 확정된 경로로 보고 그대로 사용)
+            use_server: 공유 추론 서버로 다른 세션과 묶어서 추론할지 여부
+                        (트래킹은 이 검출기의 트래커에서 따로 수행)
+            int8: INT8 양자화 모델 사용 여부 (backend가 onnx/openvino일 때)
         """
+        if backend is not None:
+            model_path = resolve_model_path(model_path, backend, int8)
         try:
-            self.model = YOLO(model_path)
+            self.shared = get_shared_model(model_path)
         except Exception as e:
             print(f"모델 로드 실패: {e}")
             raise e
+        self.model = self.shared.model
+        
+        # 이 검출기의 트래커 (추론 결과를 프레임 순서대로 갱신)
+        self.trackers = None
+        # 트래커의 트랙 유지 시간 계산용 영상 FPS
+        self.frame_rate = 30.0
+        # 이 검출기(세션)의 트랙 ID 발급기 (트래커가 발급한 ID를 세션 안에서 겹치지 않는 ID로 변환)
+        self._track_ids = itertools.count(1)
+        self.server = get_inference_server(self.shared) if use_server else None
             
         self.person_class_id = PERSON_CLASS_ID
+        self.model_path = model_path
+        self.cache = cache
         
-        # 박스 스무딩을 위한 히스토리 (ID별 최근 박스 좌표)
-        # {track_id: deque([(x1, y1, x2, y2), ...], maxlen=5)}
-        self.track_history = {}
+        # 박스 스무딩을 위한 트랙 테이블 (ID별 최근 박스 좌표, 오래 안 보인 ID는 제거)
         self.smoothing_window = 5
+        self.tracks = TrackTable(window=self.smoothing_window)
+        
+        # 검출 간격(stride) 모드: N 프레임마다 추론하고 사이 프레임은 트랙 속도로 박스를 이동
+        self.stride_enabled = False
+        self.min_stride = DETECTION_STRIDE_MIN
+        self.max_stride = DETECTION_STRIDE_MAX
+        self._reset_propagation()
+    
+    def _reset_propagation(self):
+        """검출 간격 모드의 박스 전파 상태 초기화"""
+        self.stride = self.min_stride
+        # 처리한 프레임 번호 (추론/전파 모두 포함)
+        self.frame_no = 0
+        # 마지막으로 처리한 영상 프레임 번호 (frame_ref로 주어진 경우, 연속 여부 판단용)
+        self.last_frame_index = None
+        # 마지막 추론 이후 전파한 프레임 수
+        self.frames_since_inference = 0
+        # 마지막 추론 결과 {'boxes': (N,4), 'track_ids': (N,), 'confidences': (N,), 'velocities': (N,4) 프레임당}
+        self.last_detections = None
+        # 속도 정규화를 위한 프레임 대각선 길이
+        self.frame_diag = 1.0
+    
+    def set_stride_mode(self, enabled, min_stride=DETECTION_STRIDE_MIN, max_stride=DETECTION_STRIDE_MAX):
+        """
+        적응형 검출 간격 모드 설정
+        
+        Args:
+            enabled: 사용 여부
+            min_stride: 최소 검출 간격 (프레임)
+            max_stride: 최대 검출 간격 (프레임)
+        """
+        if enabled == self.stride_enabled and (min_stride, max_stride) == (self.min_stride, self.max_stride):
+            return
+        self.stride_enabled = enabled
+        self.min_stride = max(1, int(min_stride))
+        self.max_stride = max(self.min_stride, int(max_stride))
+        self.stride = min(max(self.stride, self.min_stride), self.max_stride)
+    
+    def max_track_speed(self):
+        """
+        마지막 추론 기준 가장 빠른 트랙의 이동 속도
+        
+        Returns:
+            speed: 프레임당 중심점 이동 거리 / 프레임 대각선 길이
+        """
+        if self.last_detections is None or len(self.last_detections["velocities"]) == 0:
+            return 0.0
+        velocities = self.last_detections["velocities"]
+        speeds = np.hypot((velocities[:, 0] + velocities[:, 2]) / 2, (velocities[:, 1] + velocities[:, 3]) / 2)
+        return float(speeds.max()) / self.frame_diag
+    
+    def update_stride(self, cdi):
+        """
+        CDI와 트랙 속도에 따라 검출 간격 자동 조절
+        
+        혼잡도가 높거나 움직임이 빠르면 간격을 절반으로 줄이고,
+        한산하고 움직임이 느리면 한 프레임씩 늘린다.
+        
+        Args:
+            cdi: 현재 혼잡도 지수
+        """
+        if not self.stride_enabled:
+            return
+        
+        speed = self.max_track_speed()
+        if cdi >= STRIDE_CDI_HIGH or speed >= STRIDE_FAST_MOTION:
+            self.stride = max(self.min_stride, self.stride // 2)
+        elif cdi < STRIDE_CDI_LOW and speed < STRIDE_FAST_MOTION / 2:
+            self.stride = min(self.max_stride, self.stride + 1)
     
-    def detect_people(self, frame, conf_threshold=DEFAULT_CONF_THRESHOLD, use_tracking=True):
+    def set_frame_rate(self, fps):
+        """
+        분석할 영상의 FPS 설정 (바뀌면 다음 트래킹 추론에서 새 트래커로 시작)
+        
+        Args:
+            fps: 영상 프레임 레이트
+        """
+        fps = float(fps) if fps and fps > 0 else 30.0
+        if fps != self.frame_rate:
+            self.frame_rate = fps
+            self.trackers = None
+    
+    def reset_tracking(self):
+        """
+        트래킹 상태 초기화 (영상이 바뀌거나 불연속 구간을 분석할 때 사용)
+        """
+        self.tracks.reset()
+        self._reset_propagation()
+        
+        # 다음 트래킹 추론에서 새 트래커로 시작
+        self.trackers = None
+    
+    def export_tracking_state(self):
+        """
+        현재 트래킹 상태를 꺼냄 (여러 스트림이 모델 하나를 공유할 때 사용)
+        
+        Returns:
+            state: 트래커와 스무딩 히스토리를 담은 딕셔너리
+        """
+        propagation = (self.stride, self.frame_no, self.frames_since_inference,
+                       self.last_detections, self.frame_diag, self.last_frame_index)
+        return {"trackers": self.trackers, "tracks": self.tracks, "propagation": propagation}
+    
+    def restore_tracking_state(self, state):
+        """
+        export_tracking_state()로 꺼낸 트래킹 상태를 되돌림
+        
+        Args:
+            state: 트래킹 상태 (None이면 새 트래커로 시작)
+        """
+        if state is None:
+            state = {"trackers": None, "tracks": TrackTable(window=self.smoothing_window), "propagation": None}
+        
+        self.tracks = state["tracks"]
+        if state["propagation"] is None:
+            self._reset_propagation()
+        else:
+            (self.stride, self.frame_no, self.frames_since_inference,
+             self.last_detections, self.frame_diag, self.last_frame_index) = state["propagation"]
+        
+        self.trackers = state["trackers"]
+    
+    def _run_model(self, source, conf_threshold):
+        """
+        공유 모델로 트래킹 없이 추론
+        
+        Args:
+            source: 프레임 또는 프레임 리스트
+            conf_threshold: 신뢰도 임계값
+            
+        Returns:
+            results: YOLO Results 리스트
+        """
+        with self.shared.lock:
+            # 다른 코드가 model.track()으로 남긴 트래킹 콜백이 있어도 실행하지 않음
+            return predict_without_tracking(
+                self.model, source, conf=conf_threshold, verbose=False, classes=[self.person_class_id]
+            )
+    
+    def _infer(self, frames, conf_threshold, use_tracking):
+        """
+        프레임들을 추론하여 프레임별 원본 검출 배열 반환
+        
+        공유 모델(추론 서버를 쓰면 다른 세션의 요청과 한 배치)로 트래킹 없이
+        추론한 뒤 이 검출기의 트래커로 프레임 순서대로 트래킹한다.
+        
+        Args:
+            frames: 프레임 리스트
+            conf_threshold: 신뢰도 임계값
+            use_tracking: 객체 트래킹 사용 여부
+            
+        Returns:
+            detections: 프레임별 (boxes, track_ids, confidences) 리스트
+        """
+        if self.server is None:
+            source = frames[0] if len(frames) == 1 else frames
+            results = self._run_model(source, conf_threshold)
+            if not use_tracking:
+                return [extract_detections(result) for result in results]
+            boxes_list = [result.boxes.cpu().numpy() for result in results]
+        else:
+            boxes_list = self.server.infer(frames, conf_threshold)
+        
+        if not use_tracking:
+            return [boxes_to_arrays(boxes) for boxes in boxes_list]
+        
+        return [self._track(boxes, frame) for frame, boxes in zip(frames, boxes_list)]
+    
+    def _track(self, boxes, frame):
+        """
+        검출 결과 한 프레임을 이 검출기의 트래커로 갱신
+        
+        Args:
+            boxes: YOLO Boxes (추론 서버 결과 또는 캐시에서 복원한 결과)
+            frame: 입력 프레임
+            
+        Returns:
+            detections: (boxes, track_ids, confidences)
+        """
+        # ultralytics 트래킹 콜백과 같이 검출이 없으면 트래커를 갱신하지 않음
+        if len(boxes) == 0:
+            return empty_detections()[:3]
+        
+        if self.trackers is None:
+            self.trackers = [create_tracker(frame_rate=self.frame_rate)]
+        tracker = self.trackers[0]
+        # tracks: [x1, y1, x2, y2, track_id, conf, cls, idx]
+        tracks = tracker.update(boxes, frame)
+        if len(tracks) == 0:
+            # 트랙이 하나도 없으면 ultralytics 콜백처럼 원본 검출을 ID 없이(-1) 그대로 둠
+            return boxes_to_arrays(boxes)
+        return (tracks[:, :4].astype(np.float32),
+                self._session_track_ids(tracker, tracks[:, 4].astype(np.int64)),
+                tracks[:, 5].astype(np.float32))
+    
+    def _session_track_ids(self, tracker, local_ids):
+        """
+        트래커가 발급한 트랙 ID를 이 검출기(세션)의 ID로 변환
+        
+        ultralytics 트래커는 모든 트래커가 공유하는 클래스 변수(BaseTrack._count)로
+        ID를 발급하고 트래커를 만들 때마다 0으로 되돌리므로, 다른 세션이 트래커를
+        만들면 이 트래커에서도 이미 쓴 ID가 다시 나온다. 반환된 트랙(활성화된
+        tracked_stracks와 같은 순서)의 객체마다 세션 ID를 붙여서 구분하고,
+        트랙 객체를 알 수 없는 트래커는 트래커가 발급한 ID별로 세션 ID를 붙인다.
+        
+        Args:
+            tracker: update()를 마친 트래커
+            local_ids: (N,) 트래커가 발급한 ID 배열
+            
+        Returns:
+            track_ids: (N,) 세션 ID 배열
+        """
+        active = [track for track in getattr(tracker, "tracked_stracks", ())
+                  if getattr(track, "is_activated", False)]
+        if [getattr(track, "track_id", None) for track in active] != local_ids.tolist():
+            active = None
+            id_map = getattr(tracker, "session_track_ids", None)
+            if id_map is None:
+                id_map = {}
+                tracker.session_track_ids = id_map
+        
+        track_ids = np.empty(len(local_ids), dtype=np.int64)
+        for i, local_id in enumerate(local_ids.tolist()):
+            if active is None:
+                if local_id not in id_map:
+                    id_map[local_id] = next(self._track_ids)
+                track_ids[i] = id_map[local_id]
+                continue
+            track = active[i]
+            # (트래커 ID, 세션 ID): 트래커가 같은 트랙에 새 ID를 주면 세션 ID도 새로 발급
+            session = getattr(track, "session_track_id", None)
+            if session is None or session[0] != local_id:
+                session = (local_id, next(self._track_ids))
+                track.session_track_id = session
+            track_ids[i] = session[1]
+        return track_ids
+    
+    def detect_people(self, frame, conf_threshold=DEFAULT_CONF_THRESHOLD, use_tracking=True,
+                      frame_ref=None):
         """
         프레임에서 사람을 검출
         
+        캐시가 있고 frame_ref가 주어지면 캐시된 원본 결과를 신뢰도 임계값으로
+        거르기만 하고, 없으면 캐시 기준 신뢰도로 추론하여 저장한다.
+        캐시에는 트래킹 ID가 없으므로 거른 결과를 이 검출기의 트래커로 다시 트래킹한다.
+        
         Args:
             frame: 입력 프레임
             conf_threshold: 신뢰도 임계값
             use_tracking: 객체 트래킹 사용 여부 (ID 부여)
+            frame_ref: 캐시 조회용 (영상 키, 프레임 번호) (None이면 캐시 사용 안 함)
+                       프레임 번호가 직전 프레임의 다음 번호가 아니면 박스를 전파하지 않고 추론
             
         Returns:
-            boxes: 검출된 박스 리스트
-            frame_with_boxes: 박스가 그려진 프레임
+            boxes: (N, 4) 정수 박스 배열 [x1, y1, x2, y2]
+            track_ids: (N,) 트래킹 ID 배열 (ID가 없으면 -1)
+            confidences: (N,) 신뢰도 배열
             person_count: 사람 수
         """
         if frame is None:
-            return [], None, 0
+            return empty_detections()
+        
+        self.frame_no += 1
+        
+        if frame_ref is not None:
+            frame_index = frame_ref[1]
+            consecutive = self.last_frame_index is not None and frame_index == self.last_frame_index + 1
+            self.last_frame_index = frame_index
+            if not consecutive:
+                # 같은 프레임을 다시 분석하거나 (일시정지 중 리런) 탐색으로 건너뛰었으면 새로 추론
+                self.last_detections = None
+                self.frames_since_inference = 0
+        
+        # 검출 간격 모드: 다음 추론 시점 전까지는 트랙 속도로 박스만 이동
+        if (self.stride_enabled and self.last_detections is not None
+                and self.frames_since_inference + 1 < self.stride):
+            return self._propagate(frame)
+        
+        if self.cache is not None and frame_ref is not None:
+            return self._detect_cached(frame, conf_threshold, use_tracking, frame_ref)
             
         # YOLO 추론
-        if use_tracking:
-            # persist=True로 트래킹 유지
-            results = self.model.track(frame, persist=True, conf=conf_threshold, verbose=False, classes=[self.person_class_id])
+        detections = self._infer([frame], conf_threshold, use_tracking)[0]
+        
+        return self._apply_detections(*detections, frame)
+    
+    def _detect_cached(self, frame, conf_threshold, use_tracking, frame_ref):
+        """캐시 조회 후 (없으면 기준 신뢰도로 트래킹 없이 추론 및 저장) 임계값으로 걸러서 트래킹 및 적용"""
+        video_key, frame_index = frame_ref
+        detections = self.cache.get(video_key, frame_index, self.model_path)
+        
+        if detections is None:
+            base_conf = min(self.cache.base_conf, conf_threshold)
+            boxes, _, confidences = self._infer([frame], base_conf, use_tracking=False)[0]
+            detections = (boxes, confidences)
+            self.cache.put(video_key, frame_index, self.model_path, *detections)
+        
+        boxes, confidences = filter_detections(detections, conf_threshold)
+        if not use_tracking:
+            return self._apply_detections(boxes, np.full(len(boxes), -1, dtype=np.int64), confidences, frame)
+        
+        from ultralytics.engine.results import Boxes
+        data = np.column_stack([boxes, confidences, np.full(len(boxes), self.person_class_id, dtype=np.float32)])
+        return self._apply_detections(*self._track(Boxes(data, frame.shape[:2]), frame), frame)
+    
+    def detect_people_batch(self, frames, conf_threshold=DEFAULT_CONF_THRESHOLD, use_tracking=True):
+        """
+        여러 프레임을 한 번의 추론으로 검출 (배치 추론)
+        
+        트래킹 사용 시 frames는 같은 영상의 연속된 프레임이어야 하며,
+        트래커는 배치 내 프레임 순서대로 갱신된다.
+        
+        Args:
+            frames: 입력 프레임 리스트
+            conf_threshold: 신뢰도 임계값
+            use_tracking: 객체 트래킹 사용 여부 (ID 부여)
+            
+        Returns:
+            outputs: 프레임별 (boxes, track_ids, confidences, person_count) 리스트
+        """
+        valid = [frame for frame in frames if frame is not None]
+        if not valid:
+            return [empty_detections() for _ in frames]
+        
+        # YOLO 배치 추론 (한 번의 forward pass, 프레임 번호를 모르므로 연속 여부 판단 초기화)
+        self.last_frame_index = None
+        detections = iter(self._infer(valid, conf_threshold, use_tracking))
+        
+        outputs = []
+        for frame in frames:
+            if frame is None:
+                outputs.append(empty_detections())
+            else:
+                self.frame_no += 1
+                outputs.append(self._apply_detections(*next(detections), frame))
+        
+        return outputs
+    
+    def _apply_detections(self, boxes, track_ids, confidences, frame):
+        """
+        원본 검출 배열에 스무딩을 적용하고 박스 전파 상태 갱신
+        
+        Args:
+            boxes: (N, 4) 원본 박스 배열
+            track_ids: (N,) 트래킹 ID 배열 (ID가 없으면 -1)
+            confidences: (N,) 신뢰도 배열
+            frame: 원본 프레임
+            
+        Returns:
+            boxes: (N, 4) 스무딩된 정수 박스 배열
+            track_ids: (N,) 트래킹 ID 배열 (ID가 없으면 -1)
+            confidences: (N,) 신뢰도 배열
+            person_count: 사람 수
+        """
+        h, w = frame.shape[:2]
+        self.frame_diag = float(np.hypot(w, h))
+        
+        boxes = np.asarray(boxes).astype(np.int64).reshape(-1, 4)
+        
+        velocities = np.zeros((len(boxes), 4), dtype=np.float32)
+        
+        # 스무딩 적용 (트래킹 ID가 있는 박스만, 한 번의 배열 연산)
+        tracked = track_ids >= 0
+        if tracked.any():
+            smoothed, tracked_velocities = self.tracks.update(
+                track_ids[tracked], boxes[tracked], self.frame_no
+            )
+            boxes[tracked] = smoothed
+            velocities[tracked] = tracked_velocities
         else:
-            results = self.model(frame, conf=conf_threshold, verbose=False, classes=[self.person_class_id])
+            self.tracks.evict_stale(self.frame_no)
         
-        boxes = []
-        frame_with_boxes = frame.copy()
+        self.last_detections = {
+            "boxes": boxes.astype(np.float32),
+            "track_ids": track_ids,
+            "confidences": confidences,
+            "velocities": velocities
+        }
+        self.frames_since_inference = 0
         
-        for result in results:
-            boxes_data = result.boxes
+        return boxes, track_ids, confidences, len(boxes)
+    
+    def _propagate(self, frame):
+        """
+        추론 없이 마지막 검출 박스를 트랙 속도만큼 이동시켜 반환
+        
+        Args:
+            frame: 현재 프레임
             
-            for box in boxes_data:
-                # 좌표 추출
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-                
-                # 트래킹 ID (있으면)
-                track_id = int(box.id[0]) if box.id is not None else None
-                
-                # 스무딩 적용 (트래킹 ID가 있을 때만)
-                if track_id is not None:
-                    if track_id not in self.track_history:
-                        self.track_history[track_id] = deque(maxlen=self.smoothing_window)
-                    
-                    self.track_history[track_id].append((x1, y1, x2, y2))
-                    
-                    # 평균 좌표 계산
-                    avg_box = np.mean(self.track_history[track_id], axis=0).astype(int)
-                    x1, y1, x2, y2 = avg_box
-                
-                boxes.append((x1, y1, x2, y2))
-                
-                # 시각화
-                color = (0, 255, 0) # Green
-                cv2.rectangle(frame_with_boxes, (x1, y1), (x2, y2), color, 2)
-                
-                # 라벨 표시
-                conf = float(box.conf[0])
-                label = f"Person"
-                if track_id is not None:
-                    label += f" ID:{track_id}"
-                
-                cv2.putText(frame_with_boxes, label, (x1, y1 - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-        
-        return boxes, frame_with_boxes, len(boxes)
+        Returns:
+            boxes: (N, 4) 이동된 정수 박스 배열
+            track_ids: (N,) 트래킹 ID 배열
+            confidences: (N,) 마지막 추론의 신뢰도 배열
+            person_count: 사람 수
+        """
+        self.frames_since_inference += 1
+        
+        h, w = frame.shape[:2]
+        last = self.last_detections
+        moved = last["boxes"] + last["velocities"] * self.frames_since_inference
+        upper = np.array([w - 1, h - 1, w - 1, h - 1], dtype=np.float32)
+        boxes = np.clip(moved, 0, upper).astype(np.int64)
+        
+        return boxes, last["track_ids"], last["confidences"], len(boxes)
+
+
+def extract_detections(result):
+    """
+    YOLO 결과 한 장에서 원본 검출 배열 추출
+    
+    박스 좌표, 신뢰도, ID는 각각 한 번의 텐서 → 배열 변환으로 가져온다.
+    
+    Args:
+        result: YOLO Results 객체 (프레임 1장 분량)
+        
+    Returns:
+        boxes: (N, 4) 박스 배열 (float32)
+        track_ids: (N,) 트래킹 ID 배열 (ID가 없으면 -1)
+        confidences: (N,) 신뢰도 배열
+    """
+    return boxes_to_arrays(result.boxes)
+
+
+def boxes_to_arrays(boxes_data):
+    """
+    YOLO Boxes(텐서 또는 numpy)를 원본 검출 배열로 변환
+    
+    Returns:
+        boxes, track_ids, confidences (extract_detections와 같음)
+    """
+    boxes = boxes_data.xyxy.cpu().numpy().astype(np.float32).reshape(-1, 4)
+    confidences = boxes_data.conf.cpu().numpy().astype(np.float32).reshape(-1)
+    if boxes_data.id is not None:
+        track_ids = boxes_data.id.cpu().numpy().astype(np.int64).reshape(-1)
+    else:
+        track_ids = np.full(len(boxes), -1, dtype=np.int64)
+    return boxes, track_ids, confidences
+
+
+def empty_detections():
+    """검출 결과가 없을 때의 (boxes, track_ids, confidences, person_count)"""
+    return (np.zeros((0, 4), dtype=np.int64), np.zeros(0, dtype=np.int64),
+            np.zeros(0, dtype=np.float32), 0)
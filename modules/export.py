@@ -0,0 +1,276 @@
+"""
+추론 백엔드 모델 내보내기 모듈
+- YOLO .pt 모델을 ONNX(onnxruntime) / OpenVINO 형식으로 내보내기 (선택적 INT8)
+- 내보낸 모델과 원본(PyTorch) 모델의 검출 결과 일치 여부 확인 (결과는 내보낸 모델 옆에 저장)
+"""
+import json
+import os
+
+import numpy as np
+
+from config import (MODEL_PATH, INFERENCE_BACKEND, INFERENCE_INT8, INFERENCE_IMGSZ,
+                    DEFAULT_CONF_THRESHOLD, SAMPLE_VIDEO_PATH, PARITY_SAMPLE_FRAMES,
+                    PARITY_MIN_IOU, PARITY_MAX_COUNT_DIFF)
+
+# 지원하는 추론 백엔드
+BACKENDS = ("torch", "onnx", "openvino")
+
+
+def exported_model_path(model_path, backend, int8=False):
+    """
+    백엔드별 내보낸 모델 경로 (ultralytics 내보내기 규칙과 같음)
+
+    Args:
+        model_path: 원본 .pt 모델 경로
+        backend: "torch" | "onnx" | "openvino"
+        int8: INT8 양자화 모델 여부
+
+    Returns:
+        path: 모델 파일(또는 OpenVINO 모델 디렉토리) 경로
+    """
+    if backend == "torch":
+        return model_path
+    stem = os.path.splitext(model_path)[0]
+    if backend == "onnx":
+        return f"{stem}.int8.onnx" if int8 else f"{stem}.onnx"
+    if backend == "openvino":
+        return f"{stem}_int8_openvino_model" if int8 else f"{stem}_openvino_model"
+    raise ValueError(f"지원하지 않는 추론 백엔드입니다: {backend} (가능: {', '.join(BACKENDS)})")
+
+
+def model_backend(model_path):
+    """
+    모델 경로로 실제 추론 백엔드 판별 (exported_model_path의 반대)
+
+    Args:
+        model_path: 모델 파일(또는 OpenVINO 모델 디렉토리) 경로
+
+    Returns:
+        backend: "torch" | "onnx" | "openvino"
+    """
+    path = os.path.normpath(model_path)
+    if path.endswith(".onnx"):
+        return "onnx"
+    if path.endswith("_openvino_model"):
+        return "openvino"
+    return "torch"
+
+
+def export_model(model_path=MODEL_PATH, backend=INFERENCE_BACKEND, int8=INFERENCE_INT8,
+                 imgsz=INFERENCE_IMGSZ, data=None):
+    """
+    .pt 모델을 지정한 백엔드 형식으로 내보내기
+
+    ONNX INT8은 내보낸 FP32 ONNX를 onnxruntime 동적 양자화로 변환하고,
+    OpenVINO INT8은 ultralytics의 NNCF 보정(data 데이터셋 사용)을 사용한다.
+
+    Args:
+        model_path: 원본 .pt 모델 경로
+        backend: "onnx" | "openvino"
+        int8: INT8 양자화 여부
+        imgsz: 입력 이미지 크기
+        data: OpenVINO INT8 보정용 데이터셋 yaml (None이면 ultralytics 기본값)
+
+    Returns:
+        path: 내보낸 모델 경로
+    """
+    if backend == "torch":
+        return model_path
+
+    from ultralytics import YOLO
+
+    target = exported_model_path(model_path, backend, int8)
+    model = YOLO(model_path)
+
+    if backend == "onnx":
+        fp32_path = model.export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True)
+        if not int8:
+            return fp32_path
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(fp32_path, target, weight_type=QuantType.QUInt8)
+        return target
+
+    kwargs = {"format": "openvino", "imgsz": imgsz, "int8": int8}
+    if int8 and data is not None:
+        kwargs["data"] = data
+    return model.export(**kwargs)
+
+
+def resolve_model_path(model_path=MODEL_PATH, backend=INFERENCE_BACKEND, int8=INFERENCE_INT8):
+    """
+    백엔드에 맞는 모델 경로 반환 (.pt가 주어지고 내보낸 모델이 없으면 내보내기)
+
+    .pt에서 내보낸 모델은 원본과의 일치 검사(저장된 결과가 있으면 재사용)를
+    통과해야 사용하며, 통과하지 못하면 원본 .pt 경로를 반환한다.
+    이미 내보낸 모델(.onnx, *_openvino_model)이 주어지면 그대로 사용한다.
+
+    Args:
+        model_path: 모델 경로
+        backend: "torch" | "onnx" | "openvino"
+        int8: INT8 양자화 모델 사용 여부
+
+    Returns:
+        path: 검출기가 불러올 모델 경로
+    """
+    if backend == "torch" or not model_path.endswith(".pt"):
+        return model_path
+    target = exported_model_path(model_path, backend, int8)
+    if not os.path.exists(target):
+        target = export_model(model_path, backend, int8)
+    if verify_export(model_path, target):
+        return target
+    print(f"내보낸 모델이 일치 검사를 통과하지 못해 PyTorch 모델을 사용합니다: {target}")
+    return model_path
+
+
+def parity_report_path(candidate_path):
+    """내보낸 모델의 일치 검사 결과 파일 경로 (<모델 경로>.parity.json)"""
+    return f"{os.path.normpath(candidate_path)}.parity.json"
+
+
+def _model_stamp(path):
+    """모델 파일(또는 디렉토리)의 (크기, 수정 시각) (바뀌면 저장된 검사 결과를 버림)"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime]
+
+
+def save_parity_report(reference_path, candidate_path, report):
+    """
+    일치 검사 결과를 내보낸 모델 옆에 저장
+
+    Args:
+        reference_path: 기준 모델 경로
+        candidate_path: 내보낸 모델 경로
+        report: check_parity() 결과
+    """
+    data = dict(report, reference=_model_stamp(reference_path), candidate=_model_stamp(candidate_path))
+    with open(parity_report_path(candidate_path), "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def load_parity_report(reference_path, candidate_path):
+    """
+    저장된 일치 검사 결과 조회
+
+    Returns:
+        report: check_parity() 결과 (없거나 어느 모델이든 바뀌었으면 None)
+    """
+    try:
+        with open(parity_report_path(candidate_path), encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (report.get("reference") != _model_stamp(reference_path)
+            or report.get("candidate") != _model_stamp(candidate_path)):
+        return None
+    return report
+
+
+def parity_passed(report, min_iou=PARITY_MIN_IOU, max_count_diff=PARITY_MAX_COUNT_DIFF):
+    """일치 검사 결과가 현재 기준을 통과하는지 여부"""
+    return report["max_count_diff"] <= max_count_diff and report["mean_iou"] >= min_iou
+
+
+def verify_export(reference_path, candidate_path, video_path=SAMPLE_VIDEO_PATH):
+    """
+    내보낸 모델의 일치 검사 (저장된 결과가 있으면 재사용, 없으면 검사 후 저장)
+
+    Args:
+        reference_path: 원본 .pt 모델 경로
+        candidate_path: 내보낸 모델 경로
+        video_path: 일치 검사용 영상 (없으면 검사할 수 없으므로 실패)
+
+    Returns:
+        passed: 통과 여부
+    """
+    report = load_parity_report(reference_path, candidate_path)
+    if report is None:
+        if not os.path.exists(video_path):
+            print(f"일치 검사용 영상을 찾을 수 없습니다: {video_path}")
+            return False
+        report = check_parity(reference_path, candidate_path, sample_frames(video_path))
+        save_parity_report(reference_path, candidate_path, report)
+    return parity_passed(report)
+
+
+def sample_frames(video_path=SAMPLE_VIDEO_PATH, count=PARITY_SAMPLE_FRAMES):
+    """
+    영상 전체에서 고르게 뽑은 프레임 목록 (일치 검사용)
+
+    Args:
+        video_path: 비디오 경로
+        count: 프레임 수
+
+    Returns:
+        frames: BGR 프레임 리스트
+    """
+    from utils.video import VideoSource
+
+    source = VideoSource(video_path)
+    try:
+        total = max(1, source.total_frames)
+        frames = []
+        for index in np.linspace(0, total - 1, num=min(count, total)).astype(int):
+            ret, frame = source.read(int(index))
+            if ret:
+                frames.append(frame.copy())
+        return frames
+    finally:
+        source.release()
+
+
+def _box_iou(a, b):
+    """(N,4)와 (M,4) 박스 사이의 IoU 행렬"""
+    a = a[:, None, :].astype(np.float64)
+    b = b[None, :, :].astype(np.float64)
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-9)
+
+
+def check_parity(reference_path, candidate_path, frames, conf_threshold=DEFAULT_CONF_THRESHOLD,
+                 min_iou=PARITY_MIN_IOU, max_count_diff=PARITY_MAX_COUNT_DIFF):
+    """
+    두 모델의 사람 검출 결과 비교 (트래킹 없이 같은 프레임에 추론)
+
+    프레임마다 사람 수 차이와, 기준 박스별 가장 많이 겹치는 후보 박스의
+    IoU 평균을 계산한다.
+
+    Args:
+        reference_path: 기준 모델 경로 (보통 .pt)
+        candidate_path: 비교할 모델 경로 (.onnx 등)
+        frames: BGR 프레임 리스트
+        conf_threshold: 신뢰도 임계값
+        min_iou: 통과 기준 평균 IoU
+        max_count_diff: 통과 기준 프레임별 최대 사람 수 차이
+
+    Returns:
+        report: {'frames', 'max_count_diff', 'mean_iou', 'passed'} 딕셔너리
+    """
+    from modules.detector import CrowdDetector
+
+    reference = CrowdDetector(reference_path, backend=None)
+    candidate = CrowdDetector(candidate_path, backend=None)
+
+    worst_count_diff = 0
+    ious = []
+    for frame in frames:
+        ref_boxes, _, _, ref_count = reference.detect_people(frame, conf_threshold, use_tracking=False)
+        cand_boxes, _, _, cand_count = candidate.detect_people(frame, conf_threshold, use_tracking=False)
+        worst_count_diff = max(worst_count_diff, abs(ref_count - cand_count))
+        if ref_count and cand_count:
+            ious.extend(_box_iou(ref_boxes, cand_boxes).max(axis=1).tolist())
+        elif ref_count:
+            ious.extend([0.0] * ref_count)
+
+    mean_iou = float(np.mean(ious)) if ious else 1.0
+    return {
+        "frames": len(frames),
+        "max_count_diff": worst_count_diff,
+        "mean_iou": mean_iou,
+        "passed": parity_passed({"max_count_diff": worst_count_diff, "mean_iou": mean_iou},
+                                min_iou, max_count_diff)
+    }
@@ -0,0 +1,232 @@
+"""
+공유 추론 서버 모듈
+- 여러 세션(검출기)의 프레임 요청을 몇 ms 동안 모아 한 번의 배치 추론으로 처리
+- 모델 가중치는 공유하고, 트래킹은 세션별 트래커에서 따로 수행
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from config import (PERSON_CLASS_ID, INFERENCE_BATCH_MAX, INFERENCE_BATCH_WAIT_MS,
+                    TRACKER_CONFIG)
+from utils.metrics import get_metrics
+
+
+class _Request:
+    """추론 요청 하나 (프레임, 신뢰도 임계값, 결과를 받을 Future)"""
+
+    __slots__ = ("frame", "conf_threshold", "future")
+
+    def __init__(self, frame, conf_threshold):
+        self.frame = frame
+        self.conf_threshold = conf_threshold
+        self.future = Future()
+
+
+class InferenceServer:
+    """
+    공유 모델 하나로 여러 세션의 요청을 마이크로 배치 처리하는 추론 서버
+
+    첫 요청이 들어오면 최대 max_wait_ms 동안(또는 max_batch개가 찰 때까지)
+    요청을 더 모은 뒤, 가장 낮은 신뢰도 임계값으로 한 번에 추론하고
+    요청별 임계값으로 다시 걸러서 돌려준다. 트래킹 없이 추론하므로
+    결과는 세션의 트래커(create_tracker)로 따로 갱신해야 한다.
+    """
+
+    def __init__(self, shared_model, max_batch=INFERENCE_BATCH_MAX,
+                 max_wait_ms=INFERENCE_BATCH_WAIT_MS, metrics=None):
+        """
+        초기화 (서버 스레드 시작)
+
+        Args:
+            shared_model: modules.detector.SharedModel
+            max_batch: 한 번에 묶을 최대 요청 수
+            max_wait_ms: 첫 요청 이후 요청을 더 모으는 최대 시간 (ms)
+            metrics: 대기열 길이를 반영할 CrowdMetrics (None이면 수집 안 함)
+        """
+        self.shared = shared_model
+        self.metrics = metrics
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+
+        # 통계
+        self.batches = 0
+        self.requests = 0
+
+        self._thread = threading.Thread(target=self._run, name="InferenceServer", daemon=True)
+        self._thread.start()
+
+    @property
+    def mean_batch_size(self):
+        return self.requests / self.batches if self.batches else 0.0
+
+    def submit(self, frame, conf_threshold):
+        """
+        프레임 추론 요청
+
+        Args:
+            frame: BGR 프레임
+            conf_threshold: 신뢰도 임계값
+
+        Returns:
+            future: 결과로 numpy Boxes(사람만, 임계값 이상)를 돌려주는 Future
+        """
+        request = _Request(frame, conf_threshold)
+        self._queue.put(request)
+        return request.future
+
+    def infer(self, frames, conf_threshold):
+        """
+        여러 프레임을 요청하고 결과를 기다림
+
+        Args:
+            frames: BGR 프레임 리스트
+            conf_threshold: 신뢰도 임계값
+
+        Returns:
+            boxes_list: 프레임별 numpy Boxes 리스트
+        """
+        futures = [self.submit(frame, conf_threshold) for frame in frames]
+        return [future.result() for future in futures]
+
+    def stop(self, timeout=2.0):
+        """서버 스레드 종료"""
+        self._stop_event.set()
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _collect(self, first):
+        """첫 요청 이후 max_wait 동안 요청을 더 모음"""
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                break
+            batch.append(request)
+        return batch
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            first = self._queue.get()
+            if first is None:
+                continue
+
+            batch = self._collect(first)
+            if self.metrics is not None:
+                self.metrics.set_queue_depth("inference", self._queue.qsize())
+            try:
+                conf = min(request.conf_threshold for request in batch)
+                with self.shared.lock:
+                    results = predict_without_tracking(
+                        self.shared.model, [request.frame for request in batch], conf=conf,
+                        verbose=False, classes=[PERSON_CLASS_ID]
+                    )
+                for request, result in zip(batch, results):
+                    boxes = result.boxes.cpu().numpy()
+                    if request.conf_threshold > conf:
+                        boxes = boxes[boxes.conf >= request.conf_threshold]
+                    request.future.set_result(boxes)
+            except Exception as e:
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+            self.batches += 1
+            self.requests += len(batch)
+
+
+def _is_tracking_callback(callback):
+    """ultralytics가 model.track()에서 등록한 트래킹 콜백인지 여부"""
+    func = getattr(callback, "func", callback)  # functools.partial
+    return getattr(func, "__module__", "") == "ultralytics.trackers.track"
+
+
+def predict_without_tracking(model, source, **kwargs):
+    """
+    트래킹 콜백을 잠시 떼어 낸 채 추론 (공유 모델의 lock 안에서 호출)
+
+    model.track()이 한 번이라도 호출되면 모델(예측기)에 트래킹 콜백이 남아서,
+    그냥 추론해도 예측기에 끼워져 있던 다른 검출기의 트래커가 갱신되고
+    결과도 트랙으로 바뀐다.
+
+    Args:
+        model: ultralytics YOLO 모델
+        source: 프레임 또는 프레임 리스트
+        **kwargs: model() 추론 인자
+
+    Returns:
+        results: YOLO Results 리스트
+    """
+    callback_sets = [getattr(model, "callbacks", {})]
+    predictor_callbacks = getattr(getattr(model, "predictor", None), "callbacks", None)
+    if predictor_callbacks is not None and predictor_callbacks is not callback_sets[0]:
+        callback_sets.append(predictor_callbacks)
+
+    removed = []
+    for callbacks in callback_sets:
+        for event, functions in list(callbacks.items()):
+            kept = [function for function in functions if not _is_tracking_callback(function)]
+            if len(kept) != len(functions):
+                removed.append((callbacks, event, functions))
+                callbacks[event] = kept
+    try:
+        return model(source, **kwargs)
+    finally:
+        for callbacks, event, functions in removed:
+            callbacks[event] = functions
+
+
+def create_tracker(tracker_config=TRACKER_CONFIG, frame_rate=30):
+    """
+    세션별 트래커 생성 (ultralytics BYTETrack/BoT-SORT, 모델 가중치와 무관)
+
+    트래커가 발급하는 ID는 모든 트래커가 공유하는 카운터에서 나오므로 다른 트래커가
+    생성되면 다시 겹칠 수 있다 (검출기가 세션 ID로 변환하여 사용).
+
+    Args:
+        tracker_config: 트래커 설정 yaml (예: "bytetrack.yaml")
+        frame_rate: 영상 프레임 레이트 (트랙 유지 시간 계산용)
+
+    Returns:
+        tracker: BYTETracker 또는 BOTSORT 인스턴스
+    """
+    from ultralytics.trackers.track import TRACKER_MAP
+    from ultralytics.utils import IterableSimpleNamespace, yaml_load
+    from ultralytics.utils.checks import check_yaml
+
+    cfg = IterableSimpleNamespace(**yaml_load(check_yaml(tracker_config)))
+    return TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=max(1, int(round(frame_rate))))
+
+
+# 모델 경로 → InferenceServer (프로세스 전체 공유)
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def get_inference_server(shared_model):
+    """
+    공유 모델에 대한 프로세스 전체 추론 서버 반환 (처음 호출 시 시작)
+
+    Args:
+        shared_model: modules.detector.SharedModel
+
+    Returns:
+        server: InferenceServer
+    """
+    with _servers_lock:
+        server = _servers.get(shared_model.path)
+        if server is None:
+            server = InferenceServer(shared_model, metrics=get_metrics())
+            _servers[shared_model.path] = server
+        return server
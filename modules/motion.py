@@ -0,0 +1,96 @@
+"""
+움직임 기반 추론 생략 모듈
+- 축소한 프레임의 차분으로 장면 변화 여부를 빠르게 판단
+"""
+import cv2
+import numpy as np
+
+from config import (MOTION_GATE_WIDTH, MOTION_PIXEL_DELTA,
+                    MOTION_CHANGED_RATIO, MOTION_GATE_MAX_SKIP)
+
+
+class MotionGate:
+    """
+    장면이 변하지 않은 프레임을 걸러내는 사전 필터
+
+    마지막으로 추론한 프레임(기준 프레임)과 현재 프레임을 저해상도 회색조로
+    비교하여, 바뀐 픽셀 비율이 임계값 미만이면 정적인 프레임으로 판단한다.
+    기준 프레임은 추론할 때만 갱신하므로 느린 변화도 누적되어 결국 감지된다.
+    """
+
+    def __init__(self, changed_ratio=MOTION_CHANGED_RATIO, pixel_delta=MOTION_PIXEL_DELTA,
+                 scale_width=MOTION_GATE_WIDTH, max_skip=MOTION_GATE_MAX_SKIP):
+        """
+        초기화
+
+        Args:
+            changed_ratio: 변화로 판단할 바뀐 픽셀 비율
+            pixel_delta: 픽셀이 바뀌었다고 판단할 밝기 차이
+            scale_width: 비교용 축소 프레임 너비
+            max_skip: 연속으로 생략할 수 있는 최대 프레임 수 (이후 강제 추론)
+        """
+        self.changed_ratio = changed_ratio
+        self.pixel_delta = pixel_delta
+        self.scale_width = scale_width
+        self.max_skip = max_skip
+
+        self.reference = None
+        self.consecutive_skips = 0
+
+        # 통계
+        self.checked = 0
+        self.skipped = 0
+
+    def _downscale(self, frame):
+        """비교용 저해상도 회색조 프레임 생성"""
+        h, w = frame.shape[:2]
+        scale_height = max(1, int(h * self.scale_width / w))
+        small = cv2.resize(frame, (self.scale_width, scale_height), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def is_static(self, frame):
+        """
+        기준 프레임 대비 장면 변화가 없는지 판단
+
+        Args:
+            frame: 현재 프레임 (BGR)
+
+        Returns:
+            static: True면 이전 분석 결과를 재사용해도 됨
+        """
+        self.checked += 1
+        small = self._downscale(frame)
+
+        if (self.reference is not None and self.reference.shape == small.shape
+                and self.consecutive_skips < self.max_skip):
+            diff = cv2.absdiff(small, self.reference)
+            ratio = np.count_nonzero(diff > self.pixel_delta) / diff.size
+            if ratio < self.changed_ratio:
+                self.consecutive_skips += 1
+                self.skipped += 1
+                return True
+
+        # 변화가 있으면 이 프레임을 새 기준으로 삼음 (호출 측에서 추론 수행)
+        self.reference = small
+        self.consecutive_skips = 0
+        return False
+
+    def set_reference(self, frame):
+        """
+        판단 없이 기준 프레임만 갱신 (재사용할 직전 결과가 없어 바로 추론할 때)
+
+        Args:
+            frame: 추론할 프레임 (BGR)
+        """
+        self.reference = self._downscale(frame)
+        self.consecutive_skips = 0
+
+    def reset(self):
+        """기준 프레임 초기화 (영상 이동/변경 시)"""
+        self.reference = None
+        self.consecutive_skips = 0
+
+    @property
+    def skip_ratio(self):
+        """전체 확인 프레임 중 추론을 생략한 비율"""
+        return self.skipped / self.checked if self.checked else 0.0
@@ -0,0 +1,373 @@
+"""
+오프라인(헤드리스) 영상 분석 모듈
+- 녹화 영상을 UI 없이 최대 속도로 분석하여 프레임별 결과를 파일로 저장
+- 시각화(박스, 그리드 선, 히트맵)는 전혀 수행하지 않음
+"""
+import csv
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from config import (DEFAULT_CONF_THRESHOLD, DEFAULT_GRID_SIZE, INFERENCE_BACKEND, INFERENCE_INT8,
+                    MODEL_PATH)
+from modules.density import calculate_cdi, get_risk_level_info
+from modules.direction import find_safest_direction
+from modules.export import resolve_model_path
+from modules.motion import MotionGate
+from utils.grid import get_grid_layout
+from utils.video import VideoSource
+
+# CSV 출력 컬럼
+RECORD_FIELDS = ["frame", "time", "count", "grid_counts", "cdi", "risk", "safest_zone"]
+
+
+def format_video_time(frame_index, fps):
+    """
+    프레임 인덱스를 영상 내 시각 문자열로 변환
+
+    Args:
+        frame_index: 프레임 인덱스
+        fps: 프레임 레이트
+
+    Returns:
+        time_text: "HH:MM:SS.mmm" 형식 문자열
+    """
+    seconds = frame_index / fps if fps > 0 else 0.0
+    hours, rem = divmod(seconds, 3600)
+    minutes, secs = divmod(rem, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+
+def make_frame_record(frame_index, fps, boxes, person_count, grid_layout, frame_area):
+    """
+    검출 결과로 프레임 레코드 생성 (그리드 집계 + CDI + 위험도 + 안전 구역)
+
+    Args:
+        frame_index: 프레임 인덱스
+        fps: 프레임 레이트
+        boxes: 검출 박스 리스트
+        person_count: 사람 수
+        grid_layout: GridLayout 인스턴스
+        frame_area: 프레임 면적
+
+    Returns:
+        record: 프레임 레코드 딕셔너리
+    """
+    grid_counts = grid_layout.count_people(boxes)
+    cdi = calculate_cdi(person_count, frame_area, grid_counts)
+    risk_info = get_risk_level_info(cdi)
+    safest_idx, _, _ = find_safest_direction(grid_counts, grid_layout.grid_size)
+
+    return {
+        "frame": frame_index,
+        "time": format_video_time(frame_index, fps),
+        "count": person_count,
+        "grid_counts": grid_counts,
+        "cdi": cdi,
+        "risk": risk_info["level"],
+        "safest_zone": "" if safest_idx is None else safest_idx
+    }
+
+
+def iter_frame_records(detector, source, start_frame=0, end_frame=None,
+                       conf_threshold=DEFAULT_CONF_THRESHOLD, grid_size=DEFAULT_GRID_SIZE,
+                       batch_size=1, use_tracking=True, adaptive_stride=False,
+                       motion_gate=None):
+    """
+    영상의 프레임 구간을 순차 분석하여 레코드를 하나씩 생성
+
+    Args:
+        detector: CrowdDetector 인스턴스
+        source: VideoSource 인스턴스
+        start_frame: 시작 프레임 (포함)
+        end_frame: 끝 프레임 (미포함, None이면 영상 끝까지)
+        conf_threshold: 신뢰도 임계값
+        grid_size: 그리드 크기 (rows, cols)
+        batch_size: 한 번의 추론에 묶을 프레임 수
+        use_tracking: 객체 트래킹 사용 여부
+        adaptive_stride: 적응형 검출 간격 사용 여부 (사용 시 배치 추론은 쓰지 않음)
+        motion_gate: MotionGate 인스턴스 (주어지면 정적 프레임은 직전 결과 재사용)
+
+    Yields:
+        record: 프레임 레코드 딕셔너리
+    """
+    if end_frame is None or end_frame > source.total_frames:
+        end_frame = source.total_frames
+
+    grid_layout = get_grid_layout((source.height, source.width), grid_size)
+    frame_area = source.width * source.height
+
+    # 검출 간격은 프레임마다 CDI를 보고 조절하므로 한 장씩 처리
+    detector.set_stride_mode(adaptive_stride)
+    if adaptive_stride or motion_gate is not None:
+        batch_size = 1
+
+    last_record = None
+
+    index = start_frame
+    while index < end_frame:
+        # 배치 단위로 프레임 읽기
+        indices = []
+        frames = []
+        while index < end_frame and len(frames) < batch_size:
+            ret, frame = source.read(index)
+            if not ret:
+                end_frame = index
+                break
+            indices.append(index)
+            frames.append(frame)
+            index += 1
+
+        if not frames:
+            break
+
+        # 장면 변화가 없으면 추론 없이 직전 레코드의 분석값을 재사용
+        if motion_gate is not None and motion_gate.is_static(frames[0]) and last_record is not None:
+            record = dict(last_record)
+            record["frame"] = indices[0]
+            record["time"] = format_video_time(indices[0], source.fps)
+            yield record
+            continue
+
+        if len(frames) == 1:
+            outputs = [detector.detect_people(frames[0], conf_threshold=conf_threshold,
+                                              use_tracking=use_tracking)]
+        else:
+            outputs = detector.detect_people_batch(frames, conf_threshold=conf_threshold,
+                                                   use_tracking=use_tracking)
+
+        for frame_index, (boxes, _, _, person_count) in zip(indices, outputs):
+            record = make_frame_record(frame_index, source.fps, boxes, person_count,
+                                       grid_layout, frame_area)
+            detector.update_stride(record["cdi"])
+            last_record = record
+            yield record
+
+
+def write_records_csv(records, output_path):
+    """
+    레코드를 CSV로 기록 (스트리밍, 전체를 메모리에 올리지 않음)
+
+    Args:
+        records: 레코드 이터러블
+        output_path: 출력 CSV 경로
+
+    Returns:
+        frames: 기록한 레코드 수
+    """
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    frames = 0
+    with open(output_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=RECORD_FIELDS)
+        writer.writeheader()
+        for record in records:
+            row = dict(record)
+            row["grid_counts"] = ";".join(str(c) for c in record["grid_counts"])
+            row["cdi"] = f"{record['cdi']:.4f}"
+            writer.writerow(row)
+            frames += 1
+    return frames
+
+
+def analyze_video(video_path, output_path, detector=None,
+                  conf_threshold=DEFAULT_CONF_THRESHOLD, grid_size=DEFAULT_GRID_SIZE,
+                  batch_size=1, use_tracking=True, adaptive_stride=False,
+                  motion_gate=False):
+    """
+    영상 전체를 헤드리스로 분석하여 CSV로 저장
+
+    Args:
+        video_path: 입력 비디오 경로
+        output_path: 출력 CSV 경로
+        detector: CrowdDetector 인스턴스 (None이면 새로 생성)
+        conf_threshold: 신뢰도 임계값
+        grid_size: 그리드 크기 (rows, cols)
+        batch_size: 한 번의 추론에 묶을 프레임 수
+        use_tracking: 객체 트래킹 사용 여부
+        adaptive_stride: 적응형 검출 간격 사용 여부
+        motion_gate: 정적 프레임 추론 생략 여부
+
+    Returns:
+        summary: {'frames', 'elapsed', 'fps', 'output', 'skipped'} 딕셔너리
+    """
+    if detector is None:
+        from modules.detector import CrowdDetector
+        detector = CrowdDetector()
+
+    gate = MotionGate() if motion_gate else None
+
+    source = VideoSource(video_path)
+    try:
+        start = time.perf_counter()
+        records = iter_frame_records(
+            detector, source,
+            conf_threshold=conf_threshold, grid_size=grid_size,
+            batch_size=batch_size, use_tracking=use_tracking,
+            adaptive_stride=adaptive_stride, motion_gate=gate
+        )
+        frames = write_records_csv(records, output_path)
+        elapsed = time.perf_counter() - start
+    finally:
+        source.release()
+
+    return {
+        "frames": frames,
+        "elapsed": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "output": output_path,
+        "skipped": gate.skipped if gate is not None else 0
+    }
+
+
+# ==========================================
+# 프로세스 풀 분할 분석
+# ==========================================
+# 워커 프로세스마다 하나씩 생성되는 검출기
+_shard_detector = None
+
+
+def _init_shard_worker(model_path, num_threads):
+    """
+    워커 프로세스 초기화: 프로세스당 CrowdDetector 1개 생성
+
+    Args:
+        model_path: 백엔드에 맞게 확정된 모델 경로 (워커에서는 다시 내보내지 않음)
+        num_threads: 워커당 연산 스레드 수 (코어 과다 할당 방지)
+    """
+    global _shard_detector
+
+    cv2.setNumThreads(num_threads)
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+    except ImportError:
+        pass
+
+    from modules.detector import CrowdDetector
+    _shard_detector = CrowdDetector(model_path, backend=None)
+
+
+def _analyze_shard(video_path, start_frame, end_frame, conf_threshold, grid_size,
+                   batch_size, use_tracking, adaptive_stride, motion_gate):
+    """
+    워커 프로세스에서 프레임 구간 하나를 분석
+
+    Returns:
+        records: 구간 내 프레임 레코드 리스트 (프레임 순서)
+        skipped: 추론을 생략한 프레임 수
+    """
+    # 구간마다 트래커를 새로 시작 (구간 경계에서 ID는 이어지지 않음)
+    _shard_detector.reset_tracking()
+
+    gate = MotionGate() if motion_gate else None
+
+    source = VideoSource(video_path)
+    try:
+        records = list(iter_frame_records(
+            _shard_detector, source, start_frame, end_frame,
+            conf_threshold=conf_threshold, grid_size=grid_size,
+            batch_size=batch_size, use_tracking=use_tracking,
+            adaptive_stride=adaptive_stride, motion_gate=gate
+        ))
+        return records, gate.skipped if gate is not None else 0
+    finally:
+        source.release()
+
+
+def split_frame_ranges(total_frames, chunk_frames):
+    """
+    전체 프레임을 일정 길이의 구간으로 분할
+
+    Args:
+        total_frames: 전체 프레임 수
+        chunk_frames: 구간당 프레임 수
+
+    Returns:
+        ranges: [(start, end), ...] (end 미포함)
+    """
+    chunk_frames = max(1, int(chunk_frames))
+    return [(start, min(start + chunk_frames, total_frames))
+            for start in range(0, total_frames, chunk_frames)]
+
+
+def analyze_video_sharded(video_path, output_path, workers=None, model_path=MODEL_PATH,
+                          conf_threshold=DEFAULT_CONF_THRESHOLD, grid_size=DEFAULT_GRID_SIZE,
+                          batch_size=1, use_tracking=True, adaptive_stride=False,
+                          motion_gate=False, chunk_frames=None, backend=INFERENCE_BACKEND,
+                          int8=INFERENCE_INT8):
+    """
+    영상을 프레임 구간으로 나누어 여러 프로세스에서 병렬 분석
+
+    구간별 결과는 프레임 순서대로 병합되어 analyze_video()와 같은 형식의
+    단일 CSV 타임라인으로 저장된다.
+
+    Args:
+        video_path: 입력 비디오 경로
+        output_path: 출력 CSV 경로
+        workers: 워커 프로세스 수 (None이면 CPU 코어 수)
+        model_path: YOLO 모델 경로
+        conf_threshold: 신뢰도 임계값
+        grid_size: 그리드 크기 (rows, cols)
+        batch_size: 한 번의 추론에 묶을 프레임 수
+        use_tracking: 객체 트래킹 사용 여부
+        adaptive_stride: 적응형 검출 간격 사용 여부
+        motion_gate: 정적 프레임 추론 생략 여부
+        chunk_frames: 구간당 프레임 수 (None이면 워커당 약 4개 구간이 되도록 자동 결정)
+        backend: 추론 백엔드 ("torch" | "onnx" | "openvino")
+        int8: INT8 양자화 모델 사용 여부
+
+    Returns:
+        summary: {'frames', 'elapsed', 'fps', 'output', 'skipped', 'workers', 'shards'} 딕셔너리
+    """
+    workers = workers or os.cpu_count() or 1
+
+    # 워커마다 내보내기를 시도하지 않도록 백엔드용 모델 경로를 먼저 확정
+    model_path = resolve_model_path(model_path, backend, int8)
+
+    source = VideoSource(video_path)
+    total_frames = source.total_frames
+    source.release()
+
+    if chunk_frames is None:
+        # 구간 길이가 고르지 않게 끝나는 워커가 없도록 워커 수보다 잘게 나눔
+        chunk_frames = max(batch_size, math.ceil(total_frames / (workers * 4)))
+    ranges = split_frame_ranges(total_frames, chunk_frames)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker,
+                             initargs=(model_path, 1)) as executor:
+        futures = [
+            executor.submit(_analyze_shard, video_path, shard_start, shard_end,
+                            conf_threshold, grid_size, batch_size, use_tracking,
+                            adaptive_stride, motion_gate)
+            for shard_start, shard_end in ranges
+        ]
+
+        skipped = 0
+
+        def merged_records():
+            # 제출 순서(=프레임 순서)대로 결과를 받아 스트리밍 기록
+            nonlocal skipped
+            for future in futures:
+                records, shard_skipped = future.result()
+                skipped += shard_skipped
+                yield from records
+
+        frames = write_records_csv(merged_records(), output_path)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "frames": frames,
+        "elapsed": elapsed,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "output": output_path,
+        "skipped": skipped,
+        "workers": workers,
+        "shards": len(ranges)
+    }
@@ -0,0 +1,150 @@
+"""
+프레임 분석 파이프라인 모듈
+- 검출 → 그리드 → CDI → 방향 단계를 한 곳에서 수행
+- 시각화는 하지 않음 (표시할 프레임만 utils.annotation.FrameAnnotator로 그림)
+"""
+from datetime import datetime
+from time import perf_counter
+
+from modules.density import calculate_cdi, get_risk_level_info
+from modules.direction import get_direction_info
+from modules.motion import MotionGate
+from utils.grid import get_grid_layout
+from utils.profiler import StageProfiler
+
+
+class FramePipeline:
+    """프레임 한 장을 분석하여 결과 딕셔너리를 만드는 파이프라인"""
+
+    def __init__(self, detector, profiler=None, metrics=None, stream="default"):
+        """
+        초기화
+
+        Args:
+            detector: CrowdDetector 인스턴스
+            profiler: 단계별 지연 시간을 기록할 StageProfiler (None이면 측정 안 함)
+            metrics: 프레임별 지표를 반영할 CrowdMetrics (None이면 수집 안 함)
+            stream: 지표의 스트림 레이블 (영상 파일 이름 등)
+        """
+        self.detector = detector
+        self.profiler = profiler if profiler is not None else StageProfiler(enabled=False)
+        self.metrics = metrics
+        self.stream = stream
+        
+        # 정적 장면에서 추론을 생략하기 위한 사전 필터와 직전 결과
+        self.motion_gate = MotionGate()
+        self.last_result = None
+
+    def reset(self):
+        """움직임 판단 기준 프레임과 직전 결과 초기화 (영상 이동/변경 시 다른 위치의 결과를 재사용하지 않도록)"""
+        self.motion_gate.reset()
+        self.last_result = None
+
+    def process(self, frame, settings, frame_ref=None):
+        """
+        프레임 분석
+
+        Args:
+            frame: 입력 프레임 (BGR)
+            settings: render_sidebar()가 반환한 설정 딕셔너리
+            frame_ref: 검출 캐시 조회용 (영상 키, 프레임 번호) (None이면 캐시 사용 안 함)
+
+        Returns:
+            result: 분석 결과 딕셔너리 (프레임이 None이면 None)
+        """
+        if frame is None:
+            return None
+
+        started = perf_counter()
+        grid_size = settings['grid_size']
+        height, width = frame.shape[:2]
+
+        # 0. 장면 변화가 없으면 직전 결과 재사용 (설정이 같을 때만)
+        #    재사용할 결과가 없으면 판단(및 생략 횟수 집계) 없이 기준 프레임만 갱신하고 추론
+        settings_key = (grid_size, settings['conf_threshold'])
+        profiler = self.profiler
+        if settings.get('motion_gate', False):
+            reusable = (self.last_result is not None
+                        and self.last_result["settings_key"] == settings_key)
+            with profiler.span("motion_gate"):
+                if reusable:
+                    static = self.motion_gate.is_static(frame)
+                else:
+                    self.motion_gate.set_reference(frame)
+                    static = False
+            if static:
+                result = dict(self.last_result)
+                result["frame"] = frame
+                result["time"] = datetime.now().strftime("%H:%M:%S")
+                result["inference_skipped"] = True
+                result["skipped_inferences"] = self.motion_gate.skipped
+                result["skip_ratio"] = self.motion_gate.skip_ratio
+                if self.metrics is not None:
+                    self.metrics.observe_frame(self.stream, result,
+                                               frame_seconds=perf_counter() - started)
+                return result
+
+        # 1. 사람 검출 (적응형 검출 간격 모드면 일부 프레임은 추론 없이 박스 이동)
+        self.detector.set_stride_mode(settings.get('adaptive_stride', False))
+        detect_started = perf_counter()
+        with profiler.span("detect"):
+            boxes, track_ids, confidences, person_count = self.detector.detect_people(
+                frame, conf_threshold=settings['conf_threshold'], frame_ref=frame_ref
+            )
+        detect_seconds = perf_counter() - detect_started
+
+        # 2. 그리드 분석 (프레임/그리드 크기별로 캐시된 배치 정보 사용)
+        with profiler.span("grid_count"):
+            layout = get_grid_layout(frame.shape, grid_size)
+            grid_counts = layout.count_people(boxes)
+
+        # 3. 위험도 계산
+        with profiler.span("cdi"):
+            cdi = calculate_cdi(person_count, width * height, grid_counts)
+            risk_info = get_risk_level_info(cdi)
+        self.detector.update_stride(cdi)
+
+        # 4. 방향 추천
+        with profiler.span("direction"):
+            direction_info = get_direction_info(grid_counts, grid_size)
+
+        result = {
+            "time": datetime.now().strftime("%H:%M:%S"),
+            "frame": frame,
+            "boxes": boxes,
+            "track_ids": track_ids,
+            "confidences": confidences,
+            "person_count": person_count,
+            "grid_counts": grid_counts,
+            "grid_layout": layout,
+            "cdi": cdi,
+            "risk_info": risk_info,
+            "direction_info": direction_info,
+            "settings_key": settings_key,
+            "inference_skipped": False,
+            "skipped_inferences": self.motion_gate.skipped,
+            "skip_ratio": self.motion_gate.skip_ratio,
+        }
+        self.last_result = result
+        if self.metrics is not None:
+            self.metrics.observe_frame(self.stream, result, inference_seconds=detect_seconds,
+                                       frame_seconds=perf_counter() - started)
+        return result
+
+
+def make_history_record(result):
+    """
+    분석 결과를 data_history 레코드 형식으로 변환
+
+    Args:
+        result: FramePipeline.process()의 반환값
+
+    Returns:
+        record: {'time', 'count', 'cdi', 'risk'} 딕셔너리
+    """
+    return {
+        "time": result["time"],
+        "count": result["person_count"],
+        "cdi": result["cdi"],
+        "risk": result["risk_info"]["level"]
+    }
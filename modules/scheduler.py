@@ -0,0 +1,211 @@
+"""
+다중 카메라 스트림 스케줄러 모듈
+- 여러 영상 소스의 프레임을 검출기 하나로 번갈아(또는 묶어서) 분석
+- 스트림별 트래커 상태, 구역별 인원, CDI, 방향 정보는 따로 유지
+"""
+from time import perf_counter
+
+from config import (DEFAULT_CONF_THRESHOLD, DEFAULT_GRID_SIZE,
+                    SCHEDULER_STREAMS_PER_STEP, PRIORITY_RISK_LEVELS)
+from modules.density import calculate_cdi, get_risk_level_info
+from modules.direction import get_direction_info
+from utils.grid import get_grid_layout
+from utils.video import VideoSource
+
+
+class StreamState:
+    """스트림 하나의 분석 상태"""
+
+    def __init__(self, name, path, grid_size):
+        """
+        초기화
+
+        Args:
+            name: 스트림 이름 (카메라 이름 등)
+            path: 비디오 경로
+            grid_size: 그리드 크기 (rows, cols)
+        """
+        self.name = name
+        self.source = VideoSource(path)
+        self.frame_index = 0
+        self.finished = False
+
+        self.grid_layout = get_grid_layout((self.source.height, self.source.width), grid_size)
+        self.grid_size = grid_size
+
+        # 검출기를 공유하므로 스트림별 트래킹 상태를 따로 보관
+        self.tracking_state = None
+
+        # 최근 분석 결과
+        self.person_count = 0
+        self.grid_counts = [0] * len(self.grid_layout.regions)
+        self.cdi = 0.0
+        self.risk_info = None
+        self.direction_info = None
+
+        # 마지막으로 처리된 스케줄러 스텝 (라운드 로빈 순서 결정용)
+        self.last_served = -1
+
+    @property
+    def is_priority(self):
+        """마지막 위험도가 WARNING/DANGER인지 여부"""
+        return self.risk_info is not None and self.risk_info["level"] in PRIORITY_RISK_LEVELS
+
+    def update(self, boxes, person_count):
+        """검출 결과로 스트림 상태 갱신"""
+        frame_area = self.source.width * self.source.height
+        self.person_count = person_count
+        self.grid_counts = self.grid_layout.count_people(boxes)
+        self.cdi = calculate_cdi(person_count, frame_area, self.grid_counts)
+        self.risk_info = get_risk_level_info(self.cdi)
+        self.direction_info = get_direction_info(self.grid_counts, self.grid_size)
+
+    def snapshot(self):
+        """현재 상태를 결과 딕셔너리로 반환"""
+        return {
+            "stream": self.name,
+            "frame_index": self.frame_index - 1,
+            "person_count": self.person_count,
+            "grid_counts": self.grid_counts,
+            "cdi": self.cdi,
+            "risk_info": self.risk_info,
+            "direction_info": self.direction_info
+        }
+
+    def release(self):
+        self.source.release()
+
+
+class MultiStreamScheduler:
+    """
+    여러 스트림을 검출기 하나로 분석하는 스케줄러
+
+    매 스텝마다 최대 streams_per_step개의 스트림을 골라 다음 프레임을 분석한다.
+    마지막 위험도가 WARNING/DANGER인 스트림이 먼저 선택되며, 나머지는
+    가장 오래 처리되지 않은 순서(라운드 로빈)로 선택된다.
+    트래킹을 끄면 선택된 스트림의 프레임을 한 번의 배치 추론으로 처리한다.
+    """
+
+    def __init__(self, detector, sources, grid_size=DEFAULT_GRID_SIZE,
+                 conf_threshold=DEFAULT_CONF_THRESHOLD, use_tracking=True,
+                 streams_per_step=SCHEDULER_STREAMS_PER_STEP, metrics=None):
+        """
+        초기화
+
+        Args:
+            detector: 공유 CrowdDetector 인스턴스
+            sources: {스트림 이름: 비디오 경로} 딕셔너리
+            grid_size: 그리드 크기 (rows, cols)
+            conf_threshold: 신뢰도 임계값
+            use_tracking: 객체 트래킹 사용 여부
+            streams_per_step: 한 스텝에서 처리할 최대 스트림 수
+            metrics: 스트림별 지표를 반영할 CrowdMetrics (None이면 수집 안 함)
+        """
+        self.detector = detector
+        self.metrics = metrics
+        self.conf_threshold = conf_threshold
+        self.use_tracking = use_tracking
+        self.streams_per_step = max(1, streams_per_step)
+
+        self.streams = {name: StreamState(name, path, grid_size) for name, path in sources.items()}
+        self.steps = 0
+
+    @property
+    def active_streams(self):
+        return [stream for stream in self.streams.values() if not stream.finished]
+
+    def select_streams(self):
+        """
+        이번 스텝에 처리할 스트림 선택
+
+        Returns:
+            selected: StreamState 리스트
+        """
+        active = self.active_streams
+        if len(active) <= self.streams_per_step:
+            return active
+
+        by_age = sorted(active, key=lambda stream: stream.last_served)
+        priority = [stream for stream in by_age if stream.is_priority]
+        normal = [stream for stream in by_age if not stream.is_priority]
+
+        # 위험 스트림이 많아도 일반 스트림이 계속 밀리지 않도록 한 자리는 남겨둠
+        priority_slots = self.streams_per_step - 1 if normal else self.streams_per_step
+        selected = priority[:priority_slots]
+        selected += normal[:self.streams_per_step - len(selected)]
+        return selected
+
+    def step(self):
+        """
+        스케줄러 한 스텝 수행
+
+        Returns:
+            results: 이번 스텝에 분석된 스트림별 결과 리스트 (처리할 스트림이 없으면 빈 리스트)
+        """
+        frames = []
+        streams = []
+        # 선택된 스트림이 모두 끝난 경우 남은 스트림에서 다시 선택
+        while not streams and self.active_streams:
+            for stream in self.select_streams():
+                ret, frame = stream.source.read(stream.frame_index)
+                if not ret:
+                    stream.finished = True
+                    continue
+                stream.frame_index += 1
+                stream.last_served = self.steps
+                frames.append(frame)
+                streams.append(stream)
+
+        if not streams:
+            return []
+
+        if self.use_tracking:
+            # 스트림별 트래커 상태를 교체해 가며 순차 처리
+            outputs = []
+            latencies = []
+            for stream, frame in zip(streams, frames):
+                started = perf_counter()
+                self.detector.restore_tracking_state(stream.tracking_state)
+                outputs.append(self.detector.detect_people(
+                    frame, conf_threshold=self.conf_threshold, use_tracking=True
+                ))
+                stream.tracking_state = self.detector.export_tracking_state()
+                latencies.append(perf_counter() - started)
+        else:
+            started = perf_counter()
+            outputs = self.detector.detect_people_batch(
+                frames, conf_threshold=self.conf_threshold, use_tracking=False
+            )
+            # 배치 추론 시간은 스트림들이 나눠 가진 것으로 봄
+            latencies = [(perf_counter() - started) / len(frames)] * len(frames)
+
+        results = []
+        for stream, (boxes, _, _, person_count), latency in zip(streams, outputs, latencies):
+            stream.update(boxes, person_count)
+            result = stream.snapshot()
+            results.append(result)
+            if self.metrics is not None:
+                self.metrics.observe_frame(stream.name, result, inference_seconds=latency)
+
+        self.steps += 1
+        return results
+
+    def run(self, max_steps=None, callback=None):
+        """
+        모든 스트림이 끝나거나 max_steps에 도달할 때까지 실행
+
+        Args:
+            max_steps: 최대 스텝 수 (None이면 제한 없음)
+            callback: 스텝마다 결과 리스트를 받아 호출할 함수
+        """
+        while max_steps is None or self.steps < max_steps:
+            results = self.step()
+            if not results:
+                break
+            if callback is not None:
+                callback(results)
+
+    def release(self):
+        """모든 스트림의 디코더 해제"""
+        for stream in self.streams.values():
+            stream.release()
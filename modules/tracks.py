@@ -0,0 +1,165 @@
+"""
+트랙 스무딩 상태 모듈
+- 고정 용량 배열 기반 트랙 테이블 (ID별 슬롯 + 최근 K개 박스 링 버퍼)
+"""
+import numpy as np
+
+from config import TRACK_TABLE_CAPACITY, TRACK_MAX_MISSED
+
+
+class TrackTable:
+    """
+    트래킹 ID별 최근 박스를 보관하는 고정 용량 테이블
+
+    활성 ID마다 슬롯 하나를 배정하고 슬롯별로 최근 window개 박스를 링 버퍼에
+    보관한다. max_missed 프레임 이상 보이지 않은 ID는 슬롯을 반납하며,
+    슬롯이 모자라면 가장 오래 보이지 않은 ID부터 내보낸다. 한 프레임의 ID가
+    용량보다 많아 슬롯을 받지 못한 ID는 스무딩 없이 원본 박스를 그대로 쓴다.
+    스무딩 박스(최근 박스 평균)와 속도는 한 번의 배열 연산으로 계산한다.
+    """
+
+    def __init__(self, capacity=TRACK_TABLE_CAPACITY, window=5, max_missed=TRACK_MAX_MISSED):
+        """
+        초기화
+
+        Args:
+            capacity: 최대 동시 트랙 수
+            window: 스무딩에 사용할 최근 박스 개수
+            max_missed: 이 프레임 수보다 오래 보이지 않으면 트랙 제거
+        """
+        self.capacity = capacity
+        self.window = window
+        self.max_missed = max_missed
+
+        self.ids = np.full(capacity, -1, dtype=np.int64)
+        self.boxes = np.zeros((capacity, window, 4), dtype=np.float64)
+        self.heads = np.zeros(capacity, dtype=np.int64)
+        self.lengths = np.zeros(capacity, dtype=np.int64)
+        self.last_box = np.zeros((capacity, 4), dtype=np.float64)
+        self.last_seen = np.zeros(capacity, dtype=np.int64)
+
+        # track_id → 슬롯 인덱스
+        self._slot_of = {}
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def reset(self):
+        """모든 트랙 제거"""
+        self.ids[:] = -1
+        self.lengths[:] = 0
+        self.heads[:] = 0
+        self._slot_of.clear()
+
+    def _release(self, slots):
+        """슬롯 반납"""
+        for track_id in self.ids[slots]:
+            self._slot_of.pop(int(track_id), None)
+        self.ids[slots] = -1
+        self.lengths[slots] = 0
+        self.heads[slots] = 0
+
+    def evict_stale(self, frame_no):
+        """
+        max_missed 프레임보다 오래 보이지 않은 트랙 제거
+
+        Args:
+            frame_no: 현재 프레임 번호
+
+        Returns:
+            evicted: 제거한 트랙 수
+        """
+        stale = np.flatnonzero((self.ids >= 0) & (frame_no - self.last_seen > self.max_missed))
+        if len(stale):
+            self._release(stale)
+        return len(stale)
+
+    def _assign_slots(self, track_ids):
+        """ID별 슬롯 조회 (없으면 새로 배정, 슬롯이 모자라 배정하지 못하면 -1)"""
+        slots = np.full(len(track_ids), -1, dtype=np.int64)
+        new_positions = []
+        for i, track_id in enumerate(track_ids):
+            slot = self._slot_of.get(int(track_id))
+            if slot is None:
+                new_positions.append(i)
+            else:
+                slots[i] = slot
+
+        if not new_positions:
+            return slots
+
+        free = np.flatnonzero(self.ids < 0)
+        shortage = len(new_positions) - len(free)
+        if shortage > 0:
+            # 이번 프레임에 보이지 않은 트랙 중 가장 오래된 것부터 내보냄
+            is_new = np.zeros(len(track_ids), dtype=bool)
+            is_new[new_positions] = True
+            current = np.zeros(self.capacity, dtype=bool)
+            current[slots[~is_new]] = True
+            candidates = np.flatnonzero((self.ids >= 0) & ~current)
+            oldest = candidates[np.argsort(self.last_seen[candidates], kind="stable")[:shortage]]
+            self._release(oldest)
+            free = np.flatnonzero(self.ids < 0)
+
+        # 이번 프레임의 ID만으로 용량을 넘으면 남는 ID는 슬롯 없이 (-1) 둠
+        for i, slot in zip(new_positions, free):
+            track_id = int(track_ids[i])
+            self.ids[slot] = track_id
+            self._slot_of[track_id] = int(slot)
+            slots[i] = slot
+
+        return slots
+
+    def update(self, track_ids, boxes, frame_no):
+        """
+        이번 프레임의 트랙 박스를 기록하고 스무딩 박스와 속도 계산
+
+        Args:
+            track_ids: (N,) 트래킹 ID 배열
+            boxes: (N, 4) 원본 박스 배열
+            frame_no: 현재 프레임 번호
+
+        Returns:
+            smoothed: (N, 4) 스무딩된 박스 (정수)
+            velocities: (N, 4) 직전 관측 대비 프레임당 이동량
+        """
+        track_ids = np.asarray(track_ids, dtype=np.int64).reshape(-1)
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+        self.evict_stale(frame_no)
+
+        if len(track_ids) == 0:
+            return np.zeros((0, 4), dtype=np.int64), np.zeros((0, 4), dtype=np.float32)
+
+        slots = self._assign_slots(track_ids)
+
+        # 슬롯을 받지 못한 ID (용량 초과)는 원본 박스, 속도 0
+        smoothed = boxes.astype(np.int64)
+        velocities = np.zeros((len(track_ids), 4), dtype=np.float32)
+        assigned = slots >= 0
+        if not assigned.all():
+            slots = slots[assigned]
+            boxes = boxes[assigned]
+
+        # 직전 관측이 있는 트랙만 속도 계산
+        seen_before = self.lengths[slots] > 0
+        gaps = np.maximum(1, frame_no - self.last_seen[slots])
+        velocities[assigned] = np.where(
+            seen_before[:, None],
+            (boxes - self.last_box[slots]) / gaps[:, None],
+            0.0
+        )
+
+        # 링 버퍼에 기록
+        self.boxes[slots, self.heads[slots]] = boxes
+        self.heads[slots] = (self.heads[slots] + 1) % self.window
+        self.lengths[slots] = np.minimum(self.lengths[slots] + 1, self.window)
+        self.last_box[slots] = boxes
+        self.last_seen[slots] = frame_no
+
+        # 채워진 항목의 평균 (링 버퍼의 빈 칸은 합에서 제외)
+        filled = np.arange(self.window)[None, :] < self.lengths[slots][:, None]
+        sums = (self.boxes[slots] * filled[:, :, None]).sum(axis=1)
+        smoothed[assigned] = (sums / self.lengths[slots][:, None]).astype(np.int64)
+
+        return smoothed, velocities
@@ -0,0 +1,166 @@
+"""
+백그라운드 분석 워커 모듈
+- Streamlit 렌더 루프와 분리된 세션 단위 분석 스레드
+"""
+import os
+import threading
+from collections import deque
+
+from config import RESULT_BUFFER_SIZE, HISTORY_QUEUE_SIZE
+from modules.detection_cache import video_fingerprint
+from modules.pipeline import FramePipeline, make_history_record
+from utils.video import VideoSource
+
+
+class AnalysisWorker(threading.Thread):
+    """
+    영상을 순차적으로 읽어 전체 파이프라인을 최대 속도로 수행하는 스레드
+
+    분석 결과는 크기가 제한된 링 버퍼에 쌓이며, UI는 일정 주기로 최신 결과만
+    가져가 표시한다 (표시되지 않은 중간 프레임은 버려짐).
+    data_history용 경량 레코드는 분석 로그에 바로 기록하고, 별도 큐에도 모든
+    프레임분을 쌓는다. 큐가 가득 차면 (탭이 숨겨지거나 연결이 끊겨 UI가 꺼내
+    가지 않으면) 레코드를 버리지 않고 UI가 꺼내 갈 때까지 분석을 멈춘다.
+    """
+
+    def __init__(self, detector, video_path, start_frame, settings,
+                 buffer_size=RESULT_BUFFER_SIZE, profiler=None, metrics=None, stream=None,
+                 log_writer=None, max_pending=HISTORY_QUEUE_SIZE):
+        """
+        초기화
+
+        Args:
+            detector: CrowdDetector 인스턴스 (워커 실행 중에는 워커만 사용)
+            video_path: 비디오 파일 경로
+            start_frame: 분석 시작 프레임
+            settings: 분석 설정 딕셔너리
+            buffer_size: 결과 링 버퍼 크기
+            profiler: 단계별 지연 시간을 기록할 StageProfiler (None이면 측정 안 함)
+            metrics: 프레임별 지표를 반영할 CrowdMetrics (None이면 수집 안 함)
+            stream: 지표의 스트림 레이블 (None이면 영상 파일 이름)
+            log_writer: 레코드를 바로 기록할 AnalysisLogWriter (None이면 기록 안 함)
+            max_pending: UI가 꺼내 가지 않은 레코드가 이만큼 쌓이면 분석 대기
+        """
+        super().__init__(daemon=True)
+        self.stream = stream or os.path.basename(video_path)
+        self.pipeline = FramePipeline(detector, profiler, metrics, self.stream)
+        self.metrics = metrics
+        self.log_writer = log_writer
+        self.max_pending = max(1, max_pending)
+        self.video_path = video_path
+        self.start_frame = start_frame
+
+        self._settings = dict(settings)
+        self._lock = threading.Lock()
+        # 레코드 큐에 자리가 나거나 정지 요청이 오면 깨움
+        self._records_drained = threading.Condition(self._lock)
+        self._stop_event = threading.Event()
+
+        # 표시용 결과 링 버퍼 (프레임 포함)
+        self._results = deque(maxlen=buffer_size)
+        # 기록용 레코드 큐 (프레임 미포함)
+        self._records = deque()
+
+        self.frames_processed = 0
+        # 마지막으로 분석을 마친 프레임 번호 (정지 후 이어서 재생할 위치)
+        self.last_index = start_frame - 1
+        self.finished = False
+        self.error = None
+
+    def update_settings(self, settings):
+        """다음 프레임부터 적용할 설정 갱신"""
+        with self._lock:
+            self._settings = dict(settings)
+
+    def run(self):
+        source = None
+        try:
+            source = VideoSource(self.video_path)
+            self.pipeline.detector.set_frame_rate(source.fps)
+            video_key = video_fingerprint(self.video_path)
+            index = self.start_frame
+
+            while not self._stop_event.is_set() and index < source.total_frames:
+                with self.pipeline.profiler.span("decode"):
+                    ret, frame = source.read(index)
+                if not ret:
+                    break
+
+                with self._lock:
+                    settings = self._settings
+
+                result = self.pipeline.process(frame, settings, frame_ref=(video_key, index))
+                result["frame_index"] = index
+
+                record = make_history_record(result)
+                if self.log_writer is not None:
+                    self.log_writer.write(record)
+
+                with self._lock:
+                    self._results.append(result)
+                    while len(self._records) >= self.max_pending and not self._stop_event.is_set():
+                        self._records_drained.wait()
+                    self._records.append(record)
+                    pending = len(self._records)
+                    self.last_index = index
+                if self.metrics is not None:
+                    self.metrics.set_queue_depth(f"history:{self.stream}", pending)
+
+                self.frames_processed += 1
+                index += 1
+        except Exception as e:
+            self.error = e
+        finally:
+            if source is not None:
+                source.release()
+            if self.metrics is not None:
+                # 끝난 워커의 기록 대기열 지표는 더 이상 갱신되지 않으므로 제거
+                self.metrics.clear_queue_depth(f"history:{self.stream}")
+            self.finished = True
+
+    def latest(self):
+        """
+        가장 최근 분석 결과 반환
+
+        Returns:
+            result: 분석 결과 딕셔너리 (아직 없으면 None)
+        """
+        with self._lock:
+            return self._results[-1] if self._results else None
+
+    def drain_records(self):
+        """
+        마지막 호출 이후 쌓인 기록용 레코드를 모두 꺼냄
+
+        Returns:
+            records: data_history 레코드 리스트
+        """
+        with self._lock:
+            records = list(self._records)
+            self._records.clear()
+            self._records_drained.notify_all()
+        return records
+
+    def request_stop(self):
+        """정지 요청만 보내고 기다리지 않음 (세션 종료 시 정리용)"""
+        self._stop_event.set()
+        with self._lock:
+            self._records_drained.notify_all()
+
+    def stop(self, timeout=2.0):
+        """
+        워커 정지 및 종료 대기
+
+        추론 중이면 timeout 안에 끝나지 않을 수 있다. 이때 스레드는 현재 프레임을
+        마치고 끝나므로, 그 전까지는 검출기를 다른 곳에서 사용하면 안 된다.
+
+        Args:
+            timeout: 종료 대기 시간 (초)
+
+        Returns:
+            stopped: 스레드가 끝났으면 True
+        """
+        self.request_stop()
+        if self.is_alive():
+            self.join(timeout)
+        return not self.is_alive()
@@ -0,0 +1,145 @@
+"""
+분석 색인 테스트 (영상 내용 지문 기반 조회, 중단 후 이어서 색인, 프레임 조회)
+"""
+import hashlib
+import shutil
+
+import numpy as np
+import pytest
+
+from create_sample_video import create_sample_video
+from modules.analysis_index import build_index, get_analysis_index, open_analysis_index
+
+FRAMES = 24
+GRID_SIZE = (3, 3)
+
+
+class _StubDetector:
+    """프레임 내용만으로 정해지는 박스를 반환하는 검출기 (이어서 색인해도 결과가 같음)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def reset_tracking(self):
+        pass
+
+    def set_stride_mode(self, enabled):
+        pass
+
+    def update_stride(self, cdi):
+        pass
+
+    def detect_people(self, frame, conf_threshold=0.25, use_tracking=True):
+        self.calls += 1
+        height, width = frame.shape[:2]
+        count = int(frame.mean()) % 5 + 1
+        x = np.linspace(0, width - 40, count).astype(np.int64)
+        y = np.linspace(0, height - 80, count).astype(np.int64)
+        boxes = np.stack([x, y, x + 40, y + 80], axis=1)
+        return boxes, np.arange(count), np.full(count, 0.9), count
+
+
+class _Interrupt(Exception):
+    pass
+
+
+@pytest.fixture(scope="module")
+def video(tmp_path_factory):
+    path = tmp_path_factory.mktemp("video") / "clip.mp4"
+    create_sample_video(str(path), fps=10, width=320, height=240, people=6, seed=1,
+                        total_frames=FRAMES, verbose=False)
+    return str(path)
+
+
+def _build(video_path, index_dir, **kwargs):
+    return build_index(video_path, detector=_StubDetector(), grid_size=GRID_SIZE,
+                       index_dir=str(index_dir), flush_every=5, **kwargs)
+
+
+def _values(index):
+    return [index.lookup(frame) for frame in range(index.total_frames)]
+
+
+def test_lookup(video, tmp_path):
+    summary = _build(video, tmp_path)
+    assert summary["frames"] == FRAMES and summary["resumed_from"] == 0
+
+    index = open_analysis_index(video, index_dir=str(tmp_path))
+    assert index.complete and index.grid_size == GRID_SIZE
+    assert index.first_pending() == FRAMES
+    record = index.lookup(3)
+    assert set(record) == {"count", "cdi", "risk", "grid_counts"}
+    assert sum(record["grid_counts"]) == record["count"]
+    assert index.lookup(-1) is None and index.lookup(FRAMES) is None
+
+    frames, peaks = index.timeline(max_points=6)
+    assert len(frames) == 6 and not np.isnan(peaks).any()
+
+
+def test_resume_after_interrupt(video, tmp_path):
+    _build(video, tmp_path / "full")
+    full = _values(open_analysis_index(video, index_dir=str(tmp_path / "full")))
+
+    def stop_midway(done, total):
+        if done >= 10:
+            raise _Interrupt()
+
+    with pytest.raises(_Interrupt):
+        _build(video, tmp_path / "resume", progress=stop_midway)
+
+    partial = open_analysis_index(video, index_dir=str(tmp_path / "resume"))
+    pending = partial.first_pending()
+    assert 0 < pending < FRAMES
+    assert partial.lookup(pending) is None
+    assert not partial.complete
+
+    detector = _StubDetector()
+    summary = build_index(video, detector=detector, grid_size=GRID_SIZE,
+                          index_dir=str(tmp_path / "resume"))
+    assert summary["resumed_from"] == pending
+    assert detector.calls == FRAMES - pending
+    assert _values(open_analysis_index(video, index_dir=str(tmp_path / "resume"))) == full
+
+
+def test_settings_change_rebuilds(video, tmp_path):
+    _build(video, tmp_path)
+    summary = build_index(video, detector=_StubDetector(), grid_size=(2, 2), index_dir=str(tmp_path))
+    assert summary["resumed_from"] == 0
+    assert open_analysis_index(video, index_dir=str(tmp_path)).grid_size == (2, 2)
+
+
+def test_upload_copy_shares_index(video, tmp_path):
+    _build(video, tmp_path / "index")
+
+    # 대시보드 업로드는 내용 sha256 이름으로 temp에 저장됨
+    with open(video, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    upload = tmp_path / "temp" / f"{digest}.mp4"
+    upload.parent.mkdir()
+    shutil.copyfile(video, upload)
+
+    index = open_analysis_index(str(upload), index_dir=str(tmp_path / "index"))
+    assert index is not None and index.complete
+
+
+def test_replaced_video_does_not_reuse_index(video, tmp_path):
+    _build(video, tmp_path / "index")
+
+    # 같은 이름, 다른 내용
+    replaced = tmp_path / "clip.mp4"
+    create_sample_video(str(replaced), fps=10, width=320, height=240, people=6, seed=2,
+                        total_frames=FRAMES, verbose=False)
+    assert open_analysis_index(str(replaced), index_dir=str(tmp_path / "index")) is None
+
+
+def test_session_index_reloads_after_rebuild(video, tmp_path):
+    class State:
+        pass
+
+    state = State()
+    assert get_analysis_index(state, video, index_dir=str(tmp_path)) is None
+
+    _build(video, tmp_path)
+    first = get_analysis_index(state, video, index_dir=str(tmp_path))
+    assert first is not None and first.complete
+    assert get_analysis_index(state, video, index_dir=str(tmp_path)) is first
@@ -0,0 +1,81 @@
+"""
+DetectionCache 테스트 (LRU 용량 제한, 종료 시 커밋, 이전 형식 캐시 폐기, 임계값 필터)
+"""
+import sqlite3
+
+import numpy as np
+
+from modules.detection_cache import DetectionCache, filter_detections
+
+
+def _detections(count, seed=0):
+    rng = np.random.default_rng(seed)
+    boxes = rng.uniform(0, 500, (count, 4)).astype(np.float32)
+    confidences = rng.uniform(0.1, 1.0, count).astype(np.float32)
+    return boxes, confidences
+
+
+def test_roundtrip(tmp_path):
+    cache = DetectionCache(str(tmp_path / "c.sqlite"))
+    boxes, confidences = _detections(5)
+    cache.put("video", 3, "model", boxes, confidences)
+
+    cached_boxes, cached_confidences = cache.get("video", 3, "model")
+    assert np.array_equal(cached_boxes, boxes)
+    assert np.array_equal(cached_confidences, confidences)
+    assert cache.get("video", 4, "model") is None
+    assert cache.get("video", 3, "other") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.close()
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DetectionCache(str(tmp_path / "c.sqlite"), commit_every=1, max_rows=3)
+    for frame in range(3):
+        cache.put("video", frame, "model", *_detections(2, frame))
+    # 0번 프레임을 조회하면 가장 오래 사용하지 않은 행은 1번이 됨
+    assert cache.get("video", 0, "model") is not None
+
+    cache.put("video", 3, "model", *_detections(2, 3))
+    assert cache.evicted == 1
+    assert cache.get("video", 1, "model") is None
+    for frame in (0, 2, 3):
+        assert cache.get("video", frame, "model") is not None
+    cache.close()
+
+
+def test_close_commits_pending_rows(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    cache = DetectionCache(path, commit_every=100)
+    cache.put("video", 0, "model", *_detections(3))
+    cache.close()
+    cache.close()
+
+    reopened = DetectionCache(path)
+    assert reopened.get("video", 0, "model") is not None
+    reopened.close()
+
+
+def test_drops_cache_with_old_schema(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE detections (video TEXT, frame INTEGER, model TEXT, tracking INTEGER,"
+        " boxes BLOB, confidences BLOB, track_ids BLOB)"
+    )
+    conn.execute("INSERT INTO detections VALUES ('video', 0, 'model', 1, x'', x'', x'')")
+    conn.commit()
+    conn.close()
+
+    cache = DetectionCache(path)
+    assert cache.get("video", 0, "model") is None
+    cache.put("video", 0, "model", *_detections(1))
+    assert cache.get("video", 0, "model") is not None
+    cache.close()
+
+
+def test_filter_detections():
+    boxes, confidences = _detections(20)
+    kept_boxes, kept_confidences = filter_detections((boxes, confidences), 0.5)
+    assert np.all(kept_confidences >= 0.5)
+    assert np.array_equal(kept_boxes, boxes[confidences >= 0.5])
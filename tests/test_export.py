@@ -0,0 +1,74 @@
+"""
+내보낸 모델 경로 결정 테스트 (일치 검사 통과 시에만 사용, 저장된 검사 결과 재사용, 실패 시 PyTorch)
+"""
+import functools
+import os
+
+import pytest
+
+from modules import export
+
+
+@pytest.fixture
+def models(tmp_path, monkeypatch):
+    """원본 .pt, 이미 내보낸 .onnx, 일치 검사 호출 기록"""
+    reference = tmp_path / "model.pt"
+    reference.write_bytes(b"pt")
+    candidate = tmp_path / "model.onnx"
+    candidate.write_bytes(b"onnx")
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"")
+
+    calls = []
+    report = {"frames": 8, "max_count_diff": 0, "mean_iou": 0.95, "passed": True}
+
+    def fake_check_parity(reference_path, candidate_path, frames, **kwargs):
+        calls.append((reference_path, candidate_path))
+        return dict(report)
+
+    monkeypatch.setattr(export, "check_parity", fake_check_parity)
+    monkeypatch.setattr(export, "sample_frames", lambda video_path: [])
+    monkeypatch.setattr(export, "verify_export", functools.partial(export.verify_export, video_path=str(video)))
+    return str(reference), str(candidate), calls, report
+
+
+def test_uses_export_after_parity_check(models):
+    reference, candidate, calls, _ = models
+    assert export.resolve_model_path(reference, "onnx") == candidate
+    assert calls == [(reference, candidate)]
+    assert os.path.exists(export.parity_report_path(candidate))
+
+    # 저장된 검사 결과를 재사용
+    assert export.resolve_model_path(reference, "onnx") == candidate
+    assert len(calls) == 1
+
+
+def test_falls_back_to_torch_on_failure(models):
+    reference, candidate, calls, report = models
+    report["mean_iou"] = 0.5
+    assert export.resolve_model_path(reference, "onnx") == reference
+    assert export.resolve_model_path(reference, "onnx") == reference
+    assert len(calls) == 1
+
+
+def test_rechecks_when_export_changes(models):
+    reference, candidate, calls, _ = models
+    export.resolve_model_path(reference, "onnx")
+    with open(candidate, "wb") as f:
+        f.write(b"re-exported")
+    assert export.resolve_model_path(reference, "onnx") == candidate
+    assert len(calls) == 2
+
+
+def test_falls_back_without_sample_video(models, monkeypatch):
+    reference, _, calls, _ = models
+    monkeypatch.setattr(export, "verify_export", functools.partial(export.verify_export, video_path="missing.mp4"))
+    assert export.resolve_model_path(reference, "onnx") == reference
+    assert calls == []
+
+
+def test_passes_through_torch_and_exported_paths(models):
+    reference, candidate, calls, _ = models
+    assert export.resolve_model_path(reference, "torch") == reference
+    assert export.resolve_model_path(candidate, "onnx") == candidate
+    assert calls == []
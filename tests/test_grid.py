@@ -0,0 +1,64 @@
+"""
+GridLayout과 count_people_in_grid(구역 좌표 기반) 결과 일치 테스트
+"""
+import numpy as np
+import pytest
+
+from utils.grid import GridLayout, compute_grid_regions, count_people_in_grid
+
+# 부동소수점 오차로 경계가 어긋나기 쉬운 해상도/그리드 조합 포함
+WIDTHS = (480, 640, 1280, 1920, 3840)
+HEIGHTS = (360, 480, 720, 1080, 2160)
+GRID_SIZES = [(rows, cols) for rows in (1, 3, 7, 11) for cols in (1, 3, 11, 13, 22, 26)]
+
+
+def _reference_counts(boxes, grid_regions):
+    """구역마다 중심점 포함 여부를 확인하는 원래 구현"""
+    grid_counts = [0] * len(grid_regions)
+    for x1, y1, x2, y2 in boxes:
+        center_x = (x1 + x2) / 2
+        center_y = (y1 + y2) / 2
+        for idx, (gx1, gy1, gx2, gy2) in enumerate(grid_regions):
+            if gx1 <= center_x < gx2 and gy1 <= center_y < gy2:
+                grid_counts[idx] += 1
+                break
+    return grid_counts
+
+
+@pytest.mark.parametrize("width, height", list(zip(WIDTHS, HEIGHTS)))
+@pytest.mark.parametrize("grid_size", GRID_SIZES)
+def test_layout_edges_match_regions(width, height, grid_size):
+    layout = GridLayout(height, width, *grid_size)
+    regions = np.array(compute_grid_regions((height, width), grid_size))
+    rows, cols = grid_size
+
+    # 조회 테이블로 구한 픽셀별 셀이 구역 좌표와 같아야 함
+    for idx, (x1, y1, x2, y2) in enumerate(regions):
+        assert np.all(layout.col_lookup[x1:x2] == idx % cols)
+        assert np.all(layout.row_lookup[y1:y2] == idx // cols)
+    assert np.all(layout.col_lookup[regions[:, 2].max():] == -1)
+    assert np.all(layout.row_lookup[regions[:, 3].max():] == -1)
+
+
+@pytest.mark.parametrize("width, height", list(zip(WIDTHS, HEIGHTS)))
+@pytest.mark.parametrize("grid_size", GRID_SIZES)
+def test_count_people_matches_regions(width, height, grid_size):
+    rng = np.random.default_rng(width * 1000 + grid_size[0] * 100 + grid_size[1])
+    layout = GridLayout(height, width, *grid_size)
+
+    # 무작위 박스 + 경계/프레임 끝 근처에 중심이 오는 박스
+    x1 = rng.uniform(-20, width + 20, 200)
+    y1 = rng.uniform(-20, height + 20, 200)
+    boxes = np.stack([x1, y1, x1 + rng.uniform(0, 60, 200), y1 + rng.uniform(0, 120, 200)], axis=1)
+    edge_x = np.concatenate([layout.x_edges, layout.x_edges - 0.5, [width - 0.5, width - 1]])
+    edge_y = np.concatenate([layout.y_edges, layout.y_edges - 0.5, [height - 0.5, height - 1]])
+    cx, cy = np.meshgrid(edge_x, edge_y)
+    centers = np.stack([cx.ravel(), cy.ravel(), cx.ravel(), cy.ravel()], axis=1)
+    boxes = np.concatenate([boxes, centers])
+
+    expected = _reference_counts(boxes.tolist(), layout.regions)
+    assert layout.count_people(boxes) == expected
+    assert count_people_in_grid(boxes, layout.regions) == expected
+
+    int_boxes = boxes.round().astype(np.int64)
+    assert layout.count_people(int_boxes) == _reference_counts(int_boxes.tolist(), layout.regions)
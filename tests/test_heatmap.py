@@ -0,0 +1,26 @@
+"""
+HeatmapRenderer와 create_heatmap(구역 좌표 기반) 결과 일치 테스트
+"""
+import numpy as np
+import pytest
+
+from utils.grid import get_grid_layout
+from utils.heatmap import HeatmapRenderer, create_heatmap
+
+RESOLUTIONS = ((480, 360), (640, 480), (1280, 720), (1920, 1080), (3840, 2160))
+GRID_SIZES = ((3, 3), (4, 6), (11, 11), (13, 22), (22, 22), (26, 13))
+
+
+@pytest.mark.parametrize("width, height", RESOLUTIONS)
+@pytest.mark.parametrize("grid_size", GRID_SIZES)
+def test_renderer_matches_create_heatmap(width, height, grid_size):
+    rng = np.random.default_rng(width + grid_size[0] * 31 + grid_size[1])
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    layout = get_grid_layout(frame.shape, grid_size)
+    renderer = HeatmapRenderer()
+
+    for grid_counts in (rng.integers(0, 8, len(layout.regions)).tolist(),
+                        [0] * len(layout.regions)):
+        expected = create_heatmap(frame, grid_counts, layout.regions, grid_size)
+        actual = renderer.render(frame, grid_counts, layout)
+        assert np.array_equal(actual, expected)
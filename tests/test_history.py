@@ -0,0 +1,99 @@
+"""
+HistoryBuffer 링 버퍼 테스트 (한 바퀴 넘게 추가, tail, 디스크로 내보낸 기록 포함 CSV 저장, 파일 정리)
+"""
+import csv
+import gc
+import os
+
+import numpy as np
+import pytest
+
+from config import RISK_LEVELS
+from utils.history import HISTORY_FIELDS, RISK_CODES, HistoryBuffer
+
+CAPACITIES = (1, 3, 8)
+SPILL_CHUNKS = (1, 2, 8)
+
+
+def _records(count, seed=0):
+    rng = np.random.default_rng(seed)
+    levels = list(RISK_LEVELS)
+    return [{
+        "time": f"12:{i // 60 % 60:02d}:{i % 60:02d}",
+        "count": int(rng.integers(0, 200)),
+        "cdi": float(rng.random()),
+        "risk": levels[int(rng.integers(0, len(levels)))]
+    } for i in range(count)]
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    return rows[0], [{"time": t, "count": int(c), "cdi": float(d), "risk": r} for t, c, d, r in rows[1:]]
+
+
+@pytest.mark.parametrize("capacity", CAPACITIES)
+@pytest.mark.parametrize("spill_chunk", SPILL_CHUNKS)
+@pytest.mark.parametrize("count", (0, 1, 7, 8, 9, 30))
+def test_tail_matches_recent_records(tmp_path, capacity, spill_chunk, count):
+    buffer = HistoryBuffer(capacity, spill_chunk, str(tmp_path))
+    records = _records(count)
+    buffer.extend(records)
+    assert len(buffer) == count
+
+    for n in range(capacity + 2):
+        tail = buffer.tail(n)
+        expected = records[max(0, count - min(n, capacity)):]
+        assert tail["time"].tolist() == [r["time"] for r in expected]
+        assert tail["count"].tolist() == [r["count"] for r in expected]
+        assert tail["cdi"].tolist() == [r["cdi"] for r in expected]
+        assert tail["risk_code"].tolist() == [RISK_CODES[r["risk"]] for r in expected]
+
+
+@pytest.mark.parametrize("capacity", CAPACITIES)
+@pytest.mark.parametrize("spill_chunk", SPILL_CHUNKS)
+def test_export_csv_includes_spilled_records(tmp_path, capacity, spill_chunk):
+    buffer = HistoryBuffer(capacity, spill_chunk, str(tmp_path / "spill"))
+    records = _records(5 * capacity + 3, seed=capacity)
+    for written, record in enumerate(records, 1):
+        buffer.append(record)
+        # 메모리에 남은 기록은 용량을 넘지 않고, 나머지는 모두 디스크에 있음
+        assert written - buffer.spilled <= capacity
+
+    path = str(tmp_path / "export.csv")
+    assert buffer.export_csv(path) == len(records)
+    header, rows = _read_csv(path)
+    assert header == HISTORY_FIELDS
+    assert rows == records
+    buffer.clear()
+
+
+def test_clear_removes_spill_file(tmp_path):
+    buffer = HistoryBuffer(2, 1, str(tmp_path))
+    buffer.extend(_records(6))
+    spill_path = buffer.spill_path
+    assert spill_path is not None and os.path.exists(spill_path)
+
+    buffer.clear()
+    assert not os.path.exists(spill_path)
+    assert len(buffer) == 0
+    assert buffer.tail(2)["count"].tolist() == []
+
+    # 비운 뒤에도 새 기록만 저장
+    records = _records(3, seed=1)
+    buffer.extend(records)
+    path = str(tmp_path / "export.csv")
+    buffer.export_csv(path)
+    assert _read_csv(path)[1] == records
+    buffer.clear()
+
+
+def test_del_removes_spill_file(tmp_path):
+    buffer = HistoryBuffer(2, 1, str(tmp_path))
+    buffer.extend(_records(6))
+    spill_path = buffer.spill_path
+    assert os.path.exists(spill_path)
+
+    del buffer
+    gc.collect()
+    assert not os.path.exists(spill_path)
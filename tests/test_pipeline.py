@@ -0,0 +1,63 @@
+"""
+FramePipeline 정적 장면 추론 생략 테스트 (직전 결과 재사용, 생략 비율, 탐색 시 초기화)
+"""
+import numpy as np
+
+from modules.pipeline import FramePipeline
+
+SETTINGS = {"grid_size": (3, 3), "conf_threshold": 0.3, "motion_gate": True}
+
+
+class _StubDetector:
+    """프레임마다 같은 박스를 반환하며 호출 횟수를 세는 검출기"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def set_stride_mode(self, enabled):
+        pass
+
+    def update_stride(self, cdi):
+        pass
+
+    def detect_people(self, frame, conf_threshold=0.25, frame_ref=None):
+        self.calls += 1
+        boxes = np.array([[10, 10, 50, 90]], dtype=np.int64)
+        return boxes, np.array([1]), np.array([0.9], dtype=np.float32), 1
+
+
+def _frame(value):
+    return np.full((120, 160, 3), value, dtype=np.uint8)
+
+
+def test_reuses_result_on_static_frames():
+    detector = _StubDetector()
+    pipeline = FramePipeline(detector)
+
+    first = pipeline.process(_frame(0), SETTINGS)
+    assert not first["inference_skipped"]
+    for _ in range(3):
+        result = pipeline.process(_frame(0), SETTINGS)
+        assert result["inference_skipped"]
+    assert detector.calls == 1
+    assert result["skipped_inferences"] == 3
+    assert result["skip_ratio"] == 1.0
+
+    # 장면이 바뀌면 다시 추론
+    result = pipeline.process(_frame(200), SETTINGS)
+    assert not result["inference_skipped"]
+    assert detector.calls == 2
+    assert result["skip_ratio"] == 3 / 4
+
+
+def test_reset_forces_inference():
+    detector = _StubDetector()
+    pipeline = FramePipeline(detector)
+    pipeline.process(_frame(0), SETTINGS)
+
+    # 탐색/영상 변경 후에는 같은 장면이어도 직전 결과를 재사용하지 않음
+    pipeline.reset()
+    assert pipeline.last_result is None
+    result = pipeline.process(_frame(0), SETTINGS)
+    assert not result["inference_skipped"]
+    assert detector.calls == 2
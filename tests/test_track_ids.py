@@ -0,0 +1,92 @@
+"""
+세션별 트랙 ID 테스트 (트래커 공유 ID 카운터가 초기화되어도 세션 안에서 ID가 겹치지 않음)
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from modules import detector as detector_module
+from modules.detector import CrowdDetector
+
+
+class _StubTrack:
+    """ultralytics BaseTrack처럼 모든 트래커가 공유하는 카운터로 ID를 발급하는 트랙"""
+
+    _count = 0
+
+    def __init__(self):
+        _StubTrack._count += 1
+        self.track_id = _StubTrack._count
+        self.is_activated = True
+
+
+class _StubTracker:
+    """
+    BYTETracker와 같은 방식의 트래커
+
+    생성 시 공유 카운터를 0으로 되돌리고, update()는 활성화된 tracked_stracks 순서대로
+    [x1, y1, x2, y2, track_id, conf, cls, idx] 행을 반환한다. 검출은 사람 이름 목록으로 받는다.
+    """
+
+    def __init__(self, expose_tracks=True):
+        _StubTrack._count = 0
+        self.expose_tracks = expose_tracks
+        self.tracks = {}
+        self.tracked_stracks = []
+
+    def update(self, people, img):
+        for person in people:
+            if person not in self.tracks:
+                self.tracks[person] = _StubTrack()
+        self.tracked_stracks = [self.tracks[person] for person in people]
+        if not self.expose_tracks:
+            del self.tracked_stracks
+        return np.array([[0, 0, 10, 10, self.tracks[person].track_id, 0.9, 0, i]
+                         for i, person in enumerate(people)], dtype=np.float32).reshape(-1, 8)
+
+
+@pytest.fixture
+def make_detector(monkeypatch):
+    shared = SimpleNamespace(model=None, load_seconds=0.0)
+    monkeypatch.setattr(detector_module, "get_shared_model", lambda path: shared)
+
+    def make(tracker):
+        detector = CrowdDetector("stub.pt", backend=None)
+        detector.trackers = [tracker]
+        return detector
+
+    return make
+
+
+def _ids(detector, people):
+    frame = np.zeros((20, 20, 3), dtype=np.uint8)
+    return dict(zip(people, detector._track(people, frame)[1].tolist()))
+
+
+def test_ids_stay_unique_when_another_tracker_resets_counter(make_detector):
+    a = make_detector(_StubTracker())
+    first = _ids(a, ["kim", "lee"])
+
+    # 다른 세션이 트래커를 만들면 공유 카운터가 0으로 돌아감
+    b = make_detector(_StubTracker())
+    assert _ids(b, ["park"]) == {"park": 1}
+
+    # a의 트래커가 새로 발급한 트래커 ID는 lee와 같지만 세션 ID는 겹치지 않음
+    second = _ids(a, ["kim", "lee", "choi"])
+    assert a.trackers[0].tracks["choi"].track_id == a.trackers[0].tracks["lee"].track_id
+    assert second["kim"] == first["kim"]
+    assert second["lee"] == first["lee"]
+    assert len(set(second.values())) == 3
+
+
+def test_tracker_without_track_objects_maps_tracker_ids(make_detector):
+    detector = make_detector(_StubTracker(expose_tracks=False))
+    first = _ids(detector, ["kim", "lee"])
+    assert _ids(detector, ["lee", "kim"]) == first
+
+    # 트래커를 새로 만들어도 이전 트래커의 세션 ID를 다시 쓰지 않음
+    detector.reset_tracking()
+    detector.trackers = [_StubTracker(expose_tracks=False)]
+    second = _ids(detector, ["kim", "lee"])
+    assert not set(second.values()) & set(first.values())
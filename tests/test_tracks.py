@@ -0,0 +1,111 @@
+"""
+TrackTable 스무딩/속도 계산 테스트 (ID별 deque 평균 방식과 일치, 제거, 용량 초과)
+"""
+from collections import deque
+
+import numpy as np
+import pytest
+
+from modules.tracks import TrackTable
+
+
+class _DequeSmoother:
+    """ID별 deque(maxlen=window)에 박스를 쌓고 평균을 내던 원래 구현"""
+
+    def __init__(self, window):
+        self.window = window
+        self.history = {}
+        self.last_seen = {}
+
+    def update(self, track_ids, boxes, frame_no):
+        smoothed, velocities = [], []
+        for track_id, box in zip(track_ids, boxes):
+            history = self.history.setdefault(int(track_id), deque(maxlen=self.window))
+            velocity = np.zeros(4, dtype=np.float32)
+            if history:
+                gap = max(1, frame_no - self.last_seen.get(int(track_id), frame_no - 1))
+                velocity = (np.array(box, dtype=np.float32) - history[-1]) / gap
+            self.last_seen[int(track_id)] = frame_no
+            history.append(tuple(box))
+            smoothed.append(np.mean(history, axis=0).astype(int))
+            velocities.append(velocity)
+        return np.array(smoothed).reshape(-1, 4), np.array(velocities).reshape(-1, 4)
+
+
+def _random_frames(rng, frames, max_id, per_frame):
+    """프레임마다 일부 ID가 사라졌다가 다시 나타나는 정수 박스 시퀀스"""
+    for frame_no in range(1, frames + 1):
+        count = int(rng.integers(0, per_frame + 1))
+        track_ids = rng.choice(max_id, size=count, replace=False)
+        x1 = rng.integers(0, 1800, count)
+        y1 = rng.integers(0, 1000, count)
+        boxes = np.stack([x1, y1, x1 + rng.integers(10, 120, count), y1 + rng.integers(20, 240, count)], axis=1)
+        yield frame_no, track_ids, boxes
+
+
+@pytest.mark.parametrize("window", (1, 2, 5, 8))
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_deque_smoothing(window, seed):
+    rng = np.random.default_rng(seed)
+    # 제거가 일어나지 않도록 충분한 용량과 max_missed
+    table = TrackTable(capacity=64, window=window, max_missed=1000)
+    reference = _DequeSmoother(window)
+
+    for frame_no, track_ids, boxes in _random_frames(rng, 60, 40, 25):
+        smoothed, velocities = table.update(track_ids, boxes, frame_no)
+        expected_smoothed, expected_velocities = reference.update(track_ids, boxes, frame_no)
+        assert np.array_equal(smoothed, expected_smoothed)
+        np.testing.assert_allclose(velocities, expected_velocities, rtol=1e-6)
+
+
+def test_evicts_stale_tracks():
+    table = TrackTable(capacity=8, window=3, max_missed=2)
+    table.update([1, 2], [[0, 0, 10, 10], [20, 20, 30, 30]], frame_no=1)
+    table.update([1], [[2, 2, 12, 12]], frame_no=3)
+    assert len(table) == 2
+
+    # ID 2는 max_missed(2) 프레임보다 오래 보이지 않음
+    table.update([1], [[4, 4, 14, 14]], frame_no=4)
+    assert len(table) == 1
+    assert 2 not in table._slot_of
+
+    # 다시 나타나면 새 트랙으로 시작 (이전 박스와 섞이지 않고 속도 0)
+    smoothed, velocities = table.update([2], [[50, 50, 60, 60]], frame_no=5)
+    assert smoothed.tolist() == [[50, 50, 60, 60]]
+    assert velocities.tolist() == [[0, 0, 0, 0]]
+
+
+def test_full_table_evicts_least_recently_seen():
+    table = TrackTable(capacity=3, window=2, max_missed=100)
+    table.update([1], [[0, 0, 10, 10]], frame_no=1)
+    table.update([2], [[0, 0, 10, 10]], frame_no=2)
+    table.update([3], [[0, 0, 10, 10]], frame_no=3)
+
+    # 빈 슬롯이 없으면 이번 프레임에 보이지 않은 트랙 중 가장 오래된 ID 1을 내보냄
+    table.update([3, 4], [[0, 0, 10, 10], [5, 5, 15, 15]], frame_no=4)
+    assert sorted(table._slot_of) == [2, 3, 4]
+
+
+@pytest.mark.parametrize("capacity", (1, 4, 16))
+def test_overflow_passes_raw_boxes(capacity):
+    rng = np.random.default_rng(capacity)
+    table = TrackTable(capacity=capacity, window=3, max_missed=100)
+    count = capacity * 3
+    track_ids = np.arange(count)
+    boxes = rng.integers(0, 500, (count, 4))
+
+    # 용량을 넘어도 예외 없이 모든 박스를 반환
+    smoothed, velocities = table.update(track_ids, boxes, frame_no=1)
+    assert smoothed.shape == (count, 4)
+    assert np.array_equal(smoothed, boxes)
+    assert len(table) == capacity
+
+    # 슬롯을 받은 ID는 계속 스무딩되고, 나머지는 원본 박스 그대로
+    moved = boxes + 4
+    smoothed, velocities = table.update(track_ids, moved, frame_no=2)
+    tracked = np.isin(track_ids, list(table._slot_of))
+    assert tracked.sum() == capacity
+    assert np.array_equal(smoothed[tracked], ((boxes[tracked] + moved[tracked]) / 2).astype(np.int64))
+    assert np.all(velocities[tracked] == 4)
+    assert np.array_equal(smoothed[~tracked], moved[~tracked])
+    assert np.all(velocities[~tracked] == 0)
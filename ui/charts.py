@@ -4,23 +4,23 @@
 import altair as alt
 import pandas as pd
 import streamlit as st
+from config import CHART_HISTORY_POINTS, CHART_COLORS, INDEX_TIMELINE_POINTS
 
-def render_person_count_chart(data_history):
+def render_person_count_chart(history, points=CHART_HISTORY_POINTS):
     """
     시간별 인원수 추이 차트 (Line Chart)
     
     Args:
-        data_history: [{'time': 'HH:MM:SS', 'count': 10, 'cdi': 0.5}, ...]
+        history: HistoryBuffer (세션 분석 기록)
+        points: 표시할 최근 기록 수
     """
-    if not data_history:
+    if not len(history):
         st.info("데이터 수집 중...")
         return
 
-    df = pd.DataFrame(data_history)
-    
-    # 최근 30개 데이터만 표시
-    if len(df) > 30:
-        df = df.tail(30)
+    # 최근 기록만 링 버퍼 뷰로 꺼내서 차트용 데이터프레임 구성
+    recent = history.tail(points)
+    df = pd.DataFrame({'time': recent['time'], 'count': recent['count'], 'cdi': recent['cdi']})
         
     chart = alt.Chart(df).mark_line(point=True).encode(
         x=alt.X('time', title='시간', axis=alt.Axis(labels=False)), # 라벨 너무 많으면 지저분하므로 숨김
@@ -38,6 +38,35 @@ def render_person_count_chart(data_history):
     
     st.altair_chart(chart, use_container_width=True)
 
+def render_risk_timeline(index, current_frame, max_points=INDEX_TIMELINE_POINTS):
+    """
+    분석 색인 기반 전체 영상 위험도 타임라인 (구간별 최대 CDI)
+    
+    Args:
+        index: AnalysisIndex
+        current_frame: 현재 프레임 (세로선으로 표시)
+        max_points: 최대 점 수
+    """
+    frames, peaks = index.timeline(max_points)
+    df = pd.DataFrame({'frame': frames, 'cdi': peaks}).dropna()
+    if df.empty:
+        st.info("색인된 프레임이 없습니다.")
+        return
+    
+    line = alt.Chart(df).mark_area(opacity=0.6, color=CHART_COLORS[2]).encode(
+        x=alt.X('frame', title='프레임'),
+        y=alt.Y('cdi', title='최대 CDI', scale=alt.Scale(domain=[0, 1])),
+        tooltip=['frame', 'cdi']
+    )
+    cursor = alt.Chart(pd.DataFrame({'frame': [current_frame]})).mark_rule(color='white').encode(x='frame')
+    
+    chart = (line + cursor).properties(
+        height=120,
+        title="전체 영상 위험도 타임라인"
+    )
+    
+    st.altair_chart(chart, use_container_width=True)
+
 def render_risk_gauge(cdi):
     """
     위험도 게이지 차트 (Altair로 도넛 차트 흉내)
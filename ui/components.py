@@ -24,6 +24,17 @@ def render_sidebar():
             step=0.05,
             help="값이 높을수록 확실한 사람만 검출합니다."
         )
+        adaptive_stride = st.toggle(
+            "적응형 검출 간격",
+            value=False,
+            help="한산할 때는 여러 프레임마다 한 번만 검출하고, 사이 프레임은 추적 속도로 박스를 이동합니다."
+        )
+        
+        motion_gate = st.toggle(
+            "정적 장면 추론 생략",
+            value=False,
+            help="화면 변화가 거의 없으면 검출을 건너뛰고 직전 분석 결과를 재사용합니다."
+        )
         
         st.subheader("분석 설정")
         grid_option = st.selectbox(
@@ -53,6 +64,8 @@ def render_sidebar():
         
         return {
             "conf_threshold": conf_threshold,
+            "adaptive_stride": adaptive_stride,
+            "motion_gate": motion_gate,
             "grid_size": grid_size,
             "enable_alert": enable_alert,
             "alert_sound": alert_sound
@@ -101,3 +114,26 @@ def render_dashboard_metrics(person_count, cdi, risk_info):
         st.markdown('<p class="metric-label">위험도 레벨</p>', unsafe_allow_html=True)
         st.markdown(f'<p class="metric-value" style="color: {risk_color};">{risk_info["label"]}</p>', unsafe_allow_html=True)
         st.markdown('</div>', unsafe_allow_html=True)
+
+def render_profiler_panel(profiler):
+    """
+    단계별 지연 시간 패널 (접힌 상태로 표시)
+    
+    Args:
+        profiler: StageProfiler
+    """
+    if not profiler.enabled:
+        return
+    
+    with st.expander("⏱️ 단계별 지연 시간 (ms)", expanded=False):
+        stats = profiler.summary()
+        if not stats:
+            st.caption("측정값이 없습니다.")
+            return
+        
+        rows = [
+            {"단계": stage, "횟수": s["count"], "평균": round(s["mean"], 2),
+             "p50": round(s["p50"], 2), "p95": round(s["p95"], 2), "p99": round(s["p99"], 2)}
+            for stage, s in stats.items()
+        ]
+        st.dataframe(rows, hide_index=True, use_container_width=True)
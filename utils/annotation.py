@@ -0,0 +1,97 @@
+"""
+프레임 시각화(주석) 유틸리티 모듈
+- 박스, 라벨, 그리드 선, 히트맵을 세션별 버퍼 하나에 그려서 표시용 RGB로 변환
+"""
+import cv2
+import numpy as np
+
+from utils.heatmap import HeatmapRenderer
+from utils.profiler import StageProfiler
+
+# 박스/라벨 색상 (BGR)
+BOX_COLOR = (0, 255, 0)
+
+
+class FrameAnnotator:
+    """
+    분석 결과를 미리 할당한 버퍼 하나에 그리는 시각화 단계
+
+    원본 프레임을 버퍼에 한 번 복사한 뒤 박스 → 그리드 선 → 히트맵 순으로 모두
+    제자리에서 그리고, 표시용 RGB 변환도 재사용 버퍼에 수행한다.
+    표시할 프레임에만 호출하면 되므로 검출 단계는 데이터만 반환한다.
+    """
+
+    def __init__(self, profiler=None):
+        """
+        초기화
+
+        Args:
+            profiler: 단계별 지연 시간을 기록할 StageProfiler (None이면 측정 안 함)
+        """
+        self.heatmap_renderer = HeatmapRenderer()
+        self.profiler = profiler if profiler is not None else StageProfiler(enabled=False)
+        self._buffer = None
+        self._rgb = None
+
+    def _ensure_buffers(self, shape):
+        """프레임 크기가 바뀌었을 때만 버퍼 재할당"""
+        if self._buffer is None or self._buffer.shape != shape:
+            self._buffer = np.empty(shape, dtype=np.uint8)
+            self._rgb = np.empty(shape, dtype=np.uint8)
+
+    def annotate(self, frame, boxes, track_ids, layout, grid_counts):
+        """
+        프레임에 박스, 그리드, 히트맵을 그림
+
+        Args:
+            frame: 원본 프레임 (BGR, 수정되지 않음)
+            boxes: (N, 4) 검출 박스 배열
+            track_ids: (N,) 트래킹 ID 배열 (ID가 없으면 -1)
+            layout: 프레임에 맞는 GridLayout
+            grid_counts: 각 그리드 구역의 사람 수 리스트
+
+        Returns:
+            annotated: 시각화된 프레임 (BGR, 다음 호출 시 덮어써짐)
+        """
+        self._ensure_buffers(frame.shape)
+        buffer = self._buffer
+        np.copyto(buffer, frame)
+
+        # 1. 박스 및 라벨
+        with self.profiler.span("draw_boxes"):
+            for (x1, y1, x2, y2), track_id in zip(np.asarray(boxes).tolist(), np.asarray(track_ids).tolist()):
+                cv2.rectangle(buffer, (x1, y1), (x2, y2), BOX_COLOR, 2)
+
+                label = "Person"
+                if track_id >= 0:
+                    label += f" ID:{track_id}"
+
+                cv2.putText(buffer, label, (x1, y1 - 10),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, BOX_COLOR, 2)
+
+        # 2. 그리드 선
+        with self.profiler.span("grid_lines"):
+            layout.draw(buffer)
+
+        # 3. 히트맵 (같은 버퍼에 블렌딩)
+        with self.profiler.span("heatmap"):
+            self.heatmap_renderer.render(buffer, grid_counts, layout, out=buffer)
+
+        return buffer
+
+    def render_rgb(self, result):
+        """
+        분석 결과를 표시용 RGB 프레임으로 렌더링
+
+        Args:
+            result: FramePipeline.process()의 반환값
+
+        Returns:
+            frame_rgb: 표시용 RGB 프레임 (다음 호출 시 덮어써짐)
+        """
+        annotated = self.annotate(
+            result["frame"], result["boxes"], result["track_ids"],
+            result["grid_layout"], result["grid_counts"]
+        )
+        with self.profiler.span("cvt_color"):
+            return cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB, dst=self._rgb)
@@ -4,8 +4,13 @@
 """
 import cv2
 import numpy as np
+from functools import lru_cache
 from config import DEFAULT_GRID_SIZE
 
+# 그리드 선 색상 / 두께
+GRID_LINE_COLOR = (255, 255, 255)
+GRID_LINE_THICKNESS = 2
+
 def create_grid(frame, grid_size=DEFAULT_GRID_SIZE):
     """
     프레임을 그리드로 나누고 각 구역의 좌표를 반환
@@ -21,20 +26,28 @@ def create_grid(frame, grid_size=DEFAULT_GRID_SIZE):
     if frame is None:
         return [], None
         
-    h, w = frame.shape[:2]
-    rows, cols = grid_size
+    layout = get_grid_layout(frame.shape[:2], grid_size)
     
-    grid_regions = []
     frame_with_grid = frame.copy()
+    layout.draw(frame_with_grid)
     
-    # 그리드 선 그리기
-    for i in range(1, rows):
-        y = int(h * i / rows)
-        cv2.line(frame_with_grid, (0, y), (w, y), (255, 255, 255), 2)
+    return layout.regions, frame_with_grid
+
+def compute_grid_regions(frame_shape, grid_size=DEFAULT_GRID_SIZE):
+    """
+    프레임 크기만으로 그리드 구역 좌표 계산 (그리기 없음)
     
-    for j in range(1, cols):
-        x = int(w * j / cols)
-        cv2.line(frame_with_grid, (x, 0), (x, h), (255, 255, 255), 2)
+    Args:
+        frame_shape: 프레임 shape (h, w[, c])
+        grid_size: 그리드 크기 (rows, cols)
+    
+    Returns:
+        grid_regions: 각 그리드 구역의 좌표 리스트 [(x1, y1, x2, y2), ...]
+    """
+    h, w = frame_shape[:2]
+    rows, cols = grid_size
+    
+    grid_regions = []
     
     # 각 그리드 구역의 좌표 계산
     cell_h = h / rows
@@ -48,7 +61,129 @@ def create_grid(frame, grid_size=DEFAULT_GRID_SIZE):
             y2 = int((i + 1) * cell_h)
             grid_regions.append((x1, y1, x2, y2))
     
-    return grid_regions, frame_with_grid
+    return grid_regions
+
+class GridLayout:
+    """
+    프레임 크기와 그리드 크기가 같으면 재사용하는 그리드 배치 정보
+    
+    구역 좌표, 픽셀 → 셀 인덱스 조회 테이블, 그리드 선 픽셀 위치를 미리 계산해
+    두고 매 프레임에는 조회와 제자리(in-place) 덮어쓰기만 수행한다.
+    """
+    
+    def __init__(self, height, width, rows, cols):
+        """
+        초기화
+        
+        Args:
+            height: 프레임 높이
+            width: 프레임 너비
+            rows: 그리드 행 수
+            cols: 그리드 열 수
+        """
+        self.height = height
+        self.width = width
+        self.grid_size = (rows, cols)
+        
+        self.regions = compute_grid_regions((height, width), (rows, cols))
+        
+        # 열/행 경계 (구역 범위: x1 <= x < x2)
+        # count_people_in_grid(boxes, regions)와 결과가 같도록 구역 좌표에서 그대로 가져옴
+        # (부동소수점 오차로 마지막 경계가 width보다 1 작을 수 있음)
+        self.x_edges = np.array([x1 for x1, _, _, _ in self.regions[:cols]] + [self.regions[cols - 1][2]])
+        self.y_edges = np.array([y1 for _, y1, _, _ in self.regions[::cols]] + [self.regions[-1][3]])
+        
+        # 픽셀 좌표 → 열/행 인덱스 조회 테이블 (어느 구역에도 속하지 않으면 -1)
+        self.col_lookup = np.full(width, -1, dtype=np.int64)
+        self.col_lookup[self.x_edges[0]:self.x_edges[-1]] = np.repeat(np.arange(cols), np.diff(self.x_edges))
+        self.row_lookup = np.full(height, -1, dtype=np.int64)
+        self.row_lookup[self.y_edges[0]:self.y_edges[-1]] = np.repeat(np.arange(rows), np.diff(self.y_edges))
+        
+        # 그리드 선을 미리 그려 두고 선 픽셀의 위치만 보관
+        mask = np.zeros((height, width), dtype=np.uint8)
+        for i in range(1, rows):
+            y = int(height * i / rows)
+            cv2.line(mask, (0, y), (width, y), 255, GRID_LINE_THICKNESS)
+        for j in range(1, cols):
+            x = int(width * j / cols)
+            cv2.line(mask, (x, 0), (x, height), 255, GRID_LINE_THICKNESS)
+        
+        # 축 정렬 선은 전체 행/열 띠로 그려지므로 행/열 인덱스만으로 덮어쓸 수 있음
+        self.line_rows = np.flatnonzero(mask.all(axis=1))
+        self.line_cols = np.flatnonzero(mask.all(axis=0))
+        band = np.zeros_like(mask, dtype=bool)
+        band[self.line_rows, :] = True
+        band[:, self.line_cols] = True
+        self.line_pixels = None if np.array_equal(band, mask > 0) else np.flatnonzero(mask)
+    
+    def draw(self, frame):
+        """
+        프레임에 그리드 선을 제자리에서 그림
+        
+        Args:
+            frame: (height, width, 3) 프레임 (수정됨)
+        """
+        if self.line_pixels is None:
+            frame[self.line_rows, :] = GRID_LINE_COLOR
+            frame[:, self.line_cols] = GRID_LINE_COLOR
+        else:
+            rows, cols = np.unravel_index(self.line_pixels, (self.height, self.width))
+            frame[rows, cols] = GRID_LINE_COLOR
+    
+    def cell_indices(self, boxes):
+        """
+        박스 중심점이 속한 셀 인덱스 계산
+        
+        Args:
+            boxes: (N, 4) 박스 배열 또는 리스트
+        
+        Returns:
+            cells: (N,) 셀 인덱스 배열 (그리드 밖이면 -1)
+        """
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        
+        # 경계가 정수이므로 중심점의 내림값으로 조회해도 x1 <= cx < x2 조건과 같음
+        center_x = np.floor((boxes[:, 0] + boxes[:, 2]) / 2).astype(np.int64)
+        center_y = np.floor((boxes[:, 1] + boxes[:, 3]) / 2).astype(np.int64)
+        
+        inside = (center_x >= 0) & (center_x < self.width) & (center_y >= 0) & (center_y < self.height)
+        row = self.row_lookup[center_y[inside]]
+        col = self.col_lookup[center_x[inside]]
+        cells = np.full(len(boxes), -1, dtype=np.int64)
+        cells[inside] = np.where((row >= 0) & (col >= 0), row * self.grid_size[1] + col, -1)
+        return cells
+    
+    def count_people(self, boxes):
+        """
+        각 그리드 구역에 있는 사람 수 계산
+        
+        Args:
+            boxes: (N, 4) 박스 배열 또는 리스트
+        
+        Returns:
+            grid_counts: 각 그리드 구역의 사람 수 리스트
+        """
+        cells = self.cell_indices(boxes)
+        return np.bincount(cells[cells >= 0], minlength=len(self.regions)).tolist()
+
+def get_grid_layout(frame_shape, grid_size=DEFAULT_GRID_SIZE):
+    """
+    프레임 크기와 그리드 크기에 맞는 GridLayout 반환 (캐시됨)
+    
+    Args:
+        frame_shape: 프레임 shape (h, w[, c])
+        grid_size: 그리드 크기 (rows, cols)
+    
+    Returns:
+        layout: GridLayout 인스턴스
+    """
+    h, w = frame_shape[:2]
+    rows, cols = grid_size
+    return _cached_grid_layout(int(h), int(w), int(rows), int(cols))
+
+@lru_cache(maxsize=16)
+def _cached_grid_layout(height, width, rows, cols):
+    return GridLayout(height, width, rows, cols)
 
 def get_grid_position_name(idx, grid_size=DEFAULT_GRID_SIZE):
     """
@@ -87,25 +222,89 @@ def count_people_in_grid(boxes, grid_regions):
     """
     각 그리드 구역에 있는 사람 수를 계산
     
+    박스 중심점을 구역 경계 배열에 대해 이진 탐색하여 셀 인덱스로 바꾼 뒤
+    np.bincount로 한 번에 집계한다 (박스 수에만 비례, 그리드 크기와 무관).
+    
     Args:
-        boxes: YOLO 검출 박스 리스트 [(x1, y1, x2, y2), ...]
-        grid_regions: 그리드 구역 좌표 리스트
+        boxes: YOLO 검출 박스 배열 (N, 4) 또는 리스트 [(x1, y1, x2, y2), ...]
+        grid_regions: 그리드 구역 좌표 리스트 (또는 GridLayout)
     
     Returns:
         grid_counts: 각 그리드 구역의 사람 수 리스트
     """
-    grid_counts = [0] * len(grid_regions)
+    if isinstance(grid_regions, GridLayout):
+        return grid_regions.count_people(boxes)
     
-    for box in boxes:
-        # 박스 중심점 계산
-        box_x1, box_y1, box_x2, box_y2 = box
-        center_x = (box_x1 + box_x2) / 2
-        center_y = (box_y1 + box_y2) / 2
-        
-        # 어느 그리드 구역에 속하는지 확인
-        for idx, (gx1, gy1, gx2, gy2) in enumerate(grid_regions):
-            if gx1 <= center_x < gx2 and gy1 <= center_y < gy2:
-                grid_counts[idx] += 1
-                break
+    n_regions = len(grid_regions)
+    if n_regions == 0:
+        return []
+    
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    if len(boxes) == 0:
+        return [0] * n_regions
+    
+    edges = _grid_edges(grid_regions)
+    if edges is None:
+        return _count_people_in_regions(boxes, grid_regions)
+    x_edges, y_edges = edges
+    
+    # 박스 중심점 계산
+    center_x = (boxes[:, 0] + boxes[:, 2]) / 2
+    center_y = (boxes[:, 1] + boxes[:, 3]) / 2
+    
+    # 중심점이 속한 행/열 인덱스 (구역 범위: x1 <= cx < x2)
+    col = np.searchsorted(x_edges, center_x, side='right') - 1
+    row = np.searchsorted(y_edges, center_y, side='right') - 1
+    
+    cols = len(x_edges) - 1
+    rows = len(y_edges) - 1
+    inside = (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+    
+    cell = row[inside] * cols + col[inside]
+    return np.bincount(cell, minlength=n_regions).tolist()
+
+def _grid_edges(grid_regions):
+    """
+    행 우선 격자 형태의 구역 리스트에서 열/행 경계 배열 추출
+    
+    Returns:
+        (x_edges, y_edges): 경계 배열 (격자 형태가 아니면 None)
+    """
+    regions = np.asarray(grid_regions)
+    x_starts = np.unique(regions[:, 0])
+    y_starts = np.unique(regions[:, 1])
+    cols = len(x_starts)
+    rows = len(y_starts)
+    if rows * cols != len(regions):
+        return None
+    
+    x_edges = np.append(x_starts, regions[:cols, 2].max())
+    y_edges = np.append(y_starts, regions[::cols, 3].max())
+    
+    # create_grid와 같은 행 우선 순서의 이어진 격자인지 확인
+    expected_x1 = np.tile(x_edges[:-1], rows)
+    expected_y1 = np.repeat(y_edges[:-1], cols)
+    expected_x2 = np.tile(x_edges[1:], rows)
+    expected_y2 = np.repeat(y_edges[1:], cols)
+    expected = np.stack([expected_x1, expected_y1, expected_x2, expected_y2], axis=1)
+    if not np.array_equal(expected, regions):
+        return None
+    
+    return x_edges, y_edges
+
+def _count_people_in_regions(boxes, grid_regions):
+    """
+    격자 형태가 아닌 임의의 구역 리스트에 대한 집계 (구역 단위 벡터 비교)
+    """
+    center_x = (boxes[:, 0] + boxes[:, 2]) / 2
+    center_y = (boxes[:, 1] + boxes[:, 3]) / 2
+    
+    grid_counts = [0] * len(grid_regions)
+    assigned = np.zeros(len(boxes), dtype=bool)
+    for idx, (gx1, gy1, gx2, gy2) in enumerate(grid_regions):
+        # 먼저 매칭된 구역에만 집계 (기존 동작과 동일)
+        hit = ~assigned & (gx1 <= center_x) & (center_x < gx2) & (gy1 <= center_y) & (center_y < gy2)
+        grid_counts[idx] = int(np.count_nonzero(hit))
+        assigned |= hit
     
     return grid_counts
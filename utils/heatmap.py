@@ -47,3 +47,77 @@ def create_heatmap(frame, grid_counts, grid_regions, grid_size=(3, 3)):
     blended = cv2.addWeighted(frame, 0.6, heatmap_colored, 0.4, 0)
     
     return blended
+
+class HeatmapRenderer:
+    """
+    그리드 해상도에서 히트맵을 만들어 프레임에 합성하는 렌더러
+
+    컬러맵은 256색 LUT로 한 번만 계산해 두고, 히트맵은 R×C 크기에서 색을
+    입힌 뒤 셀 조회 테이블로 프레임 크기 색상 레이어를 만든다.
+    구역별 인원 수가 직전 프레임과 같으면 색상 레이어를 그대로 재사용하고
+    블렌딩(한 번의 패스)만 수행한다.
+    """
+
+    def __init__(self, alpha=0.4):
+        """
+        초기화
+
+        Args:
+            alpha: 히트맵 불투명도 (원본 가중치는 1 - alpha)
+        """
+        self.alpha = alpha
+
+        # JET 컬러맵 LUT (256, 3)
+        levels = np.arange(256, dtype=np.uint8).reshape(256, 1)
+        self.lut = cv2.applyColorMap(levels, cv2.COLORMAP_JET).reshape(256, 3)
+
+        self._key = None
+        self._layer = None
+        self._output = None
+
+    def _build_layer(self, grid_counts, layout):
+        """구역별 인원 수로 프레임 크기 색상 레이어 생성"""
+        rows, cols = layout.grid_size
+        counts = np.asarray(grid_counts, dtype=np.float32)[:rows * cols].reshape(rows, cols)
+
+        # 각 구역에 사람 수에 비례한 값 할당 (0-255)
+        max_count = counts.max() if counts.size else 0
+        if max_count == 0:
+            max_count = 1
+        intensity = (counts / max_count * 255).astype(np.uint8)
+
+        # R×C 크기에서 컬러맵 적용 후 셀 조회 테이블로 프레임 크기로 확장
+        # 어느 구역에도 속하지 않는 픽셀(조회값 -1)은 마지막 행/열에 덧붙인 강도 0 색을 사용
+        small_colored = np.empty((rows + 1, cols + 1, 3), dtype=np.uint8)
+        small_colored[:] = self.lut[0]
+        small_colored[:rows, :cols] = self.lut[intensity]
+        return small_colored[layout.row_lookup[:, None], layout.col_lookup[None, :]]
+
+    def render(self, frame, grid_counts, layout, out=None):
+        """
+        히트맵을 프레임에 합성
+
+        Args:
+            frame: 원본 프레임
+            grid_counts: 각 그리드 구역의 사람 수 리스트
+            layout: 프레임에 맞는 GridLayout
+            out: 결과를 쓸 버퍼 (frame과 같아도 됨, None이면 렌더러의 재사용 버퍼)
+
+        Returns:
+            blended: 히트맵이 합성된 프레임
+        """
+        if frame is None or len(grid_counts) == 0:
+            return frame
+
+        key = (tuple(grid_counts), layout.height, layout.width, layout.grid_size)
+        if key != self._key:
+            self._layer = self._build_layer(grid_counts, layout)
+            self._key = key
+
+        if out is None:
+            if self._output is None or self._output.shape != frame.shape:
+                self._output = np.empty_like(frame)
+            out = self._output
+
+        cv2.addWeighted(frame, 1.0 - self.alpha, self._layer, self.alpha, 0, dst=out)
+        return out
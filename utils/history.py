@@ -0,0 +1,179 @@
+"""
+세션 분석 기록 유틸리티 모듈
+- 고정 용량 컬럼형 링 버퍼 (시간, 인원 수, CDI, 위험도 코드)
+- 버퍼에서 밀려나는 오래된 기록은 디스크(CSV)로 내보냄
+"""
+import csv
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from config import RISK_LEVELS, HISTORY_CAPACITY, HISTORY_SPILL_CHUNK, HISTORY_SPILL_DIR
+
+# 위험도 레벨 ↔ 정수 코드
+RISK_CODES = {level: code for code, level in enumerate(RISK_LEVELS)}
+RISK_NAMES = np.array(list(RISK_LEVELS), dtype=object)
+
+HISTORY_FIELDS = ["time", "count", "cdi", "risk"]
+
+
+class HistoryBuffer:
+    """
+    분석 기록을 컬럼별 NumPy 배열에 보관하는 링 버퍼
+
+    각 컬럼은 용량의 두 배 길이로 할당하고 모든 값을 i와 i + capacity 두 곳에
+    기록한다(미러링). 따라서 최근 n개(n <= capacity)는 항상 연속된 구간이라
+    복사 없이 슬라이스 뷰로 꺼낼 수 있고, 추가는 O(1)이다.
+    아직 디스크에 내보내지 않은 기록이 덮어써지기 전에 오래된 것부터
+    spill_chunk개씩 CSV 파일로 내보내므로 전체 기록은 잃지 않는다.
+    """
+
+    def __init__(self, capacity=HISTORY_CAPACITY, spill_chunk=HISTORY_SPILL_CHUNK,
+                 spill_dir=HISTORY_SPILL_DIR):
+        """
+        초기화
+
+        Args:
+            capacity: 메모리에 보관할 최대 기록 수
+            spill_chunk: 한 번에 디스크로 내보낼 기록 수
+            spill_dir: 내보낸 기록 파일을 둘 디렉토리
+        """
+        self.capacity = max(1, int(capacity))
+        self.spill_chunk = min(max(1, int(spill_chunk)), self.capacity)
+        self.spill_dir = spill_dir
+
+        self.times = np.empty(2 * self.capacity, dtype="<U8")
+        self.counts = np.zeros(2 * self.capacity, dtype=np.int32)
+        self.cdis = np.zeros(2 * self.capacity, dtype=np.float64)
+        self.risks = np.zeros(2 * self.capacity, dtype=np.int8)
+
+        # 지금까지 추가된 전체 기록 수 / 그중 디스크로 내보낸 기록 수
+        self.total = 0
+        self.spilled = 0
+        self.spill_path = None
+
+    def __len__(self):
+        return self.total
+
+    def append(self, record):
+        """
+        기록 하나 추가
+
+        Args:
+            record: {'time', 'count', 'cdi', 'risk'} 딕셔너리
+        """
+        # 디스크에 내보내지 않은 가장 오래된 기록이 덮어써지기 직전이면 먼저 내보냄
+        if self.total - self.spilled >= self.capacity:
+            self._spill(self.spill_chunk)
+
+        i = self.total % self.capacity
+        j = i + self.capacity
+        self.times[i] = self.times[j] = record["time"]
+        self.counts[i] = self.counts[j] = record["count"]
+        self.cdis[i] = self.cdis[j] = record["cdi"]
+        self.risks[i] = self.risks[j] = RISK_CODES.get(record["risk"], 0)
+        self.total += 1
+
+    def extend(self, records):
+        """여러 기록 추가"""
+        for record in records:
+            self.append(record)
+
+    def _window(self, start, stop):
+        """
+        전체 기록 번호 [start, stop) 구간의 연속 슬라이스 (버퍼에 남아 있는 구간만)
+
+        Returns:
+            window: 미러링 버퍼에서의 slice 객체
+        """
+        end = (stop - 1) % self.capacity + self.capacity + 1
+        return slice(end - (stop - start), end)
+
+    def tail(self, n):
+        """
+        최근 n개 기록의 컬럼 뷰 (복사 없음, 다음 추가 시 내용이 바뀔 수 있음)
+
+        Args:
+            n: 꺼낼 기록 수 (최대 capacity)
+
+        Returns:
+            columns: {'time', 'count', 'cdi', 'risk_code'} 배열 딕셔너리
+        """
+        n = min(n, self.total, self.capacity)
+        if n == 0:
+            window = slice(0, 0)
+        else:
+            window = self._window(self.total - n, self.total)
+        return {
+            "time": self.times[window],
+            "count": self.counts[window],
+            "cdi": self.cdis[window],
+            "risk_code": self.risks[window]
+        }
+
+    def _spill(self, n):
+        """디스크에 내보내지 않은 가장 오래된 기록 n개를 CSV 파일에 추가"""
+        n = min(n, self.total - self.spilled)
+        if n <= 0:
+            return
+
+        if self.spill_path is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            fd, self.spill_path = tempfile.mkstemp(prefix="history_", suffix=".csv", dir=self.spill_dir)
+            os.close(fd)
+
+        window = self._window(self.spilled, self.spilled + n)
+        with open(self.spill_path, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(zip(
+                self.times[window].tolist(),
+                self.counts[window].tolist(),
+                self.cdis[window].tolist(),
+                RISK_NAMES[self.risks[window]].tolist()
+            ))
+        self.spilled += n
+
+    def export_csv(self, path, encoding="utf-8-sig"):
+        """
+        전체 기록(디스크로 내보낸 기록 + 메모리 기록)을 CSV 파일로 저장
+
+        Args:
+            path: 저장 경로
+            encoding: 파일 인코딩
+
+        Returns:
+            rows: 저장한 기록 수
+        """
+        with open(path, "w", newline="", encoding=encoding) as out:
+            csv.writer(out).writerow(HISTORY_FIELDS)
+            if self.spill_path is not None and self.spilled:
+                with open(self.spill_path, "r", newline="", encoding="utf-8") as spill:
+                    shutil.copyfileobj(spill, out)
+
+            if self.total > self.spilled:
+                window = self._window(self.spilled, self.total)
+                csv.writer(out).writerows(zip(
+                    self.times[window].tolist(),
+                    self.counts[window].tolist(),
+                    self.cdis[window].tolist(),
+                    RISK_NAMES[self.risks[window]].tolist()
+                ))
+        return self.total
+
+    def clear(self):
+        """모든 기록 삭제 (내보낸 파일 포함)"""
+        self._remove_spill()
+        self.total = 0
+        self.spilled = 0
+
+    def _remove_spill(self):
+        if self.spill_path is not None:
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+            self.spill_path = None
+
+    def __del__(self):
+        self._remove_spill()
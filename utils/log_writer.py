@@ -0,0 +1,206 @@
+"""
+분석 로그 스트리밍 저장 유틸리티 모듈
+- 분석 레코드를 백그라운드 스레드에서 CSV 파일에 묶어서 이어 씀
+- 시간/개수 기준 플러시, 크기/날짜 기준 파일 교체
+"""
+import csv
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from config import (LOG_STREAM_DIR, LOG_FLUSH_INTERVAL, LOG_FLUSH_RECORDS,
+                    LOG_ROTATE_BYTES, LOG_QUEUE_SIZE)
+from utils.session import on_session_end, run_session_end
+
+# 종료 신호
+_STOP = object()
+
+
+class AnalysisLogWriter:
+    """
+    분석 레코드를 디스크에 이어 쓰는 백그라운드 로그 작성기
+
+    write()는 큐에 넣기만 하므로 프레임 루프를 막지 않는다 (큐가 가득 차면
+    레코드를 버리고 dropped를 늘린다). 작성 스레드는 flush_records개가 모이거나
+    flush_interval초가 지나면 한 번에 기록하고, 파일이 max_bytes를 넘거나
+    날짜가 바뀌면 새 파일로 교체한다. 비정상 종료 시에도 마지막 플러시까지의
+    기록은 남는다.
+    """
+
+    def __init__(self, log_dir=LOG_STREAM_DIR, prefix="analysis",
+                 fields=("time", "count", "cdi", "risk"),
+                 flush_interval=LOG_FLUSH_INTERVAL, flush_records=LOG_FLUSH_RECORDS,
+                 max_bytes=LOG_ROTATE_BYTES, queue_size=LOG_QUEUE_SIZE, stream=None):
+        """
+        초기화 (작성 스레드 시작)
+
+        Args:
+            log_dir: 로그 파일 디렉토리
+            prefix: 로그 파일 이름 접두사
+            fields: 기록할 레코드 필드 (CSV 헤더)
+            flush_interval: 플러시 주기 (초)
+            flush_records: 이 개수만큼 모이면 바로 플러시
+            max_bytes: 파일 크기가 이 값을 넘으면 새 파일로 교체
+            queue_size: 대기 큐 최대 크기
+            stream: 기록 대상 스트림 (영상 경로 등, 세션별 작성기 교체 판단용)
+        """
+        self.log_dir = log_dir
+        self.prefix = prefix
+        self.fields = list(fields)
+        self.flush_interval = flush_interval
+        self.flush_records = max(1, flush_records)
+        self.max_bytes = max_bytes
+        self.stream = stream
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._writer = None
+        self._day = None
+        self.path = None
+
+        # 통계
+        self.written = 0
+        self.dropped = 0
+        self.error = None
+
+        self._thread = threading.Thread(target=self._run, name="AnalysisLogWriter", daemon=True)
+        self._thread.start()
+
+    def write(self, record):
+        """
+        레코드 하나를 기록 대기열에 추가 (막히지 않음)
+
+        Args:
+            record: fields를 키로 가진 딕셔너리
+
+        Returns:
+            queued: 대기열에 들어갔으면 True (가득 차거나 작성기가 멈춰서 버렸으면 False)
+        """
+        if not self._thread.is_alive():
+            # 오류로 작성 스레드가 끝났으면 큐에 쌓아 두지 않음
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def write_many(self, records):
+        """여러 레코드를 기록 대기열에 추가"""
+        for record in records:
+            self.write(record)
+
+    def close(self, timeout=5.0):
+        """남은 레코드를 모두 기록하고 작성 스레드 종료"""
+        if not self._thread.is_alive():
+            return
+        # 종료 신호는 큐가 가득 차 있어도 반드시 전달
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _open(self, now):
+        """새 로그 파일 열기"""
+        self._close_file()
+        os.makedirs(self.log_dir, exist_ok=True)
+        name = f"{self.prefix}_{now.strftime('%Y%m%d_%H%M%S')}.csv"
+        path = os.path.join(self.log_dir, name)
+        suffix = 1
+        while os.path.exists(path):
+            path = os.path.join(self.log_dir, f"{name[:-4]}_{suffix}.csv")
+            suffix += 1
+
+        self._file = open(path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fields, extrasaction="ignore")
+        self._writer.writeheader()
+        self._day = now.date()
+        self.path = path
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def _flush(self, batch):
+        """모인 레코드를 파일에 기록 (필요하면 먼저 파일 교체)"""
+        if not batch:
+            return
+        now = datetime.now()
+        if (self._file is None or now.date() != self._day
+                or self._file.tell() >= self.max_bytes):
+            self._open(now)
+
+        self._writer.writerows(batch)
+        self._file.flush()
+        self.written += len(batch)
+        batch.clear()
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    break
+                if item is not None:
+                    batch.append(item)
+
+                if len(batch) >= self.flush_records or time.monotonic() >= deadline:
+                    self._flush(batch)
+                    deadline = time.monotonic() + self.flush_interval
+
+            # 종료 신호 이전에 들어온 레코드까지 기록
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    batch.append(item)
+            self._flush(batch)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._close_file()
+
+
+
+def get_log_writer(state, stream):
+    """
+    세션 상태에 보관된 로그 작성기를 반환 (스트림이 바뀌면 이전 작성기를 닫고 새로 연다)
+
+    세션이 끝나 세션 상태가 수거되면 (또는 프로세스가 종료되면) 작성기도 닫혀
+    남은 레코드가 기록되고 작성 스레드와 파일 핸들이 정리된다.
+
+    Args:
+        state: 세션 상태 (st.session_state 등 속성 접근 가능한 객체)
+        stream: 기록 대상 스트림 (영상 경로 등)
+
+    Returns:
+        writer: AnalysisLogWriter 인스턴스
+    """
+    writer = getattr(state, "log_writer", None)
+    if writer is not None and writer.stream == stream:
+        return writer
+
+    close_log_writer(state)
+
+    writer = AnalysisLogWriter(stream=stream)
+    state.log_writer = writer
+    on_session_end(state, "log_writer", writer.close)
+    return writer
+
+
+def close_log_writer(state):
+    """세션 상태의 로그 작성기 닫기 (남은 레코드 기록 후 작성 스레드 종료)"""
+    run_session_end(state, "log_writer")
+    state.log_writer = None
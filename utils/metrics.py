@@ -0,0 +1,277 @@
+"""
+모니터링 지표 노출 유틸리티 모듈
+- 처리량, 추론 지연 시간, 대기열 길이, 스트림별 인원/CDI/위험도 지표 집계
+- 내장 HTTP 서버(별도 스레드)에서 Prometheus/OpenMetrics 텍스트 형식으로 제공
+"""
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import METRICS_ENABLED, METRICS_HOST, METRICS_PORT, METRICS_LATENCY_BUCKETS
+from utils.history import RISK_CODES
+
+# Prometheus 텍스트 형식 Content-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class _Metric:
+    """레이블 값 조합별로 값을 보관하는 지표 (갱신은 잠금 하나로 짧게 처리)"""
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _samples(self):
+        with self._lock:
+            return list(self._values.items())
+
+    def remove(self, **labels):
+        """레이블 값 조합 하나의 값을 제거 (더 이상 갱신되지 않는 시계열 정리)"""
+        key = self._key(labels)
+        with self._lock:
+            self._values.pop(key, None)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in self._samples():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """현재 값 게이지"""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """고정 구간 히스토그램 (구간별 개수, 합계, 전체 개수)"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=METRICS_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [구간별 개수..., +Inf 구간 개수, 합계]
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[position] += 1
+            state[-1] += value
+
+    def _samples(self):
+        with self._lock:
+            return [(key, list(state)) for key, state in self._values.items()]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, state in self._samples():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(float(bound))))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """지표 모음 (등록 순서대로 출력)"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """
+        Prometheus 텍스트 형식 출력
+
+        Returns:
+            text: 전체 지표 텍스트
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class CrowdMetrics:
+    """군중 분석 지표 묶음 (스트림 레이블: 영상 파일 이름, 카메라 이름 등)"""
+
+    def __init__(self):
+        registry = self.registry = MetricsRegistry()
+        self.frames = registry.register(Counter(
+            "crowd_frames_processed_total", "분석한 프레임 수", ("stream",)))
+        self.skipped = registry.register(Counter(
+            "crowd_frames_skipped_total", "정적 장면으로 추론을 생략한 프레임 수", ("stream",)))
+        self.inference_latency = registry.register(Histogram(
+            "crowd_inference_latency_seconds", "프레임당 사람 검출(추론) 소요 시간", ("stream",)))
+        self.frame_latency = registry.register(Histogram(
+            "crowd_frame_latency_seconds", "프레임당 전체 분석 소요 시간", ("stream",)))
+        self.person_count = registry.register(Gauge(
+            "crowd_person_count", "마지막 프레임의 인원 수", ("stream",)))
+        self.cdi = registry.register(Gauge(
+            "crowd_cdi", "마지막 프레임의 군중 밀집도 지수(CDI)", ("stream",)))
+        self.risk = registry.register(Gauge(
+            "crowd_risk_level", "마지막 프레임의 위험도 (0=SAFE, 1=CAUTION, 2=WARNING, 3=DANGER)",
+            ("stream",)))
+        self.queue_depth = registry.register(Gauge(
+            "crowd_queue_depth", "대기열에 쌓인 항목 수", ("queue",)))
+
+    def observe_frame(self, stream, result, inference_seconds=None, frame_seconds=None):
+        """
+        프레임 하나의 분석 결과 반영
+
+        Args:
+            stream: 스트림 이름
+            result: FramePipeline.process()의 반환값 (또는 같은 키를 가진 딕셔너리)
+            inference_seconds: 검출 소요 시간 (추론을 생략했으면 None)
+            frame_seconds: 프레임 전체 분석 소요 시간
+        """
+        self.frames.inc(stream=stream)
+        if result.get("inference_skipped"):
+            self.skipped.inc(stream=stream)
+        if inference_seconds is not None:
+            self.inference_latency.observe(inference_seconds, stream=stream)
+        if frame_seconds is not None:
+            self.frame_latency.observe(frame_seconds, stream=stream)
+        self.person_count.set(result["person_count"], stream=stream)
+        self.cdi.set(result["cdi"], stream=stream)
+        self.risk.set(RISK_CODES.get(result["risk_info"]["level"], 0), stream=stream)
+
+    def set_queue_depth(self, queue, depth):
+        """대기열 길이 갱신 (queue: "inference", "history:<stream>" 등)"""
+        self.queue_depth.set(depth, queue=queue)
+
+    def clear_queue_depth(self, queue):
+        """대기열 길이 지표 제거 (대기열을 쓰던 워커가 끝났을 때)"""
+        self.queue_depth.remove(queue=queue)
+
+
+class MetricsServer:
+    """지표를 /metrics 경로로 제공하는 HTTP 서버 (데몬 스레드)"""
+
+    def __init__(self, registry, host=METRICS_HOST, port=METRICS_PORT):
+        """
+        초기화 (서버 스레드 시작)
+
+        Args:
+            registry: MetricsRegistry
+            host: 바인드 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+        """
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # 수집 요청마다 콘솔에 출력하지 않음
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """서버 종료"""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# 프로세스 전체 공유 지표와 서버
+_shared_metrics = None
+_shared_server = None
+# HTTP 서버를 시작하지 못한 오류 (이후 호출은 다시 시도하지 않고 None 반환)
+_shared_error = None
+_shared_metrics_lock = threading.Lock()
+
+
+def get_metrics(enabled=METRICS_ENABLED, port=METRICS_PORT):
+    """
+    프로세스 전체에서 공유하는 지표 반환 (처음 호출 시 HTTP 서버 시작)
+
+    이미 (CLI 옵션 등으로) 시작된 지표가 있으면 enabled와 관계없이 그것을 반환한다.
+    포트를 사용할 수 없으면 처음 호출에서 OSError를 전달하고, 이후 호출은 None을 반환한다.
+
+    Args:
+        enabled: 지표 수집 사용 여부
+        port: HTTP 서버 포트
+
+    Returns:
+        metrics: CrowdMetrics (사용하지 않거나 서버를 시작하지 못했으면 None)
+    """
+    global _shared_metrics, _shared_server, _shared_error
+    with _shared_metrics_lock:
+        if _shared_metrics is None:
+            if not enabled or _shared_error is not None:
+                return None
+            metrics = CrowdMetrics()
+            try:
+                _shared_server = MetricsServer(metrics.registry, port=port)
+            except OSError as e:
+                _shared_error = e
+                raise
+            _shared_metrics = metrics
+        return _shared_metrics
@@ -0,0 +1,55 @@
+"""
+세션 수명 유틸리티 모듈
+- 브라우저 세션이 끝나 세션 상태가 수거될 때 정리 작업(스레드 정지, 파일 닫기) 실행
+"""
+import weakref
+
+
+class _SessionToken:
+    """세션 상태에만 보관되어 세션과 함께 수거되는 표식"""
+
+
+def on_session_end(state, name, callback, *args):
+    """
+    세션 상태가 수거되면 (또는 프로세스가 종료되면) callback(*args) 실행
+
+    정리 대상(작성기, 워커 등)은 자기 스레드가 참조하고 있어 수거되지 않으므로
+    세션에만 있는 표식의 수거 시점을 기준으로 한다. 같은 name으로 다시 등록하면
+    이전 등록은 실행하지 않고 해제한다.
+
+    Args:
+        state: 세션 상태 (st.session_state 등 속성 접근 가능한 객체)
+        name: 등록 이름 (세션 상태 키 접두사)
+        callback: 정리 함수 (세션 상태를 참조하면 안 됨)
+        *args: callback 인자
+
+    Returns:
+        finalizer: weakref.finalize (호출하면 바로 실행)
+    """
+    cancel_session_end(state, name)
+    token = _SessionToken()
+    finalizer = weakref.finalize(token, callback, *args)
+    setattr(state, f"{name}_token", token)
+    setattr(state, f"{name}_finalizer", finalizer)
+    return finalizer
+
+
+def run_session_end(state, name):
+    """등록된 정리 작업을 지금 실행하고 등록 해제 (한 번만 실행됨)"""
+    finalizer = getattr(state, f"{name}_finalizer", None)
+    if finalizer is not None:
+        finalizer()
+    _clear(state, name)
+
+
+def cancel_session_end(state, name):
+    """등록된 정리 작업을 실행하지 않고 등록 해제"""
+    finalizer = getattr(state, f"{name}_finalizer", None)
+    if finalizer is not None:
+        finalizer.detach()
+    _clear(state, name)
+
+
+def _clear(state, name):
+    setattr(state, f"{name}_token", None)
+    setattr(state, f"{name}_finalizer", None)
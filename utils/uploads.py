@@ -0,0 +1,143 @@
+"""
+업로드 영상 저장 유틸리티 모듈
+- 업로드 파일을 청크 단위로 한 번만 디스크에 기록 (내용 해시로 이름 지정)
+- 임시 디렉토리 용량 제한 (오래 사용하지 않은 파일부터 삭제)
+"""
+import hashlib
+import os
+
+from config import TEMP_DIR, TEMP_MAX_BYTES, UPLOAD_CHUNK_SIZE
+from utils.video import open_video_paths
+
+
+def _upload_key(uploaded_file):
+    """업로드 파일 식별 키 (file_id가 없는 Streamlit 버전은 이름과 크기 사용)"""
+    file_id = getattr(uploaded_file, "file_id", None)
+    if file_id:
+        return file_id
+    return (uploaded_file.name, uploaded_file.size)
+
+
+def store_upload(uploaded_file, temp_dir=TEMP_DIR, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    업로드 파일을 청크 단위로 저장하고 sha256 해시 이름으로 확정
+
+    같은 내용의 파일이 이미 있으면 새로 쓴 파일은 버리고 기존 파일을 사용한다.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile
+        temp_dir: 저장 디렉토리
+        chunk_size: 한 번에 읽고 쓸 바이트 수
+
+    Returns:
+        path: 저장된 파일 경로 (temp_dir/<sha256><확장자>)
+    """
+    os.makedirs(temp_dir, exist_ok=True)
+    ext = os.path.splitext(uploaded_file.name)[1].lower()
+    part_path = os.path.join(temp_dir, f".upload_{os.getpid()}_{id(uploaded_file)}.part")
+
+    digest = hashlib.sha256()
+    uploaded_file.seek(0)
+    try:
+        with open(part_path, "wb") as f:
+            while True:
+                chunk = uploaded_file.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                f.write(chunk)
+
+        path = os.path.join(temp_dir, digest.hexdigest() + ext)
+        if os.path.exists(path):
+            os.remove(part_path)
+            os.utime(path)
+        else:
+            os.replace(part_path, path)
+    except Exception:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    finally:
+        uploaded_file.seek(0)
+
+    return path
+
+
+def cleanup_temp_dir(temp_dir=TEMP_DIR, max_bytes=TEMP_MAX_BYTES, keep=()):
+    """
+    임시 디렉토리 전체 크기가 max_bytes 이하가 될 때까지 오래된 파일 삭제
+
+    최근 사용 시각(수정 시각, 재사용할 때마다 갱신)이 오래된 파일부터 지우며,
+    keep에 있는 파일, 다른 세션이나 워커가 열어 둔 영상, 작성 중인 .part 파일은
+    지우지 않는다.
+
+    Args:
+        temp_dir: 임시 디렉토리
+        max_bytes: 허용 최대 크기 (바이트)
+        keep: 지우지 않을 파일 경로 목록
+
+    Returns:
+        removed: 삭제한 파일 경로 리스트
+    """
+    if not os.path.isdir(temp_dir):
+        return []
+
+    keep = {os.path.abspath(path) for path in keep} | open_video_paths()
+    entries = []
+    total = 0
+    for entry in os.scandir(temp_dir):
+        if not entry.is_file():
+            continue
+        stat = entry.stat()
+        total += stat.st_size
+        if entry.name.endswith(".part") or os.path.abspath(entry.path) in keep:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    removed = []
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed.append(path)
+
+    return removed
+
+
+def get_upload_path(state, uploaded_file, temp_dir=TEMP_DIR, max_bytes=TEMP_MAX_BYTES):
+    """
+    세션에 유지되는 업로드 파일 경로 반환 (처음 한 번만 디스크에 기록)
+
+    리런마다 호출되어도 이미 저장한 업로드면 파일 데이터에 손대지 않고
+    경로만 반환한다.
+
+    Args:
+        state: st.session_state
+        uploaded_file: Streamlit UploadedFile
+        temp_dir: 저장 디렉토리
+        max_bytes: 임시 디렉토리 허용 최대 크기 (바이트)
+
+    Returns:
+        path: 저장된 파일 경로
+    """
+    if "upload_paths" not in state:
+        state.upload_paths = {}
+
+    key = _upload_key(uploaded_file)
+    path = state.upload_paths.get(key)
+    if path is not None and os.path.exists(path):
+        # 최근 사용 시각 갱신 (정리 시 오래 사용하지 않은 파일부터 삭제)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    path = store_upload(uploaded_file, temp_dir)
+    state.upload_paths[key] = path
+    cleanup_temp_dir(temp_dir, max_bytes, keep=[path])
+    return path
@@ -0,0 +1,126 @@
+"""
+비디오 입력 유틸리티 모듈
+- 세션 단위로 디코더를 유지하는 순차 프레임 소스
+- 열려 있는 영상 경로 목록 (임시 디렉토리 정리 시 사용 중인 파일 보호)
+"""
+import os
+import threading
+import weakref
+
+import cv2
+
+# 열려 있는 VideoSource → 절대 경로 (세션 상태가 수거되면 함께 빠짐)
+_open_sources = weakref.WeakKeyDictionary()
+_open_sources_lock = threading.Lock()
+
+
+def open_video_paths():
+    """
+    현재 프로세스에서 열려 있는 영상 파일 경로 (세션 재생 중이거나 워커가 분석 중인 영상)
+
+    Returns:
+        paths: 절대 경로 집합
+    """
+    with _open_sources_lock:
+        return set(_open_sources.values())
+
+
+class VideoSource:
+    """
+    디코더를 열어 둔 채로 프레임을 순차적으로 읽는 프레임 소스
+
+    Streamlit 리런마다 VideoCapture를 새로 열고 seek 하면 컨테이너 파싱과
+    키프레임부터의 재디코딩 비용이 매 프레임 발생하므로, 세션 상태에 이 객체를
+    보관해 두고 재생 중에는 순차 read()만 수행한다.
+    실제 점프(±5초 이동 등)가 있을 때만 seek 한다.
+    """
+
+    def __init__(self, path):
+        """
+        초기화
+
+        Args:
+            path: 비디오 파일 경로
+        """
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"비디오를 열 수 없습니다: {path}")
+        with _open_sources_lock:
+            _open_sources[self] = os.path.abspath(path)
+
+        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        # 다음 read()가 반환할 프레임 인덱스
+        self.next_index = 0
+
+        # 마지막으로 읽은 프레임 (같은 인덱스 재요청 시 재사용)
+        self.last_index = None
+        self.last_frame = None
+
+    def read(self, index):
+        """
+        지정한 인덱스의 프레임 읽기
+
+        Args:
+            index: 프레임 인덱스
+
+        Returns:
+            ret: 성공 여부
+            frame: 프레임 (실패 시 None)
+        """
+        # 같은 프레임을 다시 요청한 경우 (일시정지 상태의 리런 등)
+        if index == self.last_index and self.last_frame is not None:
+            return True, self.last_frame
+
+        # 순차 재생이 아닌 경우에만 seek
+        if index != self.next_index:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+
+        ret, frame = self.cap.read()
+        if not ret:
+            # 디코더 위치를 알 수 없으므로 다음 요청 시 다시 seek 하도록 함
+            self.next_index = -1
+            self.last_index = None
+            self.last_frame = None
+            return False, None
+
+        self.next_index = index + 1
+        self.last_index = index
+        self.last_frame = frame
+        return True, frame
+
+    def release(self):
+        """디코더 해제"""
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        with _open_sources_lock:
+            _open_sources.pop(self, None)
+        self.last_frame = None
+
+
+def get_video_source(state, path):
+    """
+    세션 상태에 보관된 프레임 소스를 반환 (경로가 바뀌면 새로 연다)
+
+    Args:
+        state: 세션 상태 (st.session_state 등 속성 접근 가능한 객체)
+        path: 비디오 파일 경로
+
+    Returns:
+        source: VideoSource 인스턴스
+    """
+    source = getattr(state, "video_source", None)
+    if source is not None and source.path == path and source.cap is not None:
+        return source
+
+    if source is not None:
+        source.release()
+
+    source = VideoSource(path)
+    state.video_source = source
+    return source